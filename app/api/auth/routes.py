@@ -0,0 +1,29 @@
+import logging
+from app.core.firebase import revoke_user_tokens, verify_token
+from app.schemas.user import User
+from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.responses import JSONResponse
+
+logging.basicConfig(level=logging.INFO, 
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+auth_router = APIRouter(tags=['auth'])
+
+
+@auth_router.post("/sign-out-everywhere")
+async def sign_out_everywhere(
+    user: User = Depends(verify_token),
+):
+    try:
+        await revoke_user_tokens(user.uid)
+        return JSONResponse(
+            status_code=status.HTTP_200_OK,
+            content={"message": "Signed out of every session"}
+        )
+    except Exception as e:
+        logger.error(f"Error revoking sessions: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to revoke sessions: {str(e)}"
+        )
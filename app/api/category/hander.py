@@ -1,20 +1,10 @@
-import torch
-import torch.nn.functional as F
+from app.services.inference.executor import inference_executor
 
-import torch
-import torch.nn.functional as F
+def _predict_probabilities(text: str, model, tokenizer):
+    import torch
+    import torch.nn.functional as F
 
-async def predict_category_handler(
-    text: str,
-    model,
-    tokenizer,
-    config
-):
-    id_to_intent = config.id2label
-
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-    model.to(device)
-    model.eval()
+    device = model.device
 
     inputs = tokenizer(
         text,
@@ -30,8 +20,19 @@ async def predict_category_handler(
     with torch.no_grad():
         logits = model(input_ids=input_ids, attention_mask=attention_mask).logits
 
-    probabilities = F.softmax(logits, dim=1)[0]
-    predicted_label_idx = torch.argmax(probabilities).item()
+    # bf16 logits are softmaxed in fp32 so the reported probabilities keep their precision
+    return F.softmax(logits.float(), dim=1)[0].cpu()
+
+async def predict_category_handler(
+    text: str,
+    model,
+    tokenizer,
+    config
+):
+    id_to_intent = config.id2label
+
+    probabilities = await inference_executor.run(_predict_probabilities, text, model, tokenizer)
+    predicted_label_idx = probabilities.argmax().item()
 
     label_probabilities = [
         {
@@ -1,5 +1,6 @@
 import logging
 
+from app.services.cache.session_store import session_store
 from app.services.firebase.firestore import Firestore
 
 
@@ -21,7 +22,9 @@ async def get_history_by_id_handler(sessionId: str):
     return await store.get_by_id(doc_id=sessionId)
 
 async def delete_history_by_id_handler(sessionId: str):
-    return await store.delete(doc_id=sessionId)
+    result = await store.delete(doc_id=sessionId)
+    await session_store.delete(sessionId)
+    return result
 
 async def delete_all_history_by_uid_handler(uid: str):
     return await store.delete_by_field(
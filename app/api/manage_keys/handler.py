@@ -1,4 +1,6 @@
 import logging
+from app.core.verfiy_key import API_KEY_PREFIX
+from app.services.cache.api_key_index import api_key_index
 from app.services.firebase.firestore import Firestore
 from datetime import datetime
 import random
@@ -11,7 +13,7 @@ logger = logging.getLogger(__name__)
 store = Firestore(collection_name="api_keys")
 
 def generate_key() -> str:
-    key = "sk_" + ''.join(random.choices(string.ascii_letters + string.digits, k=40))
+    key = API_KEY_PREFIX + ''.join(random.choices(string.ascii_letters + string.digits, k=40))
     return key
 
 async def get_keys_handler(uid: str):
@@ -30,10 +32,14 @@ async def create_key_handler(uid: str):
         "createdAt": datetime.utcnow().isoformat()
     }
     doc_id = await store.create(data)
+    # Drop any negative entry left by an earlier probe of this key
+    api_key_index.invalidate_key(key)
     return {**data, "id": doc_id}
 
 async def revoke_key_handler(key_id: str, uid: str):    
     doc = await store.get_by_id(doc_id=key_id)
     if not doc or doc.get("uid") != uid:
         return False
-    return await store.delete(doc_id=key_id)
+    result = await store.delete(doc_id=key_id)
+    api_key_index.invalidate_key(doc["key"])
+    return result
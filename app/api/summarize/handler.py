@@ -1,29 +1,37 @@
-import asyncio
 import os
-import threading
+import time
 from app.api.summarize.schemas import SessionData, SummarizeSessionRequest
 from app.schemas.session import Status
 from app.schemas.user import User
+from app.services.cache.session_store import session_store
+from app.services.cache.video_result_store import VideoResult, current_model_version, video_result_store
 from app.services.firebase.firestore import Firestore
-from app.services.post_processing.check_token import SINHALA_ZWJ, needs_zwj
+from app.services.firebase.session_buffer import SessionProgressBuffer
+from app.services.inference.batcher import GenerationBatcher
+from app.services.inference.admission import INTERACTIVE, AdmissionController
+from app.services.inference.continuous import ContinuousBatchingEngine
+from app.services.inference.streamer import AsyncTextStreamer
+from app.services.metrics import observe_stage, record_generation, record_stage
+from app.services.pipeline import TokenBudgetSegmenter, VideoSummaryPipeline
+from app.services.post_processing.check_token import zwj_events
+from app.services.post_processing.zero_with_char import postprocess_text
+from app.services.summarizer.hierarchical import HierarchicalSummarizer
 import app.specification.tags as SSE_TAGS
-import torch
-from transformers import TextIteratorStreamer
 from app.services.transcribe.sinhala_transcriber import SinhalaTranscriber
 from app.services.youtube_handler.youtube_handler import YouTubeAudioProcessor
 from app.core import settings
 import logging
 import os
-from datetime import datetime, timedelta
-from google.cloud.firestore_v1 import ArrayUnion
+from datetime import datetime
 
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-summary_sessions = {}
 store = Firestore(collection_name="ext_summarize")
 
+SUMMARY_PROMPT_PREFIX = "summarize: "
+
 async def create_session_handler(
     request: SummarizeSessionRequest,
     user: User
@@ -41,203 +49,236 @@ async def create_session_handler(
     sessionId = await store.create(request)
     request["sessionId"] = sessionId
 
-    summary_sessions[sessionId] = {
-        "data": request,
-        "expiresAt": datetime.now() + timedelta(hours=1)
-    }
+    await session_store.set(sessionId, request)
     
     await store.update(sessionId, {"sessionId": sessionId})
     return sessionId
 
 async def get_session_handler(sessionId: str) -> SessionData:
-    if(sessionId not in summary_sessions):
+    session_data = await session_store.get(sessionId)
+    if session_data is None:
         session_data = await store.get_by_id(sessionId)
-        return SessionData.model_validate(session_data)
+        await session_store.set(sessionId, session_data)
 
-    else:
-        session_data = summary_sessions[sessionId]
-        if datetime.now() > session_data["expiresAt"]:
-            del summary_sessions[sessionId]
-            return None
-        else:
-            return SessionData.model_validate(session_data["data"])
+    return SessionData.model_validate(session_data)
+
+async def _set_session_status(progress: SessionProgressBuffer, sessionId: str, status: str) -> None:
+    progress.set_status(status)
+    await session_store.update(sessionId, {"status": status})
+
+
+def _summarizer(batcher: GenerationBatcher) -> HierarchicalSummarizer:
+    return HierarchicalSummarizer(batcher, max_rounds=settings.HIERARCHICAL_MAX_ROUNDS)
+
+async def _stream_video_digest(videoResult, batcher: GenerationBatcher, admission: AdmissionController):
+    """
+    Whole-video digest sent after the paragraphs. The stored paragraphs are
+    already the per-window summaries, so only the reduce step runs here.
+    """
+    if not settings.VIDEO_DIGEST_ENABLED or len(videoResult.paragraphs) < 2:
+        return
+
+    if videoResult.digest is None:
+        summarizer = _summarizer(batcher)
+        async with admission.admit(INTERACTIVE, shed=False):
+            with observe_stage("digest"):
+                digest = await summarizer.reduce(
+                    [paragraph["text"] for paragraph in videoResult.paragraphs],
+                    prompt_prefix=SUMMARY_PROMPT_PREFIX,
+                )
+        videoResult.digest = postprocess_text(digest)
+        await video_result_store.save(videoResult)
+
+    yield SSE_TAGS.BEGIN_DIGEST
+    for token in videoResult.digest.split():
+        yield token
+    yield SSE_TAGS.END_DIGEST
 
+def _paragraph_events(paragraph):
+    """SSE events for a paragraph that is already summarized"""
+    yield SSE_TAGS.BEGIN_PARAGRAPH
+    for token in paragraph["text"].split(" "):
+        if token:
+            yield token
+    yield SSE_TAGS.END_PARAGRAPH
+
+    yield SSE_TAGS.BEGIN_METADATA
+    for data in SSE_TAGS.YIELD_DATA("from", paragraph["from"]):
+        yield data
+    yield SSE_TAGS.END_METADATA
 
 async def generate_video_summary_handler(
     videoId: str,
     sessionId: str,
-    model,
-    tokenizer, 
-    semaphore
+    engine: ContinuousBatchingEngine,
+    batcher: GenerationBatcher,
+    admission: AdmissionController,
 ):
     current_script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.abspath(os.path.join(current_script_dir, '..', '..', '..'))
     credentials_path = os.path.join(project_root, 'credentials', 'gcc.json')
 
-    transcripts = []
     summaryParagraphs = []
-    chunkCounter = 0
-    fromTime = 0
-    maxNumOfChunks = 10
 
-    audioProcessor = YouTubeAudioProcessor()
     transcriber = SinhalaTranscriber(api_key=credentials_path)
-    
+    audioProcessor = YouTubeAudioProcessor(audio_format=transcriber.preferred_format)
+    chunkDuration = audioProcessor.chunk_duration
+
     logger.info(f"Starting to process video: {videoId}")
     
-    async with semaphore:
-        
-        yield SSE_TAGS.BEGIN_SUMMARY
-        
-        async for audio_chunk in audioProcessor.process_content(videoId, None):
-            transcript_chunk = await transcriber.transcribe_audio(audio_chunk)
-            transcripts.append(transcript_chunk['text'])
-            chunkCounter += 1
-
-            if chunkCounter >= maxNumOfChunks:
-                inputText = " ".join(transcripts).strip()
-                
-                inputs = tokenizer(
-                    f"summarize: {inputText}",
-                    return_tensors="pt",
-                    max_length=1024,
-                    truncation=True,
-                    padding=True,
-                    add_special_tokens=True
-                ).to(settings.DEVICE)
-                
-                streamer = TextIteratorStreamer(
-                    tokenizer,
-                    skip_special_tokens=True,
-                    skip_prompt=True
-                )
+    progress = SessionProgressBuffer(store, sessionId, flush_interval=settings.SESSION_FLUSH_INTERVAL_SECONDS)
 
-                def generate():
-                    with torch.inference_mode():
-                        model.generate(
-                            **inputs,
-                            max_length=500,
-                            min_length=50,
-                            num_beams=1,
-                            do_sample=False,
-                            streamer=streamer,
-                        )
-                
-                threading.Thread(target=generate, daemon=True).start()
-
-                yield SSE_TAGS.BEGIN_PARAGRAPH
-                
-                prev_token = None
-                for token in streamer:
-                    token = token.strip()
-                    if not token:
-                        continue
-                    if prev_token is not None:
-                        if needs_zwj(prev_token, token):
-                            combined = prev_token + SINHALA_ZWJ + token
-                            summaryParagraphs.append(combined)
-                            yield combined
-                            prev_token = None
-                        else:
-                            summaryParagraphs.append(prev_token)
-                            yield prev_token
-                            prev_token = token
-                    else:
-                        prev_token = token
-                    await asyncio.sleep(0.1)
-
-                if prev_token:
-                    summaryParagraphs.append(prev_token)
-                    yield prev_token
-                            
-                await store.update(sessionId, {
-                    "summary": ArrayUnion([" ".join(summaryParagraphs)]),
-                    "updatedAt": datetime.now().isoformat()
-                })
-             
-                yield SSE_TAGS.END_PARAGRAPH
-                
-                yield SSE_TAGS.BEGIN_METADATA
-                for data in SSE_TAGS.YIELD_DATA("from", fromTime * 30):
-                    yield data
-                yield SSE_TAGS.END_METADATA
-                
-                fromTime += chunkCounter
-                chunkCounter = 0
-                transcripts.clear()
-                summaryParagraphs.clear()
-
-            await asyncio.sleep(0.05)
-        
-        if transcripts:
-            inputText = " ".join(transcripts).strip()
-            inputs = tokenizer(
-                f"summarize: {inputText}",
-                return_tensors="pt",
-                max_length=1024,
-                truncation=True,
-                padding=True,
-                add_special_tokens=True
-            ).to(settings.DEVICE)
-
-            streamer = TextIteratorStreamer(
-                tokenizer,
-                skip_special_tokens=True,
-                skip_prompt=True
+    flight = None
+    async with progress:
+        await _set_session_status(progress, sessionId, Status.streaming)
+        try:
+    
+            yield SSE_TAGS.BEGIN_SUMMARY
+
+            if await audioProcessor.is_live(videoId):
+                # Live chunk indexes are relative to where the broadcast was joined, so there is nothing to replay or resume
+                videoResult = VideoResult(video_id=videoId, model_version=current_model_version(), live=True)
+            else:
+                # One session per video runs the pipeline; the others stream its paragraphs as they are saved.
+                # A follower whose leader stops before finishing takes over from the stored result.
+                replayed = 0
+                while True:
+                    joined, leading = await video_result_store.join(videoId)
+                    if leading:
+                        flight = joined
+                        videoResult = flight.result
+                        break
+
+                    logger.info(f"Following the session already summarizing video: {videoId}")
+                    async for paragraph in joined.follow(replayed):
+                        for event in _paragraph_events(paragraph):
+                            yield event
+                        progress.add_paragraphs([paragraph["text"]])
+                        replayed += 1
+
+                    if joined.result.completed:
+                        videoResult = joined.result
+                        break
+
+                if len(videoResult.paragraphs) > replayed:
+                    logger.info(f"Replaying {len(videoResult.paragraphs) - replayed} stored paragraphs for video: {videoId}")
+                    replay_started = time.perf_counter()
+                    for paragraph in videoResult.paragraphs[replayed:]:
+                        for event in _paragraph_events(paragraph):
+                            yield event
+
+                    progress.add_paragraphs([paragraph["text"] for paragraph in videoResult.paragraphs[replayed:]])
+                    record_stage("replay", time.perf_counter() - replay_started)
+
+            fromTime = videoResult.next_chunk
+
+            if videoResult.completed:
+                async for token in _stream_video_digest(videoResult, batcher, admission):
+                    yield token
+                await _set_session_status(progress, sessionId, Status.completed)
+                yield SSE_TAGS.END_SUMMARY
+                yield '[DONE] \n\n'
+                return
+
+            startTime = fromTime * chunkDuration if fromTime else None
+
+            pipeline = VideoSummaryPipeline(
+                audio_processor=audioProcessor,
+                transcriber=transcriber,
+                video_result=videoResult,
+                segmenter=TokenBudgetSegmenter(
+                    engine.tokenizer,
+                    max_tokens=engine.max_input_length,
+                    prompt_prefix=SUMMARY_PROMPT_PREFIX,
+                    fill_ratio=settings.SEGMENT_FILL_RATIO,
+                    max_wait=settings.SEGMENT_MAX_WAIT_SECONDS,
+                    start_chunk=fromTime,
+                ),
+                start_chunk=fromTime,
+                transcribe_concurrency=settings.PIPELINE_TRANSCRIBE_CONCURRENCY,
+                audio_queue_size=settings.PIPELINE_AUDIO_QUEUE_SIZE,
+                paragraph_queue_size=settings.PIPELINE_PARAGRAPH_QUEUE_SIZE,
             )
 
-            def generate():
-                with torch.inference_mode():
-                    model.generate(
-                        **inputs,
-                        max_length=500,
-                        min_length=50,
-                        num_beams=1,
-                        do_sample=False,
-                        streamer=streamer,
+            try:
+                # Time until the pipeline hands over the next paragraph: audio, transcription and segmenting
+                waiting_since = time.perf_counter()
+                async for job in pipeline.paragraphs(videoId, startTime):
+                    record_stage("paragraph_wait", time.perf_counter() - waiting_since)
+
+                    streamer = AsyncTextStreamer(
+                        engine.tokenizer,
+                        skip_special_tokens=True,
+                        skip_prompt=True
                     )
+            
+                    # Only the generation itself holds an execution slot; an open stream waits rather than being shed
+                    async with admission.admit(INTERACTIVE, shed=False):
+                        generation_started = time.perf_counter()
+                        # Joins the engine's running decode batch alongside every other open stream
+                        generation = engine.submit(SUMMARY_PROMPT_PREFIX + job.text, streamer=streamer)
+                        try:
+                            yield SSE_TAGS.BEGIN_PARAGRAPH
+            
+                            token_count = 0
+
+                            def count_token():
+                                nonlocal token_count
+                                if token_count == 0:
+                                    record_stage("first_token", time.perf_counter() - generation_started)
+                                token_count += 1
+
+                            batches = streamer.batches(
+                                max_items=settings.SSE_MAX_TOKENS_PER_EVENT,
+                                pacing=settings.SSE_TOKEN_PACING_SECONDS,
+                            )
+                            async for event_tokens in zwj_events(batches, on_token=count_token):
+                                summaryParagraphs.extend(event_tokens)
+                                yield " ".join(event_tokens)
 
-            threading.Thread(target=generate, daemon=True).start()
-
-            yield SSE_TAGS.BEGIN_PARAGRAPH
-
-            prev_token = None
-            for token in streamer:
-                token = token.strip()
-                if not token:
-                    continue
-                if prev_token is not None:
-                    if needs_zwj(prev_token, token):
-                        combined = prev_token + SINHALA_ZWJ + token
-                        summaryParagraphs.append(combined)
-                        yield combined
-                        prev_token = None
-                    else:
-                        summaryParagraphs.append(prev_token)
-                        yield prev_token
-                        prev_token = token
-                else:
-                    prev_token = token
-                await asyncio.sleep(0.01)
-
-            if prev_token:
-                summaryParagraphs.append(prev_token)
-                yield prev_token
-
-            await store.update(sessionId, {
-                "summary": ArrayUnion([" ".join(summaryParagraphs)]),
-                "updatedAt": datetime.now().isoformat()
-            })
-
-            yield SSE_TAGS.END_PARAGRAPH
-
-            yield SSE_TAGS.BEGIN_METADATA
-            for data in SSE_TAGS.YIELD_DATA("from", fromTime * 30):
-                yield data
-            yield SSE_TAGS.END_METADATA
+                            await generation
+                        finally:
+                            # A client that disconnects mid-paragraph frees its batch slot at the next token
+                            generation.cancel()
+                    generation_seconds = time.perf_counter() - generation_started
+                    record_stage("generation", generation_seconds)
+                    record_generation(engine.model_id, token_count, generation_seconds)
+
+                    fromSeconds = job.from_chunk * chunkDuration
+                    paragraphText = " ".join(summaryParagraphs)
+                    videoResult.add_paragraph(job.from_chunk, job.to_chunk, fromSeconds, paragraphText)
+                    with observe_stage("persist"):
+                        await video_result_store.save(videoResult)
+                        
+                    progress.add_paragraphs([paragraphText])
+         
+                    yield SSE_TAGS.END_PARAGRAPH
+            
+                    yield SSE_TAGS.BEGIN_METADATA
+                    for data in SSE_TAGS.YIELD_DATA("from", fromSeconds):
+                        yield data
+                    yield SSE_TAGS.END_METADATA
             
-        yield SSE_TAGS.END_SUMMARY
-        yield '[DONE] \n\n'
+                    summaryParagraphs.clear()
+                    waiting_since = time.perf_counter()
+
+                videoResult.completed = True
+            finally:
+                # Keep partial transcripts and paragraphs even if the client went away
+                await video_result_store.save(videoResult)
+
+            async for token in _stream_video_digest(videoResult, batcher, admission):
+                yield token
+        
+            await _set_session_status(progress, sessionId, Status.completed)
+            yield SSE_TAGS.END_SUMMARY
+            yield '[DONE] \n\n'
+        except Exception:
+            await _set_session_status(progress, sessionId, Status.failed)
+            raise
+        finally:
+            if flight is not None:
+                video_result_store.release(flight)
 
 async def generate_trascript_hander(video_id: str, start_time=None):
     current_script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -246,37 +287,39 @@ async def generate_trascript_hander(video_id: str, start_time=None):
 
     # credentials_path = get_project_path('credentials/gcc.json')
 
-    audio_processor = YouTubeAudioProcessor()
     transcriber = SinhalaTranscriber(api_key=credentials_path)
+    audio_processor = YouTubeAudioProcessor(audio_format=transcriber.preferred_format)
 
     logger.info(f"Starting to process video: {video_id}")
     
-    async for audio_chunk in audio_processor.process_content(video_id, start_time):
-        transcript = await transcriber.transcribe_audio(audio_chunk)
+    transcripts = transcriber.transcribe_many(
+        audio_processor.process_content(video_id, start_time),
+        max_concurrency=settings.PIPELINE_TRANSCRIBE_CONCURRENCY,
+    )
+    async for transcript in transcripts:
         if isinstance(transcript, list) and len(transcript) > 0:
             yield transcript[0]['text']
         else:
             yield transcript['text']
-        
-        await asyncio.sleep(0.05)
 
 async def generate_summary_without_category_handler(
     text: str,
-    model,
-    tokenizer,
+    batcher: GenerationBatcher,
+    hierarchical: bool = False,
 ):
-    inputs = tokenizer("summarize: " + text, return_tensors="pt", max_length=1024, truncation=True)
-    summary_ids = model.generate(inputs["input_ids"], max_length=256, min_length=30, length_penalty=2.0, num_beams=4)
-    summary = tokenizer.decode(summary_ids[0], skip_special_tokens=True) 
-    return summary     
+    summarizer = _summarizer(batcher)
+    if hierarchical:
+        return await summarizer.summarize(text, prompt_prefix=SUMMARY_PROMPT_PREFIX)
+    return await summarizer.summarize_one(text, prompt_prefix=SUMMARY_PROMPT_PREFIX)
 
 async def generate_summary_with_category_handler(
     text: str,
     category: str,
-    model,
-    tokenizer,
+    batcher: GenerationBatcher,
+    hierarchical: bool = False,
 ):
-    inputs = tokenizer("summarize: category: " + category + " text: "+ text, return_tensors="pt", max_length=1024, truncation=True)
-    summary_ids = model.generate(inputs["input_ids"], max_length=256, min_length=30, length_penalty=2.0, num_beams=4)
-    summary = tokenizer.decode(summary_ids[0], skip_special_tokens=True) 
-    return summary     
\ No newline at end of file
+    summarizer = _summarizer(batcher)
+    prompt_prefix = "summarize: category: " + category + " text: "
+    if hierarchical:
+        return await summarizer.summarize(text, prompt_prefix=prompt_prefix, category=category)
+    return await summarizer.summarize_one(text, prompt_prefix=prompt_prefix, category=category)
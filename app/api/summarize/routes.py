@@ -6,15 +6,17 @@ from app.core.firebase import verify_token
 from app.core.verfiy_key import verify_dual_auth
 from app.schemas.user import User
 from app.services.firebase.firestore import Firestore
-from app.services.model_dependencies.bert import get_sin_bert_model_and_tokenizer
-from app.services.model_dependencies.mt5 import get_with_category_model_and_tokenizer
+from app.services.model_dependencies.bert import get_bert_admission, get_sin_bert_model_and_tokenizer
+from app.services.model_dependencies.mt5 import get_with_category_summary_batcher
 from app.services.post_processing.zero_with_char import postprocess_text
-import torch
 from fastapi import APIRouter, HTTPException, Depends, status
 from fastapi.responses import JSONResponse
 from sse_starlette.sse import EventSourceResponse
 from app.api.summarize import SummarizeRequest
-from app.services.model_dependencies import get_model_and_tokenizer, get_request_semaphore
+from app.services.inference.admission import priority_for
+from app.services.inference.executor import is_out_of_memory
+from app.services.model_dependencies import get_streaming_engine, get_summary_admission, get_summary_batcher, get_with_category_admission
+from app.core import settings
 import logging
 
 store = Firestore(collection_name="ext_summarize")
@@ -23,10 +25,17 @@ logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-session_store = {}
-
 summarize_router = APIRouter(tags=['summarize'])
 
+def _check_text_length(text: str, hierarchical: bool) -> None:
+    # Hierarchical requests are summarized window by window, so they may be far longer
+    max_chars = settings.HIERARCHICAL_MAX_CHARS if hierarchical else 5000
+    if len(text) > max_chars or len(text) < 100:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Text length must be between 100 and {max_chars} characters.",
+        )
+
 @summarize_router.post("/create-session")
 async def create_session(
     request: SummarizeSessionRequest,
@@ -71,11 +80,13 @@ async def get_session(session_id: str):
 @summarize_router.get("/sse-stream/summarize")
 async def stream_video_summary(
     session_id: str,
-    model_resources=Depends(get_model_and_tokenizer),
-    semaphore=Depends(get_request_semaphore),
+    engine=Depends(get_streaming_engine),
+    batcher=Depends(get_summary_batcher),
+    admission=Depends(get_summary_admission),
 ):
     try:    
-        model, tokenizer = model_resources
+        # Refuse before the stream opens; once open, it waits for its slots instead
+        admission.check()
         session_data = await get_session_handler(session_id)
         if session_data is None:
             raise HTTPException(
@@ -87,9 +98,9 @@ async def stream_video_summary(
             generate_video_summary_handler(
                 videoId=session_data.videoId,
                 sessionId=session_id,
-                model=model,
-                tokenizer=tokenizer,
-                semaphore=semaphore,
+                engine=engine,
+                batcher=batcher,
+                admission=admission,
             ),
             media_type="text/event-stream",
             headers={
@@ -98,21 +109,15 @@ async def stream_video_summary(
                 "Access-Control-Allow-Origin": "*",
             }
         )
-        
 
-    except torch.cuda.OutOfMemoryError:
+    except RuntimeError as e:
+        if not is_out_of_memory(e):
+            raise
         raise HTTPException(
             status_code=status.HTTP_507_INSUFFICIENT_STORAGE,
             detail="Server resources overloaded. Please try again later.",
         )
 
-    except Exception as e:
-        print(e)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An error occurred during processing: {str(e)}",
-        )
-
 @summarize_router.get("/sse-stream/trascript/{video_id}")
 async def stream_transcript(video_id: str):
     try:
@@ -127,19 +132,14 @@ async def stream_transcript(video_id: str):
             }
         )
 
-    except torch.cuda.OutOfMemoryError:
+    except RuntimeError as e:
+        if not is_out_of_memory(e):
+            raise
         raise HTTPException(
             status_code=status.HTTP_507_INSUFFICIENT_STORAGE,
             detail="Server resources overloaded. Please try again later.",
         )
 
-    except Exception as e:
-        print(e)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An error occurred during summarization: {str(e)}",
-        )
-
 @summarize_router.get("/dummy-sse-stream")
 async def dummy_stream():
     TEXT_BLOCK = """
@@ -194,117 +194,84 @@ async def dummy_stream():
 async def without_category(
     request: SummarizeRequest,
     user: User = Depends(verify_dual_auth),
-    model_resources=Depends(get_model_and_tokenizer),
-    semaphore=Depends(get_request_semaphore),
+    batcher=Depends(get_summary_batcher),
+    admission=Depends(get_summary_admission),
 ):
-    model, tokenizer = model_resources
-    if len(request.text) > 5000 or len(request.text) < 100:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Text length must be between 100 and 5000 characters.",
-        )
+    _check_text_length(request.text, request.hierarchical)
     
-    try:
+    async with admission.admit(priority_for(user)):
         summary = await generate_summary_without_category_handler(
             text=request.text,
-            model=model,
-            tokenizer=tokenizer
+            batcher=batcher,
+            hierarchical=request.hierarchical,
         )
 
-        return JSONResponse(
-            status_code=status.HTTP_200_OK,
-            content={
-                "summary": postprocess_text(summary),
-            }
-        )
-            
-    except Exception as e:
-        print(e)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An error occurred during summarization: {str(e)}",
-        )
-    
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "summary": postprocess_text(summary),
+        }
+    )
+
 @summarize_router.post("/with-category")
 async def without_category(
     request: SummarizeWithCategoryRequest,
     user: User = Depends(verify_dual_auth),
-    model_resources=Depends(get_with_category_model_and_tokenizer),
-    semaphore=Depends(get_request_semaphore),
+    batcher=Depends(get_with_category_summary_batcher),
+    admission=Depends(get_with_category_admission),
 ):
-    model, tokenizer = model_resources
-    if len(request.text) > 5000 or len(request.text) < 100:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Text length must be between 100 and 5000 characters.",
-        )
+    _check_text_length(request.text, request.hierarchical)
     
-    try:
+    async with admission.admit(priority_for(user)):
         summary = await generate_summary_with_category_handler(
             text=request.text,
             category=request.category,
-            model=model,
-            tokenizer=tokenizer
+            batcher=batcher,
+            hierarchical=request.hierarchical,
         )
 
-        return JSONResponse(
-            status_code=status.HTTP_200_OK,
-            content={
-                "summary": postprocess_text(summary),
-            }
-        )
-            
-    except Exception as e:
-        print(e)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An error occurred during summarization: {str(e)}",
-        )
-    
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "summary": postprocess_text(summary),
+        }
+    )
+
 @summarize_router.post("/with-predicted-category")
 async def with_predicted_category(
     request: SummarizeRequest,
     user: User = Depends(verify_dual_auth),
-    mt5_model_resources=Depends(get_with_category_model_and_tokenizer),
+    batcher=Depends(get_with_category_summary_batcher),
     bert_model_resources=Depends(get_sin_bert_model_and_tokenizer),
-    semaphore=Depends(get_request_semaphore),
+    bert_admission=Depends(get_bert_admission),
+    admission=Depends(get_with_category_admission),
 ):
-    mt5_model, mt5_tokenizer = mt5_model_resources
     bert_model, bert_tokenizer, bert_config = bert_model_resources
     
-    if len(request.text) > 5000 or len(request.text) < 100:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Text length must be between 100 and 5000 characters.",
-        )
+    _check_text_length(request.text, request.hierarchical)
     
-    try:
-        async with semaphore:
-            _, predicted_category = await predict_category_handler(
-                    text=request.text,
-                    model=bert_model,
-                    tokenizer=bert_tokenizer,
-                    config=bert_config,
-                )
-            
-            summary = await generate_summary_with_category_handler(
-                text=request.text,
-                category=predicted_category['label'],
-                model=mt5_model,
-                tokenizer=mt5_tokenizer
-            )
+    priority = priority_for(user)
+    async with bert_admission.admit(priority):
+        _, predicted_category = await predict_category_handler(
+            text=request.text,
+            model=bert_model,
+            tokenizer=bert_tokenizer,
+            config=bert_config,
+        )
 
-            return JSONResponse(
-                status_code=status.HTTP_200_OK,
-                content={
-                    "category": predicted_category,
-                    "summary": postprocess_text(summary),
-                }
-            )
-            
-    except Exception as e:
-        print(e)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An error occurred during summarization: {str(e)}",
-        )
\ No newline at end of file
+    async with admission.admit(priority):
+        summary = await generate_summary_with_category_handler(
+            text=request.text,
+            category=predicted_category['label'],
+            batcher=batcher,
+            hierarchical=request.hierarchical,
+        )
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "category": predicted_category,
+            "summary": postprocess_text(summary),
+        }
+    )
+        
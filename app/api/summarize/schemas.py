@@ -3,10 +3,13 @@ from pydantic import BaseModel, Field, conint, constr
 
 class SummarizeRequest(BaseModel):
     text: str
+    # Summarize texts longer than the model's input window by window, then summarize the partial summaries
+    hierarchical: bool = False
 
 class SummarizeWithCategoryRequest(BaseModel):
     text: str
     category: str
+    hierarchical: bool = False
     
 class SummarizeSessionRequest(BaseModel):
     videoId: str
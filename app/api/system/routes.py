@@ -1,9 +1,54 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse, Response
 from app.services.health_check import HealthCheckService
 from app.core.dependencies import get_health_service
+from app.services.cache.api_key_index import api_key_index
+from app.services.cache.session_store import session_store
+from app.services.cache.summary_cache import summary_cache
+from app.services.cache.token_cache import token_cache
+from app.services.cache.video_result_store import video_result_store
+from app.services.inference.admission import admission_controllers
+from app.services.inference.executor import inference_executor
+from app.services.metrics import render_metrics
+from app.services.model_dependencies import model_registry
+from app.services.model_dependencies.mt5 import streaming_engines, summary_batchers
 
 system_router = APIRouter(tags=["System"])
 
 @system_router.get("/health-check", summary="System status check")
 async def health_check(service: HealthCheckService = Depends(get_health_service)):
     return await service.check_health()
+
+@system_router.get("/ready", summary="Readiness check; 503 until the models are loaded")
+async def ready(service: HealthCheckService = Depends(get_health_service)):
+    result = await service.check_readiness()
+    code = status.HTTP_200_OK if result["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE
+    return JSONResponse(status_code=code, content=result)
+
+@system_router.get("/metrics", summary="Prometheus metrics")
+async def metrics():
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
+@system_router.get("/models", summary="Resident inference models")
+async def loaded_models():
+    return {"models": model_registry.stats()}
+
+@system_router.get("/inference", summary="Inference queue metrics")
+async def inference_metrics():
+    return {
+        "executor": inference_executor.stats(),
+        "batchers": {name: batcher.stats() for name, batcher in summary_batchers.items()},
+        "admission": {name: controller.stats() for name, controller in admission_controllers.items()},
+        "streaming_engines": {name: engine.stats() for name, engine in streaming_engines.items()},
+    }
+
+@system_router.get("/cache", summary="Summary cache metrics")
+async def cache_metrics():
+    return {
+        "summary_cache": summary_cache.stats(),
+        "video_results": video_result_store.stats(),
+        "api_keys": api_key_index.stats(),
+        "id_tokens": token_cache.stats(),
+        "sessions": session_store.stats(),
+    }
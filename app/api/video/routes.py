@@ -1,11 +1,9 @@
 from fastapi import APIRouter, HTTPException, Depends, WebSocket, WebSocketDisconnect
 from app.api.video.models import VideoRequest
 from app.api.video.service import VideoService
-from transformers import WhisperProcessor, WhisperForConditionalGeneration
 from app.services.web_socket_manager.web_sockect_manager import WSConnectionManager
 
 import numpy as np
-import torch
 import asyncio
 import subprocess
 import sys
@@ -13,11 +11,6 @@ import sys
 if sys.platform == 'win32':
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
-model_name = "Ransaka/whisper-tiny-sinhala-20k"
-processor = WhisperProcessor.from_pretrained(model_name)
-model = WhisperForConditionalGeneration.from_pretrained(model_name)
-forced_decoder_ids = processor.get_decoder_prompt_ids(language="si", task="transcribe")
-
 chunk_time = 16000 * 2 * 10
 
 video_router = APIRouter(tags=["Video"])
@@ -35,6 +28,8 @@ async def generate_video_url(request: VideoRequest):
 # @video_router.websocket("/ws/transcribe/{user_id}/{video_id}")
 # async def websocket_transcribe2(websocket: WebSocket, user_id:str, video_id: str):
 #     process = None
+#     model, processor = get_whisper_model_and_processor()
+#     forced_decoder_ids = processor.get_decoder_prompt_ids(language="si", task="transcribe")
 #     try:
 #         await websocket_manager.connect(user_id, websocket) 
 #         print(f"WebSocket connected for video_id: {video_id}, user_id: {user_id}")
@@ -1,9 +1,17 @@
 import os
 from enum import Enum
+from functools import lru_cache
 from typing import Optional
-import torch
 from pydantic_settings import BaseSettings
 
+@lru_cache(maxsize=None)
+def _resolve_device(preference: str) -> str:
+    if preference != "auto":
+        return preference
+    import torch
+
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
 class EnvironmentEnum(str, Enum):
     DEVELOPMENT = "development"
     STAGING = "staging"
@@ -35,9 +43,92 @@ class Settings(BaseSettings):
     MODEL_PATH_WITH_CATEGORY: str = os.getenv("MODEL_PATH_WITH_CATEGORY", "/Users/janith/sums-up/sums-up-server/models/with-category-mt5")
     MODEL_PATH_SIN_BERT: str = os.getenv("MODEL_PATH_SIN_BERT", "/Users/janith/sums-up/sums-up-server/models/sin-bert")
     
-    DEVICE: str = "cuda" if torch.cuda.is_available() else "cpu"
+    WHISPER_MODEL_NAME: str = os.getenv("WHISPER_MODEL_NAME", "Ransaka/whisper-tiny-sinhala-20k")
+    PRELOAD_WHISPER: bool = os.getenv("PRELOAD_WHISPER", "False").lower() in ("true", "1", "t")
+
+    MODEL_VERSION: str = os.getenv("MODEL_VERSION", "")
+
+    # "auto" picks cuda when available; resolved on first use so importing settings does not import torch
+    DEVICE_PREFERENCE: str = os.getenv("DEVICE", "auto")
+
+    @property
+    def DEVICE(self) -> str:
+        return _resolve_device(self.DEVICE_PREFERENCE)
+
+    # Weight precision applied at load: fp32, int8-dynamic (CPU only) or bf16; unsupported modes fall back to fp32
+    MODEL_PRECISION: str = os.getenv("MODEL_PRECISION", "fp32")
+    SIN_BERT_PRECISION: str = os.getenv("SIN_BERT_PRECISION", MODEL_PRECISION)
+
+    # Backend of the text summarizers and the category classifier: pytorch, or onnx for exported ONNX Runtime graphs
+    INFERENCE_BACKEND: str = os.getenv("INFERENCE_BACKEND", "pytorch")
+    ONNX_MODEL_DIR: str = os.getenv("ONNX_MODEL_DIR", "exports/onnx")
+    # 0 lets ONNX Runtime use every core; gunicorn's post_fork sets it to the per-worker thread budget
+    ONNX_INTRA_OP_THREADS: int = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+
+    PRELOAD_MODELS: bool = os.getenv("PRELOAD_MODELS", "True").lower() in ("true", "1", "t")
+    # Load preloadable models in a background task after startup rather than before accepting traffic
+    WARM_UP_IN_BACKGROUND: bool = os.getenv("WARM_UP_IN_BACKGROUND", "True").lower() in ("true", "1", "t")
     
-    MAX_CONCURRENT_REQUESTS: int = int(os.getenv("MAX_CONCURRENT_REQUESTS", "1000"))
+    # Admission control per model: concurrent executions, then a queue shed once its wait exceeds the SLO.
+    # The concurrency limit follows measured service time between the minimum and the maximum
+    ADMISSION_MAX_CONCURRENCY: int = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "16"))
+    ADMISSION_MIN_CONCURRENCY: int = int(os.getenv("ADMISSION_MIN_CONCURRENCY", "1"))
+    ADMISSION_MAX_QUEUE: int = int(os.getenv("ADMISSION_MAX_QUEUE", "128"))
+    ADMISSION_QUEUE_SLO_SECONDS: float = float(os.getenv("ADMISSION_QUEUE_SLO_SECONDS", "10"))
+    # Share of freed slots that go to interactive (Firebase user / SSE) versus API-key batch traffic
+    ADMISSION_INTERACTIVE_WEIGHT: int = int(os.getenv("ADMISSION_INTERACTIVE_WEIGHT", "3"))
+    ADMISSION_BATCH_WEIGHT: int = int(os.getenv("ADMISSION_BATCH_WEIGHT", "1"))
+
+    INFERENCE_WORKERS: int = int(os.getenv("INFERENCE_WORKERS", "2"))
+    INFERENCE_MAX_QUEUE: int = int(os.getenv("INFERENCE_MAX_QUEUE", "64"))
+
+    BATCH_MAX_SIZE: int = int(os.getenv("BATCH_MAX_SIZE", "8"))
+    BATCH_MAX_WAIT_MS: float = float(os.getenv("BATCH_MAX_WAIT_MS", "10"))
+    # Concurrent summary streams decoded together by the continuous-batching engine
+    STREAM_MAX_BATCH_SIZE: int = int(os.getenv("STREAM_MAX_BATCH_SIZE", "16"))
+
+    SUMMARY_CACHE_MAX_ENTRIES: int = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "2048"))
+    SUMMARY_CACHE_TTL_SECONDS: float = float(os.getenv("SUMMARY_CACHE_TTL_SECONDS", "86400"))
+    SUMMARY_CACHE_DISK_PATH: str = os.getenv("SUMMARY_CACHE_DISK_PATH", "")
+    SUMMARY_CACHE_DISK_MAX_MB: int = int(os.getenv("SUMMARY_CACHE_DISK_MAX_MB", "256"))
+
+    PIPELINE_AUDIO_QUEUE_SIZE: int = int(os.getenv("PIPELINE_AUDIO_QUEUE_SIZE", "4"))
+    PIPELINE_TRANSCRIBE_CONCURRENCY: int = int(os.getenv("PIPELINE_TRANSCRIBE_CONCURRENCY", "4"))
+    PIPELINE_PARAGRAPH_QUEUE_SIZE: int = int(os.getenv("PIPELINE_PARAGRAPH_QUEUE_SIZE", "2"))
+    # A paragraph closes once its transcripts fill this share of the summarizer's 1024-token input...
+    SEGMENT_FILL_RATIO: float = float(os.getenv("SEGMENT_FILL_RATIO", "0.9"))
+    # ...or this long after its first transcript arrived, so sparse audio still gets a paragraph soon
+    SEGMENT_MAX_WAIT_SECONDS: float = float(os.getenv("SEGMENT_MAX_WAIT_SECONDS", "45"))
+
+    # Hierarchical (map-reduce) summaries: longest text accepted, and whether video streams end with a digest
+    HIERARCHICAL_MAX_CHARS: int = int(os.getenv("HIERARCHICAL_MAX_CHARS", "200000"))
+    HIERARCHICAL_MAX_ROUNDS: int = int(os.getenv("HIERARCHICAL_MAX_ROUNDS", "4"))
+    VIDEO_DIGEST_ENABLED: bool = os.getenv("VIDEO_DIGEST_ENABLED", "True").lower() in ("true", "1", "t")
+
+    VIDEO_RESULT_MAX_ENTRIES: int = int(os.getenv("VIDEO_RESULT_MAX_ENTRIES", "256"))
+    VIDEO_RESULT_TTL_SECONDS: float = float(os.getenv("VIDEO_RESULT_TTL_SECONDS", "604800"))
+    VIDEO_RESULT_DISK_PATH: str = os.getenv("VIDEO_RESULT_DISK_PATH", "")
+    VIDEO_RESULT_DISK_MAX_MB: int = int(os.getenv("VIDEO_RESULT_DISK_MAX_MB", "1024"))
+
+    API_KEY_CACHE_MAX_ENTRIES: int = int(os.getenv("API_KEY_CACHE_MAX_ENTRIES", "10000"))
+    API_KEY_CACHE_TTL_SECONDS: float = float(os.getenv("API_KEY_CACHE_TTL_SECONDS", "60"))
+    API_KEY_NEGATIVE_TTL_SECONDS: float = float(os.getenv("API_KEY_NEGATIVE_TTL_SECONDS", "30"))
+
+    TOKEN_CACHE_MAX_ENTRIES: int = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+    TOKEN_CACHE_MAX_TTL_SECONDS: float = float(os.getenv("TOKEN_CACHE_MAX_TTL_SECONDS", "300"))
+    # Cache misses ask Firebase whether the user's sessions were revoked; hits rely on the TTL cap above
+    TOKEN_CHECK_REVOKED: bool = os.getenv("TOKEN_CHECK_REVOKED", "True").lower() in ("true", "1", "t")
+
+    SESSION_STORE_URL: str = os.getenv("SESSION_STORE_URL", "")
+    SESSION_STORE_MAX_ENTRIES: int = int(os.getenv("SESSION_STORE_MAX_ENTRIES", "10000"))
+    SESSION_TTL_SECONDS: float = float(os.getenv("SESSION_TTL_SECONDS", "3600"))
+
+    SESSION_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("SESSION_FLUSH_INTERVAL_SECONDS", "2"))
+
+    # Summary SSE stream: tokens already generated are sent together, up to this many per event
+    SSE_MAX_TOKENS_PER_EVENT: int = int(os.getenv("SSE_MAX_TOKENS_PER_EVENT", "8"))
+    # Optional delay between events for clients that want a steady reading pace; 0 streams at model speed
+    SSE_TOKEN_PACING_SECONDS: float = float(os.getenv("SSE_TOKEN_PACING_SECONDS", "0"))
     
     DEBUG: bool = os.getenv("DEBUG", "False").lower() in ("true", "1", "t")
 
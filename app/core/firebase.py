@@ -1,22 +1,60 @@
+from app.core.config import settings
 from app.core.path_utils import get_project_path
 from app.schemas.user import User
+from app.services.cache.token_cache import token_cache
+import asyncio
+import threading
 import firebase_admin
-from firebase_admin import credentials, auth, firestore
+from firebase_admin import credentials, auth
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer
 from typing import Dict, Any
 
-cred = credentials.Certificate(get_project_path("credentials/firebase-admin-sdk.json"))
-firebase_app = firebase_admin.initialize_app(cred)
-db = firestore.client()
+# Initialised on first use rather than at import, so startup does not wait on credentials or gRPC
+_firebase_app = None
+_async_db = None
+_init_lock = threading.Lock()
 
 security = HTTPBearer()
 
+def get_firebase_app():
+    global _firebase_app
+    if _firebase_app is None:
+        with _init_lock:
+            if _firebase_app is None:
+                cred = credentials.Certificate(get_project_path("credentials/firebase-admin-sdk.json"))
+                _firebase_app = firebase_admin.initialize_app(cred)
+    return _firebase_app
+
+def get_async_db():
+    """Shared async Firestore client"""
+    global _async_db
+    if _async_db is None:
+        from firebase_admin import firestore_async
+
+        app = get_firebase_app()
+        with _init_lock:
+            if _async_db is None:
+                _async_db = firestore_async.client(app)
+    return _async_db
+
+def _verify_id_token(token: str) -> Dict[str, Any]:
+    return auth.verify_id_token(token, app=get_firebase_app(), check_revoked=settings.TOKEN_CHECK_REVOKED)
+
+async def revoke_user_tokens(uid: str) -> None:
+    """
+    Revoke a user's sessions in Firebase and drop their cached tokens.
+    Other workers reject the tokens on their next verification, which checks
+    revocation, or once their cached copy expires (TOKEN_CACHE_MAX_TTL_SECONDS).
+    """
+    await asyncio.to_thread(auth.revoke_refresh_tokens, uid, app=get_firebase_app())
+    token_cache.invalidate_uid(uid)
+
 async def verify_token(credentials = Depends(security)):
     """Verify Firebase JWT token and return user information"""
     try:
         token = credentials.credentials
-        decoded_token = auth.verify_id_token(token)
+        decoded_token = await token_cache.verify(token, _verify_id_token)
         # Todo: chnage User type to a correct type        
         return User(**decoded_token)
     
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """
+    Startup warm-up state, reported apart from liveness.
+    The process is live as soon as it serves requests; it is ready once
+    warm-up (loading preloadable models) has finished. Requests that arrive
+    before then still work, they just wait on the model they need.
+    """
+
+    def __init__(self):
+        self.started_at: Optional[str] = None
+        self.ready_at: Optional[str] = None
+        self.warm_up_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.ready_at is not None
+
+    def mark_ready(self) -> None:
+        if self.ready_at is None:
+            self.ready_at = datetime.utcnow().isoformat()
+
+    async def warm_up(self, step: Callable[[], None], background: bool = True) -> None:
+        """Run the blocking `step` on a worker thread, in the background unless told to wait for it"""
+        self.started_at = datetime.utcnow().isoformat()
+        self.error = None
+        if background:
+            self._task = asyncio.create_task(self._run(step))
+        else:
+            await self._run(step)
+
+    async def _run(self, step: Callable[[], None]) -> None:
+        start = time.perf_counter()
+        try:
+            await asyncio.to_thread(step)
+        except Exception as e:
+            self.error = str(e)
+            logger.exception("Warm-up failed")
+            return
+        self.warm_up_seconds = time.perf_counter() - start
+        self.mark_ready()
+        logger.info(f"Warm-up finished in {self.warm_up_seconds:.2f}s")
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "ready": self.is_ready,
+            "started_at": self.started_at,
+            "ready_at": self.ready_at,
+            "warm_up_seconds": round(self.warm_up_seconds, 3) if self.warm_up_seconds is not None else None,
+            "error": self.error,
+        }
+
+
+readiness = Readiness()
@@ -2,29 +2,38 @@ from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.core.firebase import verify_token
 from app.schemas.user import User
+from app.services.cache.api_key_index import api_key_index
 from app.services.firebase.firestore import Firestore
-from typing import Union
+from typing import Optional, Union
+
+API_KEY_PREFIX = "sk_"
 
 security = HTTPBearer()
 api_key_store = Firestore(collection_name="api_keys")
 
+async def _lookup_api_key_uid(key: str) -> Optional[str]:
+    result = await api_key_store.get_by_field("key", key)
+    return result[0].get("uid") if result else None
+
 async def verify_api_key(credentials: HTTPAuthorizationCredentials = Depends(security)):
     token = credentials.credentials
-    result = await api_key_store.get_by_field("key", token)
-    if result:
-        return {"api_key": token, "uid": result[0].get("uid")}
+    uid = await api_key_index.resolve(token, _lookup_api_key_uid)
+    if uid is not None:
+        return {"api_key": token, "uid": uid}
     return None
 
 async def verify_dual_auth(
     request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> Union[User, dict]:
-    try:
-        user = await verify_token(credentials)
-        return user
-    except HTTPException as e:
-        if e.status_code != status.HTTP_401_UNAUTHORIZED:
-            raise e
+    # API keys are never JWTs, so skip the token verification attempt for them
+    if not credentials.credentials.startswith(API_KEY_PREFIX):
+        try:
+            user = await verify_token(credentials)
+            return user
+        except HTTPException as e:
+            if e.status_code != status.HTTP_401_UNAUTHORIZED:
+                raise e
 
     api_key_info = await verify_api_key(credentials)
     if api_key_info:
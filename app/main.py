@@ -1,17 +1,48 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from app.core import settings
+from app.core.readiness import readiness
 from app.routes import register_routes
+from app.services.firebase.session_buffer import close_session_buffers
+from app.services.inference.executor import InferenceQueueFullError, inference_executor
+from app.services.metrics import MetricsMiddleware
+from app.services.model_dependencies import close_streaming_engines, close_summary_batchers, model_registry
 from fastapi.middleware.cors import CORSMiddleware
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.PRELOAD_MODELS:
+        await readiness.warm_up(model_registry.load_all, background=settings.WARM_UP_IN_BACKGROUND)
+    else:
+        readiness.mark_ready()
+    yield
+    await readiness.stop()
+    await close_session_buffers()
+    await close_summary_batchers()
+    close_streaming_engines()
+    inference_executor.shutdown()
+    model_registry.unload_all()
+
+async def inference_queue_full_handler(request: Request, exc: InferenceQueueFullError) -> JSONResponse:
+    """Overload anywhere in a request is a 503 the client can retry"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": f"Server is busy, please try again later: {str(exc)}"},
+        headers={"Retry-After": exc.retry_after_header},
+    )
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.PROJECT_NAME,
         version=settings.APP_VERSION,
         docs_url=settings.DOCS_URL,
         redoc_url=settings.REDOC_URL,
+        lifespan=lifespan,
     )
     
     register_routes(app)
+    app.add_exception_handler(InferenceQueueFullError, inference_queue_full_handler)
     
     return app
 
@@ -25,6 +56,7 @@ app.add_middleware(
     allow_headers=["*"],
     expose_headers=["Content-Type", "Authorization"]
 )
+app.add_middleware(MetricsMiddleware)
 
 if __name__ == "__main__":
     import uvicorn
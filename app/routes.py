@@ -7,6 +7,7 @@ from app.api.histroy.routes import history_router
 from app.api.feedback.routes import feedback_router
 from app.api.category.routes import category_router
 from app.api.manage_keys.routes import manage_key_router
+from app.api.auth.routes import auth_router
 
 def register_routes(app: FastAPI):
     app.include_router(system_router, prefix="/api/system")
@@ -17,4 +18,5 @@ def register_routes(app: FastAPI):
     app.include_router(feedback_router, prefix="/api/feedback")
     app.include_router(category_router, prefix="/api/category")
     app.include_router(manage_key_router, prefix="/api/manage-keys")
+    app.include_router(auth_router, prefix="/api/auth")
 
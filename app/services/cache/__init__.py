@@ -0,0 +1,7 @@
+# video_result_store is imported from its own module: it depends on the model registry, which this package must not load
+from .lru import LRUCache
+from .api_key_index import ApiKeyIndex, api_key_index
+from .disk import DiskCache
+from .session_store import InMemorySessionStore, RedisSessionStore, SessionStore, session_store
+from .summary_cache import SummaryCache, summary_cache
+from .token_cache import VerifiedTokenCache, token_cache
@@ -0,0 +1,98 @@
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.services.cache.lru import LRUCache
+
+_MISSING = object()
+
+
+class ApiKeyIndex:
+    """
+    In-process map of hashed API key → owning uid.
+    Valid keys are remembered for `ttl_seconds` and unknown keys for
+    `negative_ttl_seconds`, so repeated calls skip the Firestore query.
+    Concurrent lookups of the same key share one query. Creating or revoking
+    a key invalidates it at once in this process; other workers keep their
+    cached answer for at most `ttl_seconds` (API_KEY_CACHE_TTL_SECONDS).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, negative_ttl_seconds: float):
+        self.entries = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Bumped on every invalidation so lookups that started earlier do not re-insert stale answers
+        self._generation = 0
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def hash_key(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    async def resolve(self, key: str, lookup: Callable[[str], Awaitable[Optional[str]]]) -> Optional[str]:
+        """uid owning `key`, or None when the key is unknown"""
+        hashed = self.hash_key(key)
+
+        uid = self.entries.get(hashed, _MISSING)
+        if uid is not _MISSING:
+            if uid is None:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return uid
+
+        inflight = self._inflight.get(hashed)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[hashed] = future
+        generation = self._generation
+        try:
+            uid = await lookup(key)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a lookup nobody else waited on does not log an unhandled error
+            future.exception()
+            raise
+        else:
+            if generation == self._generation:
+                ttl = None if uid is not None else self.negative_ttl_seconds
+                self.entries.set(hashed, uid, ttl_seconds=ttl)
+            future.set_result(uid)
+            return uid
+        finally:
+            self._inflight.pop(hashed, None)
+
+    def invalidate_key(self, key: str) -> None:
+        self._generation += 1
+        self.entries.pop(self.hash_key(key))
+
+    def clear(self) -> None:
+        self._generation += 1
+        self.entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.negative_hits) / lookups, 4) if lookups else 0,
+        }
+
+
+api_key_index = ApiKeyIndex(
+    max_entries=settings.API_KEY_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.API_KEY_CACHE_TTL_SECONDS,
+    negative_ttl_seconds=settings.API_KEY_NEGATIVE_TTL_SECONDS,
+)
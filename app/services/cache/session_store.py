@@ -0,0 +1,168 @@
+import heapq
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+class SessionStore(ABC):
+    """Expiring key → session-document store shared by the summarize routes"""
+
+    @abstractmethod
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    async def set(self, session_id: str, data: Dict[str, Any], ttl_seconds: Optional[float] = None) -> None:
+        ...
+
+    @abstractmethod
+    async def update(self, session_id: str, fields: Dict[str, Any]) -> None:
+        """Merge `fields` into a stored session, keeping its expiry; no-op when absent"""
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        ...
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Per-process backend. Entries leave in LRU order beyond `max_entries`,
+    and expire through a min-heap of deadlines that is drained on every
+    call, so expired sessions never accumulate. Each deadline costs
+    O(log n) to push and to pop.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._deadlines: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+        self.expirations = 0
+        self.evictions = 0
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._expire()
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            self._entries.move_to_end(session_id)
+            return dict(entry[0])
+
+    async def set(self, session_id: str, data: Dict[str, Any], ttl_seconds: Optional[float] = None) -> None:
+        expires_at = self._clock() + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        with self._lock:
+            self._expire()
+            self._entries[session_id] = (dict(data), expires_at)
+            self._entries.move_to_end(session_id)
+            heapq.heappush(self._deadlines, (expires_at, session_id))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    async def update(self, session_id: str, fields: Dict[str, Any]) -> None:
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                entry[0].update(fields)
+
+    async def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+        }
+
+    def _expire(self) -> None:
+        now = self._clock()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            expires_at, session_id = heapq.heappop(self._deadlines)
+            entry = self._entries.get(session_id)
+            # Re-set sessions leave their older deadline behind in the heap; skip those
+            if entry is not None and entry[1] == expires_at:
+                del self._entries[session_id]
+                self.expirations += 1
+        # Entries dropped by LRU or delete also leave deadlines behind; rebuild once they dominate
+        if len(self._deadlines) > 2 * len(self._entries) + 64:
+            self._deadlines = [(entry[1], key) for key, entry in self._entries.items()]
+            heapq.heapify(self._deadlines)
+
+
+# Merges JSON fields into a stored session inside Redis, so concurrent updates from other workers are not lost
+MERGE_SCRIPT = """
+local value = redis.call('GET', KEYS[1])
+if not value then
+    return 0
+end
+local data = cjson.decode(value)
+for field, field_value in pairs(cjson.decode(ARGV[1])) do
+    data[field] = field_value
+end
+redis.call('SET', KEYS[1], cjson.encode(data), 'KEEPTTL')
+return 1
+"""
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Backend shared by every worker, on any client exposing the async redis
+    `get`/`set`/`delete`/`register_script` API. Expiry uses Redis TTLs; the
+    entry bound is the server's `maxmemory` with an LRU eviction policy.
+    """
+
+    def __init__(self, client, ttl_seconds: float, prefix: str = "session:"):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self._merge = client.register_script(MERGE_SCRIPT)
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        value = await self.client.get(self.prefix + session_id)
+        return json.loads(value) if value is not None else None
+
+    async def set(self, session_id: str, data: Dict[str, Any], ttl_seconds: Optional[float] = None) -> None:
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        await self.client.set(self.prefix + session_id, json.dumps(data, default=str), ex=max(1, int(ttl)))
+
+    async def update(self, session_id: str, fields: Dict[str, Any]) -> None:
+        await self._merge(keys=[self.prefix + session_id], args=[json.dumps(fields, default=str)])
+
+    async def delete(self, session_id: str) -> None:
+        await self.client.delete(self.prefix + session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "redis"}
+
+
+def create_session_store() -> SessionStore:
+    if settings.SESSION_STORE_URL:
+        import redis.asyncio as redis
+
+        return RedisSessionStore(
+            redis.from_url(settings.SESSION_STORE_URL, decode_responses=True),
+            ttl_seconds=settings.SESSION_TTL_SECONDS,
+        )
+    return InMemorySessionStore(
+        max_entries=settings.SESSION_STORE_MAX_ENTRIES,
+        ttl_seconds=settings.SESSION_TTL_SECONDS,
+    )
+
+
+session_store = create_session_store()
@@ -0,0 +1,112 @@
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.services.cache.disk import DiskCache
+from app.services.cache.lru import LRUCache
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of an input text for cache keys"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class SummaryCache:
+    """
+    Content-addressed cache of generated summaries.
+    Keys hash the normalized text together with the model, category and
+    generation parameters. Lookups hit an in-memory LRU first and then,
+    when `disk_path` is set, a SQLite tier that survives restarts.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: Optional[float] = None,
+        disk_path: Optional[str] = None,
+        disk_max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.memory = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.disk = DiskCache(disk_path, ttl_seconds=ttl_seconds, max_bytes=disk_max_bytes) if disk_path else None
+
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        text: str,
+        model: str,
+        category: Optional[str] = None,
+        generation_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        payload = json.dumps(
+            {
+                "text": normalize_text(text),
+                "model": model,
+                "category": category,
+                "generation": generation_kwargs or {},
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("memory_hits")
+            return value
+
+        if self.disk is not None:
+            value = await asyncio.to_thread(self.disk.get, key)
+            if value is not None:
+                self._count("disk_hits")
+                self.memory.set(key, value)
+                return value
+
+        self._count("misses")
+        return None
+
+    async def set(self, key: str, value: str) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, value)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_entries": len(self.memory),
+            "memory_evictions": self.memory.evictions,
+            "disk_enabled": self.disk is not None,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0,
+        }
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+summary_cache = SummaryCache(
+    max_entries=settings.SUMMARY_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SUMMARY_CACHE_TTL_SECONDS,
+    disk_path=settings.SUMMARY_CACHE_DISK_PATH or None,
+    disk_max_bytes=settings.SUMMARY_CACHE_DISK_MAX_MB * 1024 * 1024,
+)
@@ -0,0 +1,96 @@
+import asyncio
+import hashlib
+import time
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.services.cache.lru import LRUCache
+
+# Firebase ID tokens expire an hour after issue, so older revocations cannot match a live token
+ID_TOKEN_LIFETIME_SECONDS = 3600
+
+
+class VerifiedTokenCache:
+    """
+    Decoded ID-token claims keyed by a hash of the token.
+    An entry lives until the token's `exp`, capped at `max_ttl_seconds` so
+    revocations made elsewhere are picked up within that window. Verification
+    runs on a worker thread, since cold certificate fetches block.
+    """
+
+    def __init__(self, max_entries: int, max_ttl_seconds: float, clock: Callable[[], float] = time.time):
+        self.entries = LRUCache(max_entries=max_entries)
+        self.max_ttl_seconds = max_ttl_seconds
+        self._clock = clock
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # uid → time before which every token of that user is rejected
+        self._revoked_before = LRUCache(max_entries=max_entries, ttl_seconds=ID_TOKEN_LIFETIME_SECONDS, clock=clock)
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def hash_token(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    async def verify(self, token: str, verifier: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        """Claims of `token`, from cache or from `verifier`, which raises on invalid tokens"""
+        hashed = self.hash_token(token)
+
+        claims = self.entries.get(hashed)
+        if claims is not None and not self._is_revoked(claims):
+            self.hits += 1
+            return claims
+
+        inflight = self._inflight.get(hashed)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[hashed] = future
+        try:
+            claims = await asyncio.to_thread(verifier, token)
+            if self._is_revoked(claims):
+                raise PermissionError("Token has been revoked")
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a verification nobody else waited on does not log an unhandled error
+            future.exception()
+            raise
+        else:
+            ttl = min(claims.get("exp", 0) - self._clock(), self.max_ttl_seconds)
+            if ttl > 0:
+                self.entries.set(hashed, claims, ttl_seconds=ttl)
+            future.set_result(claims)
+            return claims
+        finally:
+            self._inflight.pop(hashed, None)
+
+    def invalidate_uid(self, uid: str) -> int:
+        """Reject every token issued to `uid` so far, cached or not"""
+        self._revoked_before.set(uid, self._clock())
+        return self.entries.pop_where(lambda _, claims: claims.get("uid") == uid)
+
+    def _is_revoked(self, claims: Dict[str, Any]) -> bool:
+        revoked_before: Optional[float] = self._revoked_before.get(claims.get("uid"))
+        return revoked_before is not None and claims.get("iat", 0) <= revoked_before
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "revoked_users": len(self._revoked_before),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0,
+        }
+
+
+token_cache = VerifiedTokenCache(
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+    max_ttl_seconds=settings.TOKEN_CACHE_MAX_TTL_SECONDS,
+)
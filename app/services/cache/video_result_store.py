@@ -0,0 +1,250 @@
+import asyncio
+import json
+import os
+import threading
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.cache.disk import DiskCache
+from app.services.cache.lru import LRUCache
+from app.services.model_dependencies.mt5 import MT5_MODEL
+from app.services.model_dependencies.registry import model_registry
+
+
+def current_model_version() -> str:
+    """Identity of the model writing video summaries, including the precision it runs at"""
+    version = settings.MODEL_VERSION or os.path.basename(settings.MODEL_PATH.rstrip("/"))
+    return f"{version}@{model_registry.precision(MT5_MODEL)}"
+
+
+class VideoResult:
+    """Per-chunk transcripts, summary paragraphs and the whole-video digest produced for one video"""
+
+    def __init__(
+        self,
+        video_id: str,
+        model_version: str,
+        transcripts: Optional[Dict[int, str]] = None,
+        paragraphs: Optional[List[Dict[str, Any]]] = None,
+        completed: bool = False,
+        digest: Optional[str] = None,
+        live: bool = False,
+    ):
+        self.video_id = video_id
+        self.model_version = model_version
+        self.transcripts = transcripts or {}
+        self.paragraphs = paragraphs or []
+        self.completed = completed
+        self.digest = digest
+        # Live chunk indexes count from wherever the broadcast was joined, so live results are never stored
+        self.live = live
+
+    @property
+    def next_chunk(self) -> int:
+        """Index of the first chunk not covered by a stored paragraph"""
+        if not self.paragraphs:
+            return 0
+        return self.paragraphs[-1]["to_chunk"] + 1
+
+    def add_transcript(self, chunk_index: int, text: str) -> None:
+        self.transcripts[chunk_index] = text
+
+    def add_paragraph(self, from_chunk: int, to_chunk: int, from_seconds: int, text: str) -> None:
+        self.paragraphs.append({
+            "from_chunk": from_chunk,
+            "to_chunk": to_chunk,
+            "from": from_seconds,
+            "text": text,
+        })
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "video_id": self.video_id,
+            "model_version": self.model_version,
+            "transcripts": {str(index): text for index, text in self.transcripts.items()},
+            "paragraphs": self.paragraphs,
+            "completed": self.completed,
+            "digest": self.digest,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "VideoResult":
+        return cls(
+            video_id=data["video_id"],
+            model_version=data["model_version"],
+            transcripts={int(index): text for index, text in data.get("transcripts", {}).items()},
+            paragraphs=list(data.get("paragraphs", [])),
+            completed=data.get("completed", False),
+            digest=data.get("digest"),
+        )
+
+
+def merge_results(stored: VideoResult, incoming: VideoResult) -> VideoResult:
+    """
+    Combine two snapshots of the same video so neither writer's work is lost.
+    Paragraphs are ordered by chunk; one overlapping an earlier kept paragraph is dropped.
+    """
+    paragraphs = []
+    for paragraph in sorted(stored.paragraphs + incoming.paragraphs, key=lambda p: p["from_chunk"]):
+        if paragraphs and paragraph["from_chunk"] <= paragraphs[-1]["to_chunk"]:
+            continue
+        paragraphs.append(paragraph)
+
+    return VideoResult(
+        video_id=incoming.video_id,
+        model_version=incoming.model_version,
+        transcripts={**stored.transcripts, **incoming.transcripts},
+        paragraphs=paragraphs,
+        completed=stored.completed or incoming.completed,
+        digest=incoming.digest or stored.digest,
+    )
+
+
+class VideoFlight:
+    """
+    The one session computing a video. Other sessions for the same video
+    follow its paragraphs as they are saved instead of running the pipeline again.
+    """
+
+    def __init__(self, result: VideoResult):
+        self.result = result
+        self.done = False
+        self._changed = asyncio.Event()
+
+    def notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def finish(self) -> None:
+        self.done = True
+        self.notify()
+
+    async def follow(self, start: int = 0) -> AsyncIterator[Dict[str, Any]]:
+        """Paragraphs from index `start`, as the leading session adds them, until it finishes"""
+        index = start
+        while True:
+            changed = self._changed
+            if index < len(self.result.paragraphs):
+                yield self.result.paragraphs[index]
+                index += 1
+            elif self.done:
+                return
+            else:
+                await changed.wait()
+
+
+class VideoResultStore:
+    """
+    Stores video summarization results keyed by video ID and model version,
+    so later sessions for the same video can replay them instead of
+    downloading, transcribing and summarizing again.
+    Snapshots are kept as JSON and merged on save, so concurrent writers never
+    drop each other's paragraphs. Sessions call `join` to find out whether they
+    compute a video or follow the session already doing so.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: Optional[float] = None,
+        disk_path: Optional[str] = None,
+        disk_max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.memory = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.disk = DiskCache(disk_path, ttl_seconds=ttl_seconds, max_bytes=disk_max_bytes) if disk_path else None
+        self._flights: Dict[str, VideoFlight] = {}
+        self._disk_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(video_id: str, model_version: str) -> str:
+        return f"{video_id}:{model_version}"
+
+    async def get(self, video_id: str, model_version: Optional[str] = None) -> Optional[VideoResult]:
+        key = self.make_key(video_id, model_version or current_model_version())
+        snapshot = self.memory.get(key)
+
+        if snapshot is None and self.disk is not None:
+            snapshot = await asyncio.to_thread(self.disk.get, key)
+            if snapshot is not None:
+                self.memory.set(key, snapshot)
+
+        if snapshot is None:
+            return None
+        return VideoResult.from_dict(json.loads(snapshot))
+
+    async def get_or_create(self, video_id: str) -> VideoResult:
+        model_version = current_model_version()
+        result = await self.get(video_id, model_version)
+        return result or VideoResult(video_id=video_id, model_version=model_version)
+
+    async def join(self, video_id: str) -> Tuple[VideoFlight, bool]:
+        """
+        Flight for the video and whether the caller leads it. The leader runs
+        the pipeline and must `release` the flight; everyone else follows it.
+        """
+        model_version = current_model_version()
+        key = self.make_key(video_id, model_version)
+        flight = self._flights.get(key)
+        if flight is not None:
+            return flight, False
+
+        result = await self.get(video_id, model_version) or VideoResult(video_id=video_id, model_version=model_version)
+
+        # Another session may have taken the lead while the stored result was loading
+        flight = self._flights.get(key)
+        if flight is not None:
+            return flight, False
+
+        flight = VideoFlight(result)
+        self._flights[key] = flight
+        return flight, True
+
+    def release(self, flight: VideoFlight) -> None:
+        key = self.make_key(flight.result.video_id, flight.result.model_version)
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        flight.finish()
+
+    async def save(self, result: VideoResult) -> None:
+        if result.live:
+            return
+        key = self.make_key(result.video_id, result.model_version)
+
+        stored = self.memory.get(key)
+        if stored is None and self.disk is not None:
+            from_disk = await asyncio.to_thread(self.disk.get, key)
+            stored = self.memory.get(key) or from_disk
+
+        # Read, merge and write with no await in between, so saves on the event loop never interleave
+        if stored is not None:
+            result = merge_results(VideoResult.from_dict(json.loads(stored)), result)
+        self.memory.set(key, json.dumps(result.to_dict(), ensure_ascii=False))
+
+        flight = self._flights.get(key)
+        if flight is not None:
+            flight.notify()
+
+        if self.disk is not None:
+            await asyncio.to_thread(self._persist, key)
+
+    def _persist(self, key: str) -> None:
+        # Always writes the newest merged snapshot, whichever save thread runs last
+        with self._disk_lock:
+            snapshot = self.memory.get(key)
+            if snapshot is not None:
+                self.disk.set(key, snapshot)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory_entries": len(self.memory),
+            "disk_enabled": self.disk is not None,
+            "flights": len(self._flights),
+        }
+
+
+video_result_store = VideoResultStore(
+    max_entries=settings.VIDEO_RESULT_MAX_ENTRIES,
+    ttl_seconds=settings.VIDEO_RESULT_TTL_SECONDS,
+    disk_path=settings.VIDEO_RESULT_DISK_PATH or None,
+    disk_max_bytes=settings.VIDEO_RESULT_DISK_MAX_MB * 1024 * 1024,
+)
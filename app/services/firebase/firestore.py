@@ -1,17 +1,50 @@
-from app.core.firebase import db
 from typing import Dict, List, Any, Optional, Tuple
 from fastapi import HTTPException, status
-from google.cloud.firestore import Query
+from google.api_core.exceptions import NotFound
+
+from app.services.firebase.write_coalescer import WriteCoalescer
+from app.services.metrics import timed_firestore
 
 class Firestore:
-    def __init__(self, collection_name: str):
-        self.collection = db.collection(collection_name)
+    """
+    Collection wrapper on the async Firestore client. Writes rely on server-side
+    preconditions rather than a read before each write; `update(coalesce=True)`
+    batches bursts of updates through a WriteCoalescer.
+    """
+
+    def __init__(self, collection_name: str, client=None, coalesce_ms: float = 50):
+        self.collection_name = collection_name
+        self.coalesce_ms = coalesce_ms
+        self._client = client
+        self._collection = None
+        self._coalescer = None
+
+    @property
+    def client(self):
+        # Resolved on first use, so module-level stores do not initialise Firebase at import
+        if self._client is None:
+            from app.core.firebase import get_async_db
+            self._client = get_async_db()
+        return self._client
+
+    @property
+    def collection(self):
+        if self._collection is None:
+            self._collection = self.client.collection(self.collection_name)
+        return self._collection
+
+    @property
+    def coalescer(self) -> WriteCoalescer:
+        if self._coalescer is None:
+            self._coalescer = WriteCoalescer(self.client, self.collection, flush_interval_ms=self.coalesce_ms)
+        return self._coalescer
     
+    @timed_firestore("create")
     async def create(self, data: Dict[str, Any]) -> str:
         """Create a new document and return its ID"""
         try:
             doc_ref = self.collection.document()
-            doc_ref.set(data)
+            await doc_ref.set(data)
             return doc_ref.id
         except Exception as e:
             raise HTTPException(
@@ -19,21 +52,22 @@ class Firestore:
                 detail=f"Failed to create document: {str(e)}"
             )
     
+    @timed_firestore("get_all")
     async def get_all(self) -> List[Dict[str, Any]]:
         """Get all documents from collection"""
         try:
-            docs = self.collection.stream()
-            return [{"id": doc.id, **doc.to_dict()} for doc in docs]
+            return [{"id": doc.id, **doc.to_dict()} async for doc in self.collection.stream()]
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to retrieve documents: {str(e)}"
             )
     
+    @timed_firestore("get_by_id")
     async def get_by_id(self, doc_id: str) -> Dict[str, Any]:
         """Get document by ID"""
         try:
-            doc = self.collection.document(doc_id).get()
+            doc = await self.collection.document(doc_id).get()
             if not doc.exists:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -48,40 +82,37 @@ class Firestore:
                 detail=f"Failed to retrieve document: {str(e)}"
             )
     
-    async def update(self, doc_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Update document by ID"""
+    @timed_firestore("update")
+    async def update(self, doc_id: str, data: Dict[str, Any], coalesce: bool = False) -> Dict[str, Any]:
+        """Update document by ID; a missing document fails the update's exists precondition"""
         try:
-            doc_ref = self.collection.document(doc_id)
-            doc = doc_ref.get()
-            if not doc.exists:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Document with ID {doc_id} not found"
-                )
-            doc_ref.update(data)
+            if coalesce:
+                await self.coalescer.update(doc_id, data)
+            else:
+                await self.collection.document(doc_id).update(data)
             return {"id": doc_id, **data}
-        except HTTPException:
-            raise
+        except NotFound:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Document with ID {doc_id} not found"
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to update document: {str(e)}"
             )
     
+    @timed_firestore("delete")
     async def delete(self, doc_id: str) -> Dict[str, str]:
         """Delete document by ID"""
         try:
-            doc_ref = self.collection.document(doc_id)
-            doc = doc_ref.get()
-            if not doc.exists:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Document with ID {doc_id} not found"
-                )
-            doc_ref.delete()
+            await self.collection.document(doc_id).delete(option=self.client.write_option(exists=True))
             return {"message": f"Document with ID {doc_id} deleted successfully"}
-        except HTTPException:
-            raise
+        except NotFound:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Document with ID {doc_id} not found"
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -89,6 +120,7 @@ class Firestore:
             )
         
 
+    @timed_firestore("get_by_field")
     async def get_by_field(
         self,
         field: str,
@@ -105,16 +137,18 @@ class Firestore:
                     query = query.where(field_path, op, val)
 
             if order_by_field:
+                from google.cloud.firestore import Query
                 direction = Query.DESCENDING if order_direction.upper() == "DESC" else Query.ASCENDING
                 query = query.order_by(order_by_field, direction=direction)
 
-            return [{"id": doc.id, **doc.to_dict()} for doc in query.stream()]
+            return [{"id": doc.id, **doc.to_dict()} async for doc in query.stream()]
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Query failed: {str(e)}"
             )
 
+    @timed_firestore("delete_by_field")
     async def delete_by_field(self, field: str, value: Any) -> Dict[str, Any]:
         """
         Delete all documents where `field` == `value`.
@@ -122,7 +156,7 @@ class Firestore:
         """
         try:
             query = self.collection.where(field, "==", value)
-            docs = list(query.stream())
+            docs = [doc async for doc in query.stream()]
 
             if not docs:
                 return {"message": f"No documents found with {field} == {value}"}
@@ -131,11 +165,11 @@ class Firestore:
             total_deleted = 0
 
             for i in range(0, len(docs), batch_size):
-                batch = db.batch()
+                batch = self.client.batch()
                 batch_docs = docs[i:i+batch_size]
                 for doc in batch_docs:
                     batch.delete(doc.reference)
-                batch.commit()
+                await batch.commit()
                 total_deleted += len(batch_docs)
 
             return {
@@ -0,0 +1,187 @@
+import asyncio
+import copy
+import operator
+import uuid
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+
+from google.api_core.exceptions import AlreadyExists, NotFound
+from google.cloud.firestore_v1.transforms import ArrayRemove, ArrayUnion
+
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda field, values: field in values,
+    "not-in": lambda field, values: field not in values,
+    "array-contains": lambda field, value: isinstance(field, list) and value in field,
+}
+
+
+class _ExistsOption:
+    def __init__(self, exists: bool):
+        self.exists = exists
+
+
+class InMemorySnapshot:
+    def __init__(self, reference: "InMemoryDocument", data: Optional[Dict[str, Any]]):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return copy.deepcopy(self._data)
+
+
+class InMemoryDocument:
+    def __init__(self, client: "InMemoryFirestoreClient", collection: str, doc_id: str):
+        self._client = client
+        self._collection = collection
+        self.id = doc_id
+
+    @property
+    def _documents(self) -> Dict[str, Dict[str, Any]]:
+        return self._client.data.setdefault(self._collection, {})
+
+    async def get(self) -> InMemorySnapshot:
+        await self._client.round_trip()
+        return self._snapshot()
+
+    async def set(self, data: Dict[str, Any]) -> None:
+        await self._client.round_trip()
+        self._set(data)
+
+    async def create(self, data: Dict[str, Any]) -> None:
+        await self._client.round_trip()
+        if self.id in self._documents:
+            raise AlreadyExists(f"Document {self.id} already exists")
+        self._set(data)
+
+    async def update(self, data: Dict[str, Any]) -> None:
+        await self._client.round_trip()
+        self._update(data)
+
+    async def delete(self, option: Optional[_ExistsOption] = None) -> None:
+        await self._client.round_trip()
+        self._delete(option)
+
+    def _snapshot(self) -> InMemorySnapshot:
+        return InMemorySnapshot(self, copy.deepcopy(self._documents.get(self.id)))
+
+    def _set(self, data: Dict[str, Any]) -> None:
+        self._documents[self.id] = {}
+        self._update(data, must_exist=False)
+
+    def _update(self, data: Dict[str, Any], must_exist: bool = True) -> None:
+        if must_exist and self.id not in self._documents:
+            raise NotFound(f"No document to update: {self.id}")
+
+        document = self._documents.setdefault(self.id, {})
+        for field, value in data.items():
+            current = document.get(field)
+            if isinstance(value, ArrayUnion):
+                current = list(current) if isinstance(current, list) else []
+                current.extend(item for item in value.values if item not in current)
+                document[field] = current
+            elif isinstance(value, ArrayRemove):
+                current = current if isinstance(current, list) else []
+                document[field] = [item for item in current if item not in value.values]
+            else:
+                document[field] = copy.deepcopy(value)
+
+    def _delete(self, option: Optional[_ExistsOption] = None) -> None:
+        if option is not None and option.exists and self.id not in self._documents:
+            raise NotFound(f"No document to delete: {self.id}")
+        self._documents.pop(self.id, None)
+
+
+class InMemoryQuery:
+    def __init__(self, client: "InMemoryFirestoreClient", collection: str, filters=None, order=None):
+        self._client = client
+        self._collection = collection
+        self._filters = filters or []
+        self._order = order or []
+
+    def where(self, field: str, op: str, value: Any) -> "InMemoryQuery":
+        return InMemoryQuery(self._client, self._collection, self._filters + [(field, _OPERATORS[op], value)], self._order)
+
+    def order_by(self, field: str, direction: str = "ASCENDING") -> "InMemoryQuery":
+        return InMemoryQuery(self._client, self._collection, self._filters, self._order + [(field, direction)])
+
+    async def stream(self) -> AsyncGenerator[InMemorySnapshot, None]:
+        await self._client.round_trip()
+        documents = self._client.data.get(self._collection, {})
+
+        matches = [
+            doc_id for doc_id, data in documents.items()
+            if all(field in data and op(data[field], value) for field, op, value in self._filters)
+        ]
+        for field, direction in reversed(self._order):
+            matches = [doc_id for doc_id in matches if field in documents[doc_id]]
+            matches.sort(key=lambda doc_id: documents[doc_id][field], reverse=direction == "DESCENDING")
+
+        for doc_id in matches:
+            yield InMemoryDocument(self._client, self._collection, doc_id)._snapshot()
+
+
+class InMemoryCollection(InMemoryQuery):
+    def document(self, doc_id: Optional[str] = None) -> InMemoryDocument:
+        return InMemoryDocument(self._client, self._collection, doc_id or uuid.uuid4().hex[:20])
+
+
+class InMemoryWriteBatch:
+    def __init__(self, client: "InMemoryFirestoreClient"):
+        self._client = client
+        self._writes: List[Callable[[], None]] = []
+
+    def set(self, reference: InMemoryDocument, data: Dict[str, Any]) -> None:
+        self._writes.append(lambda: reference._set(data))
+
+    def update(self, reference: InMemoryDocument, data: Dict[str, Any]) -> None:
+        self._writes.append(lambda: reference._update(data))
+
+    def delete(self, reference: InMemoryDocument, option: Optional[_ExistsOption] = None) -> None:
+        self._writes.append(lambda: reference._delete(option))
+
+    async def commit(self) -> None:
+        await self._client.round_trip()
+        # Batched writes are atomic: apply to a copy and publish only if every write succeeds
+        original = self._client.data
+        self._client.data = copy.deepcopy(original)
+        try:
+            for write in self._writes:
+                write()
+        except Exception:
+            self._client.data = original
+            raise
+
+
+class InMemoryFirestoreClient:
+    """
+    Offline stand-in for the async Firestore client covering what the
+    Firestore wrapper uses. `latency_ms` simulates the network round trip
+    of each RPC, and `rpc_count` records how many were made.
+    """
+
+    def __init__(self, latency_ms: float = 0):
+        self.latency = latency_ms / 1000
+        self.data: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.rpc_count = 0
+
+    def collection(self, name: str) -> InMemoryCollection:
+        return InMemoryCollection(self, name)
+
+    def batch(self) -> InMemoryWriteBatch:
+        return InMemoryWriteBatch(self)
+
+    @staticmethod
+    def write_option(exists: bool) -> _ExistsOption:
+        return _ExistsOption(exists)
+
+    async def round_trip(self) -> None:
+        self.rpc_count += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import weakref
+from datetime import datetime
+from typing import List, Optional
+
+from google.cloud.firestore_v1 import ArrayUnion
+
+logger = logging.getLogger(__name__)
+
+_active_buffers = weakref.WeakSet()
+# Final flushes outlive the stream that started them; hold them until they finish
+_final_flushes = set()
+
+
+class SessionProgressBuffer:
+    """
+    Write-behind buffer for a streaming session's progress.
+    Paragraphs, status changes and the `updatedAt` timestamp accumulate in
+    memory and are written to Firestore every `flush_interval` seconds, so
+    the token stream never waits on the database. `close()` always performs
+    a final flush, even when the stream is torn down by a client disconnect.
+    """
+
+    def __init__(self, store, session_id: str, flush_interval: float = 2.0):
+        self.store = store
+        self.session_id = session_id
+        self.flush_interval = flush_interval
+
+        self._paragraphs: List[str] = []
+        self._status: Optional[str] = None
+        self._updated_at: Optional[str] = None
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._closed = False
+
+    def start(self) -> None:
+        if self._timer is None:
+            self._timer = asyncio.create_task(self._flush_periodically())
+            _active_buffers.add(self)
+
+    def add_paragraphs(self, paragraphs: List[str]) -> None:
+        self._paragraphs.extend(paragraphs)
+        self._touch()
+
+    def set_status(self, status: str) -> None:
+        self._status = status
+        self._touch()
+
+    @property
+    def dirty(self) -> bool:
+        return self._updated_at is not None
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self.dirty:
+                return
+
+            paragraphs, status, updated_at = self._paragraphs, self._status, self._updated_at
+            self._paragraphs, self._status, self._updated_at = [], None, None
+
+            data = {"updatedAt": updated_at}
+            if paragraphs:
+                data["summary"] = ArrayUnion(paragraphs)
+            if status is not None:
+                data["status"] = status
+
+            try:
+                await self.store.update(self.session_id, data, coalesce=True)
+            except Exception:
+                # Put the progress back so the next flush retries it ahead of newer changes
+                self._paragraphs = paragraphs + self._paragraphs
+                self._status = self._status or status
+                self._updated_at = self._updated_at or updated_at
+                raise
+
+    async def close(self) -> None:
+        """Stop the timer and flush whatever is left; safe to call more than once"""
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._timer is not None:
+            self._timer.cancel()
+
+        final_flush = asyncio.ensure_future(self._final_flush())
+        _final_flushes.add(final_flush)
+        final_flush.add_done_callback(_final_flushes.discard)
+        # Shielded so a cancelled (disconnected) stream cannot abort the last write
+        await asyncio.shield(final_flush)
+
+    async def __aenter__(self) -> "SessionProgressBuffer":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    def _touch(self) -> None:
+        self._updated_at = datetime.now().isoformat()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Flushing progress of session {self.session_id} failed: {str(e)}")
+
+    async def _final_flush(self) -> None:
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Final flush of session {self.session_id} failed: {str(e)}")
+        finally:
+            _active_buffers.discard(self)
+
+
+async def close_session_buffers() -> None:
+    """Flush every open session buffer and wait for pending final flushes, e.g. at shutdown"""
+    await asyncio.gather(*(buffer.close() for buffer in list(_active_buffers)), return_exceptions=True)
+    if _final_flushes:
+        await asyncio.gather(*list(_final_flushes), return_exceptions=True)
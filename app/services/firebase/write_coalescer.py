@@ -0,0 +1,117 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.cloud.firestore_v1.transforms import ArrayRemove, ArrayUnion
+
+from app.services.metrics import observe_stage
+
+logger = logging.getLogger(__name__)
+
+
+def merge_updates(pending: Dict[str, Any], data: Dict[str, Any]) -> None:
+    """Fold `data` into `pending` so one write has the effect of both, in order"""
+    for field, value in data.items():
+        previous = pending.get(field)
+        if isinstance(previous, ArrayUnion) and isinstance(value, ArrayUnion):
+            pending[field] = ArrayUnion(list(previous.values) + list(value.values))
+        elif isinstance(previous, ArrayRemove) and isinstance(value, ArrayRemove):
+            pending[field] = ArrayRemove(list(previous.values) + list(value.values))
+        else:
+            pending[field] = value
+
+
+class WriteCoalescer:
+    """
+    Buffers document updates for up to `flush_interval_ms`, merging repeated
+    updates to the same document, and commits them as a single batched write.
+    Each caller awaits the commit that carries its update.
+    """
+
+    def __init__(self, client, collection, flush_interval_ms: float = 50, max_batch_size: int = 500):
+        self.client = client
+        self.collection = collection
+        self.flush_interval = flush_interval_ms / 1000
+        # Firestore caps a batched write at 500 operations
+        self.max_batch_size = min(max_batch_size, 500)
+
+        self._pending: Dict[str, Tuple[Dict[str, Any], List[asyncio.Future]]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flushing = set()
+
+        self.updates = 0
+        self.commits = 0
+
+    async def update(self, doc_id: str, data: Dict[str, Any]) -> None:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        fields, waiters = self._pending.setdefault(doc_id, ({}, []))
+        merge_updates(fields, data)
+        waiters.append(future)
+        self.updates += 1
+
+        if len(self._pending) >= self.max_batch_size:
+            self._start_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.flush_interval, self._start_flush)
+
+        await future
+
+    async def flush(self) -> None:
+        """Commit everything buffered so far and wait for in-flight commits"""
+        self._start_flush()
+        if self._flushing:
+            await asyncio.gather(*self._flushing, return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "updates": self.updates,
+            "commits": self.commits,
+            "pending_documents": len(self._pending),
+        }
+
+    def _start_flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._commit(pending))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def _commit(self, pending: Dict[str, Tuple[Dict[str, Any], List[asyncio.Future]]]) -> None:
+        batch = self.client.batch()
+        for doc_id, (fields, _) in pending.items():
+            batch.update(self.collection.document(doc_id), fields)
+
+        try:
+            with observe_stage("firestore_batch_commit"):
+                await batch.commit()
+            self.commits += 1
+            for _, waiters in pending.values():
+                self._resolve(waiters)
+        except Exception as e:
+            if len(pending) == 1:
+                for _, waiters in pending.values():
+                    self._resolve(waiters, e)
+                return
+
+            # A batch is atomic, so one missing document fails all of them; retry individually
+            logger.warning(f"Batched write of {len(pending)} documents failed, retrying individually: {str(e)}")
+            await asyncio.gather(*(
+                self._commit({doc_id: entry}) for doc_id, entry in pending.items()
+            ))
+
+    @staticmethod
+    def _resolve(waiters: List[asyncio.Future], error: Optional[BaseException] = None) -> None:
+        for waiter in waiters:
+            if waiter.done():
+                continue
+            if error is None:
+                waiter.set_result(None)
+            else:
+                waiter.set_exception(error)
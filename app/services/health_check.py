@@ -1,9 +1,33 @@
+import time
 from datetime import datetime
 
+_started_at = time.monotonic()
+
 class HealthCheckService:
     async def check_health(self) -> dict:
+        """Liveness: the process is up and serving"""
+        # Imported here: app.core imports this module while it initialises
+        from app.core.config import settings
+
         return {
             "status": "ok",
             "timestamp": datetime.utcnow().isoformat(),
-            "version": "1.0.0",
+            "version": settings.APP_VERSION,
+            "uptime_seconds": round(time.monotonic() - _started_at, 1),
+        }
+
+    async def check_readiness(self) -> dict:
+        """Readiness: warm-up has finished and every preloadable model is resident"""
+        from app.core.config import settings
+        from app.core.readiness import readiness
+        from app.services.model_dependencies import model_registry
+
+        pending = model_registry.pending_preloads() if settings.PRELOAD_MODELS else []
+        warm_up = readiness.describe()
+        warm_up["ready"] = readiness.is_ready and not pending
+        return {
+            "status": "ready" if warm_up["ready"] else "starting",
+            "timestamp": datetime.utcnow().isoformat(),
+            "pending_models": pending,
+            **warm_up,
         }
@@ -0,0 +1,3 @@
+from .admission import AdmissionController, AdmissionRejectedError, get_admission_controller
+from .batcher import GenerationBatcher
+from .executor import InferenceExecutor, InferenceQueueFullError, inference_executor
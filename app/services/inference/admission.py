@@ -0,0 +1,219 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.services.inference.executor import InferenceQueueFullError
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+
+class AdmissionRejectedError(InferenceQueueFullError):
+    """Raised when a request is shed because its queue wait would exceed the SLO"""
+
+
+def priority_for(principal: Any) -> str:
+    """Interactive for signed-in users, batch for API-key callers (verify_dual_auth returns a dict for those)"""
+    if isinstance(principal, dict) and "api_key" in principal:
+        return BATCH
+    return INTERACTIVE
+
+
+class AdmissionController:
+    """
+    Admission for one model.
+    At most `limit` requests execute at once; the rest wait in a FIFO queue
+    per priority class. The limit adapts between `min_concurrency` and
+    `max_concurrency`: it is the ceiling scaled by the baseline service time
+    over the current one, so it shrinks while requests slow down under
+    contention and grows back as they speed up. Freed slots are handed over by weighted
+    round robin, so neither class starves the other.
+    A request is shed up front when its estimated wait exceeds
+    `max_queue_wait`, and again if it has actually waited that long. The
+    estimate uses a moving average of measured execution time, which also
+    sets the Retry-After hint.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        max_queue_wait: float,
+        max_queue_size: int = 128,
+        min_concurrency: int = 1,
+        weights: Optional[Dict[str, int]] = None,
+        initial_service_time: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = min(max(1, min_concurrency), self.max_concurrency)
+        self.max_queue_wait = max_queue_wait
+        self.max_queue_size = max_queue_size
+        # A class with no weight would never be served once its queue formed
+        self.weights = {cls: max(1, weight) for cls, weight in (weights or {INTERACTIVE: 3, BATCH: 1}).items()}
+        self.service_time = initial_service_time
+        # Service time without contention: the lowest average seen, drifting up so a heavier workload resets it
+        self.baseline_service_time: Optional[float] = None
+        self._clock = clock
+
+        self._queues: Dict[str, Deque[Tuple[asyncio.Future, float]]] = {cls: deque() for cls in self.weights}
+        self._credits: Dict[str, int] = dict(self.weights)
+        self.active = 0
+
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def limit(self) -> int:
+        """Concurrent executions allowed now"""
+        if not self.baseline_service_time or not self.service_time:
+            return self.max_concurrency
+        scaled = int(self.max_concurrency * self.baseline_service_time / self.service_time)
+        return max(self.min_concurrency, min(self.max_concurrency, scaled))
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def estimated_wait(self) -> float:
+        """Seconds a request arriving now would wait for a slot"""
+        if self.active < self.limit and not self.queued:
+            return 0.0
+        return (self.queued + 1) * self.service_time / self.limit
+
+    def check(self) -> None:
+        """Shed now if a new request would not be admitted within the SLO"""
+        if self.active < self.limit and not self.queued:
+            return
+        estimate = self.estimated_wait()
+        if self.queued >= self.max_queue_size or estimate > self.max_queue_wait:
+            self.rejected += 1
+            raise AdmissionRejectedError(
+                f"{self.name} is overloaded ({self.active} running, {self.queued} waiting)",
+                retry_after=estimate,
+            )
+
+    @asynccontextmanager
+    async def admit(self, priority: str = INTERACTIVE, shed: bool = True) -> AsyncIterator[None]:
+        """
+        Hold an execution slot for the enclosed block.
+        With `shed=False` the caller waits as long as it takes; streams that
+        are already open use this rather than failing half way through.
+        """
+        await self.acquire(priority, shed)
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self._observe(self._clock() - started)
+            self.release()
+
+    async def acquire(self, priority: str = INTERACTIVE, shed: bool = True) -> None:
+        if priority not in self._queues:
+            raise ValueError(f"Unknown priority class '{priority}'")
+        if self.active < self.limit and not self.queued:
+            self.active += 1
+            self.admitted += 1
+            return
+        if shed:
+            self.check()
+
+        enqueued_at = self._clock()
+        future = asyncio.get_running_loop().create_future()
+        entry = (future, enqueued_at)
+        self._queues[priority].append(entry)
+        try:
+            if shed:
+                # asyncio.wait leaves the future alone on timeout, so a slot handed over meanwhile is not lost
+                await asyncio.wait({future}, timeout=self.max_queue_wait)
+            else:
+                await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot arrived as the caller went away; pass it on
+                self.release()
+            else:
+                future.cancel()
+                self._queues[priority].remove(entry)
+            raise
+
+        if not future.done():
+            future.cancel()
+            self._queues[priority].remove(entry)
+            self.timed_out += 1
+            raise AdmissionRejectedError(
+                f"{self.name} queue wait exceeded {self.max_queue_wait:.0f}s",
+                retry_after=self.estimated_wait(),
+            )
+
+    def release(self) -> None:
+        """Free the slot and hand slots to waiters while the limit allows"""
+        self.active -= 1
+        while self.active < self.limit:
+            entry = self._next_waiter()
+            if entry is None:
+                return
+            future, enqueued_at = entry
+            wait = self._clock() - enqueued_at
+            self.active += 1
+            self.admitted += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            future.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "max_concurrency": self.max_concurrency,
+            "active": self.active,
+            "queued": {cls: len(queue) for cls, queue in self._queues.items()},
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_wait_ms": round(self.total_wait / self.admitted * 1000, 2) if self.admitted else 0,
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+            "service_time_ms": round(self.service_time * 1000, 2),
+            "estimated_wait_ms": round(self.estimated_wait() * 1000, 2),
+        }
+
+    def _next_waiter(self) -> Optional[Tuple[asyncio.Future, float]]:
+        for _ in range(2):
+            for cls, queue in self._queues.items():
+                if queue and self._credits[cls] > 0:
+                    self._credits[cls] -= 1
+                    return queue.popleft()
+            if not self.queued:
+                return None
+            # Every class with waiters has spent its credits; start the next round
+            self._credits = dict(self.weights)
+        return None
+
+    def _observe(self, seconds: float) -> None:
+        self.service_time = 0.8 * self.service_time + 0.2 * seconds
+        if self.baseline_service_time is None or self.service_time < self.baseline_service_time:
+            self.baseline_service_time = self.service_time
+        else:
+            self.baseline_service_time += 0.05 * (self.service_time - self.baseline_service_time)
+
+
+admission_controllers: Dict[str, AdmissionController] = {}
+
+
+def get_admission_controller(name: str) -> AdmissionController:
+    if name not in admission_controllers:
+        admission_controllers[name] = AdmissionController(
+            name,
+            max_concurrency=settings.ADMISSION_MAX_CONCURRENCY,
+            max_queue_wait=settings.ADMISSION_QUEUE_SLO_SECONDS,
+            max_queue_size=settings.ADMISSION_MAX_QUEUE,
+            min_concurrency=settings.ADMISSION_MIN_CONCURRENCY,
+            weights={INTERACTIVE: settings.ADMISSION_INTERACTIVE_WEIGHT, BATCH: settings.ADMISSION_BATCH_WEIGHT},
+        )
+    return admission_controllers[name]
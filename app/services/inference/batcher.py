@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.inference.executor import InferenceExecutor, InferenceQueueFullError, inference_executor
+from app.services.metrics import record_generation, record_stage
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationBatcher:
+    """
+    Dynamic micro-batching for seq2seq generation.
+    Concurrent `submit` calls are collected for up to `max_wait_ms`
+    (or until `max_batch_size` prompts are waiting), padded into a single
+    tensor batch and generated with one `model.generate` call on the
+    inference executor. Each caller gets its own decoded output back.
+    """
+
+    def __init__(
+        self,
+        model,
+        tokenizer,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10,
+        max_input_length: int = 1024,
+        max_queue_size: int = 256,
+        generation_kwargs: Optional[Dict[str, Any]] = None,
+        executor: Optional[InferenceExecutor] = None,
+        model_id: Optional[str] = None,
+    ):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.model_id = model_id or getattr(model, "name_or_path", type(model).__name__)
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.max_input_length = max_input_length
+        self.max_queue_size = max_queue_size
+        self.generation_kwargs = generation_kwargs or {}
+        self.executor = executor or inference_executor
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        self.batches_run = 0
+        self.requests_served = 0
+
+    async def submit(self, prompt: str) -> str:
+        """Queue a prompt and wait for its generated text"""
+        self._ensure_worker()
+        if self._queue.qsize() >= self.max_queue_size:
+            raise InferenceQueueFullError(
+                f"Summarization queue is full ({self._queue.qsize()} waiting)"
+            )
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((prompt, future))
+        return await future
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+            self._queue = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches_run": self.batches_run,
+            "requests_served": self.requests_served,
+            "avg_batch_size": round(self.requests_served / self.batches_run, 2) if self.batches_run else 0,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def _collect(self) -> List[Tuple[str, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return [(prompt, future) for prompt, future in batch if not future.done()]
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            if not batch:
+                continue
+
+            prompts = [prompt for prompt, _ in batch]
+            try:
+                outputs = await self.executor.run(self._generate, prompts)
+            except Exception as e:
+                logger.error(f"Batched generation failed for {len(prompts)} prompts: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches_run += 1
+            self.requests_served += len(batch)
+            for (_, future), output in zip(batch, outputs):
+                if not future.done():
+                    future.set_result(output)
+
+    def _generate(self, prompts: List[str]) -> List[str]:
+        import torch
+
+        inputs = self.tokenizer(
+            prompts,
+            return_tensors="pt",
+            max_length=self.max_input_length,
+            truncation=True,
+            padding=True,
+        ).to(self.model.device)
+
+        with torch.inference_mode():
+            started = time.perf_counter()
+            output_ids = self.model.generate(
+                input_ids=inputs["input_ids"],
+                attention_mask=inputs["attention_mask"],
+                **self.generation_kwargs,
+            )
+            elapsed = time.perf_counter() - started
+
+        record_stage("batch_generation", elapsed)
+        record_generation(self.model_id, self._count_tokens(output_ids), elapsed)
+
+        return self.tokenizer.batch_decode(output_ids, skip_special_tokens=True)
+
+    def _count_tokens(self, output_ids) -> int:
+        """Non-padding tokens across the batch"""
+        if not hasattr(output_ids, "numel"):
+            return 0
+        pad_token_id = getattr(self.tokenizer, "pad_token_id", None)
+        if pad_token_id is None:
+            return output_ids.numel()
+        return int((output_ids != pad_token_id).sum())
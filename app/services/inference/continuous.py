@@ -0,0 +1,383 @@
+import asyncio
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import torch
+
+logger = logging.getLogger(__name__)
+
+# Per decoder layer: self-attention key/value, then cross-attention key/value, batch first
+LayerCache = Tuple["torch.Tensor", "torch.Tensor", "torch.Tensor", "torch.Tensor"]
+
+
+def _kv_pairs(cache) -> List[Tuple["torch.Tensor", "torch.Tensor"]]:
+    if hasattr(cache, "layers"):
+        return [(layer.keys, layer.values) for layer in cache.layers]
+    return list(zip(cache.key_cache, cache.value_cache))
+
+
+def cache_layers(past) -> List[LayerCache]:
+    """Per-layer tensors of an encoder-decoder cache, in either the legacy tuple or the Cache-object form"""
+    if isinstance(past, (tuple, list)):
+        return [tuple(layer[:4]) for layer in past]
+    return [
+        self_kv + cross_kv
+        for self_kv, cross_kv in zip(_kv_pairs(past.self_attention_cache), _kv_pairs(past.cross_attention_cache))
+    ]
+
+
+def build_cache(layers: Sequence[LayerCache]):
+    try:
+        from transformers.cache_utils import DynamicCache, EncoderDecoderCache
+    except ImportError:
+        return tuple(layers)
+    return EncoderDecoderCache(
+        DynamicCache([layer[:2] for layer in layers]),
+        DynamicCache([layer[2:] for layer in layers]),
+    )
+
+
+def _pad(tensor: "torch.Tensor", length: int, dim: int, left: bool) -> "torch.Tensor":
+    import torch
+
+    missing = length - tensor.shape[dim]
+    if missing <= 0:
+        return tensor
+    shape = list(tensor.shape)
+    shape[dim] = missing
+    padding = tensor.new_zeros(shape)
+    return torch.cat([padding, tensor] if left else [tensor, padding], dim=dim)
+
+
+class _Sequence:
+    def __init__(self, prompt: str, streamer, future: Future):
+        self.prompt = prompt
+        self.streamer = streamer
+        self.future = future
+        self.tokens: List[int] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self.future.cancelled()
+
+    def emit(self, token: int) -> None:
+        import torch
+
+        self.tokens.append(token)
+        if self.streamer is not None:
+            self.streamer.put(torch.tensor([token]))
+
+
+class ContinuousBatchingEngine:
+    """
+    Iteration-level batching for streaming seq2seq generation.
+    One engine thread owns a running decode batch. Prompts submitted while it
+    runs are encoded and join the batch at the next token boundary, finished
+    sequences leave it straight away, and each decoded token goes to its own
+    sequence's streamer. Concurrent streams therefore share one decoder
+    forward per token instead of running one `generate` loop each.
+
+    Decoding is greedy with `min_length`/`max_length` counted the way
+    `generate` counts them, which is what the summary stream uses. Sequences
+    of different ages share the self-attention cache by left-padding it with
+    masked positions; encoder states of different lengths are right-padded.
+    Cancelling the future returned by `submit` drops the sequence at the next
+    token boundary, so an abandoned stream stops taking a batch slot.
+    """
+
+    def __init__(
+        self,
+        model,
+        tokenizer,
+        max_batch_size: int = 16,
+        max_input_length: int = 1024,
+        max_length: int = 500,
+        min_length: int = 0,
+        model_id: Optional[str] = None,
+    ):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.model_id = model_id or getattr(model, "name_or_path", type(model).__name__)
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_input_length = max_input_length
+        self.max_length = max_length
+        self.min_length = min_length
+        self.decoder_start_token_id = model.config.decoder_start_token_id
+        self.eos_token_id = model.config.eos_token_id
+
+        self._pending: "queue.Queue[Optional[_Sequence]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # Running batch, touched only by the engine thread
+        self._active: List[_Sequence] = []
+        self._cache = None
+        self._encoder_states: Optional["torch.Tensor"] = None
+        self._encoder_mask: Optional["torch.Tensor"] = None
+        self._decoder_mask: Optional["torch.Tensor"] = None
+
+        self.steps = 0
+        self.tokens_generated = 0
+        self.batched_rows = 0
+        self.admitted = 0
+        self.completed = 0
+        self.cancelled = 0
+
+    def submit(self, prompt: str, streamer=None) -> asyncio.Future:
+        """
+        Queue a prompt; the returned future resolves to its generated token ids.
+        `streamer` gets `put`/`end` calls from the engine thread, as from `generate`.
+        Cancel the future to stop generating for a caller that went away.
+        """
+        if self._closed:
+            raise RuntimeError("Generation engine is closed")
+        future: Future = Future()
+        self._pending.put(_Sequence(prompt, streamer, future))
+        self._ensure_thread()
+        return asyncio.wrap_future(future)
+
+    async def generate(self, prompt: str, streamer=None) -> str:
+        token_ids = await self.submit(prompt, streamer)
+        return self.tokenizer.decode(token_ids, skip_special_tokens=True)
+
+    def close(self) -> None:
+        self._closed = True
+        self._pending.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "active": len(self._active),
+            "pending": self._pending.qsize(),
+            "admitted": self.admitted,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "steps": self.steps,
+            "tokens_generated": self.tokens_generated,
+            "avg_batch_size": round(self.batched_rows / self.steps, 2) if self.steps else 0,
+        }
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="generation-engine", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        import torch
+
+        while True:
+            incoming: List[_Sequence] = []
+            if not self._active:
+                sequence = self._pending.get()
+                if sequence is None:
+                    return
+                if sequence.cancelled:
+                    self._drop(sequence)
+                    continue
+                incoming.append(sequence)
+            while len(self._active) + len(incoming) < self.max_batch_size:
+                try:
+                    sequence = self._pending.get_nowait()
+                except queue.Empty:
+                    break
+                if sequence is None:
+                    self._fail(self._active + incoming, RuntimeError("Generation engine is closed"))
+                    return
+                if sequence.cancelled:
+                    self._drop(sequence)
+                    continue
+                incoming.append(sequence)
+
+            try:
+                with torch.inference_mode():
+                    if incoming:
+                        self._admit(incoming)
+                    elif self._active:
+                        self._step()
+            except Exception as e:
+                logger.error(f"Generation step failed for {len(self._active) + len(incoming)} sequences: {str(e)}")
+                admitted = set(map(id, self._active))
+                self._fail(self._active + [s for s in incoming if id(s) not in admitted], e)
+                self._reset()
+
+    def _admit(self, incoming: List[_Sequence]) -> None:
+        """Encode new prompts and decode their first token; the running batch also takes its next step"""
+        import torch
+        from transformers.modeling_outputs import BaseModelOutput
+
+        device = self.model.device
+        encoded = self.tokenizer(
+            [sequence.prompt for sequence in incoming],
+            return_tensors="pt",
+            max_length=self.max_input_length,
+            truncation=True,
+            padding=True,
+        ).to(device)
+        encoder_states = self.model.get_encoder()(
+            input_ids=encoded["input_ids"], attention_mask=encoded["attention_mask"]
+        ).last_hidden_state
+
+        for sequence in incoming:
+            if sequence.streamer is not None:
+                sequence.streamer.put(torch.tensor([self.decoder_start_token_id]))
+
+        start = torch.full((len(incoming), 1), self.decoder_start_token_id, dtype=torch.long, device=device)
+        outputs = self.model(
+            encoder_outputs=BaseModelOutput(last_hidden_state=encoder_states),
+            attention_mask=encoded["attention_mask"],
+            decoder_input_ids=start,
+            use_cache=True,
+        )
+        new_layers = cache_layers(outputs.past_key_values)
+        new_decoder_mask = torch.ones((len(incoming), 1), dtype=torch.long, device=device)
+        new_encoder_mask = encoded["attention_mask"]
+
+        if self._active:
+            # Advance the running batch first so every row's cache ends on the same step
+            self._step(retire=False)
+            old_layers = cache_layers(self._cache)
+            self_length = max(self._decoder_mask.shape[1], 1)
+            cross_length = max(self._encoder_mask.shape[1], new_encoder_mask.shape[1])
+            layers = []
+            for old, new in zip(old_layers, new_layers):
+                layers.append((
+                    torch.cat([old[0], _pad(new[0], self_length, 2, left=True)]),
+                    torch.cat([old[1], _pad(new[1], self_length, 2, left=True)]),
+                    torch.cat([_pad(old[2], cross_length, 2, left=False), _pad(new[2], cross_length, 2, left=False)]),
+                    torch.cat([_pad(old[3], cross_length, 2, left=False), _pad(new[3], cross_length, 2, left=False)]),
+                ))
+            self._decoder_mask = torch.cat([self._decoder_mask, _pad(new_decoder_mask, self_length, 1, left=True)])
+            self._encoder_mask = torch.cat([
+                _pad(self._encoder_mask, cross_length, 1, left=False),
+                _pad(new_encoder_mask, cross_length, 1, left=False),
+            ])
+            self._encoder_states = torch.cat([
+                _pad(self._encoder_states, cross_length, 1, left=False),
+                _pad(encoder_states, cross_length, 1, left=False),
+            ])
+        else:
+            layers = new_layers
+            self._decoder_mask = new_decoder_mask
+            self._encoder_mask = new_encoder_mask
+            self._encoder_states = encoder_states
+
+        self._cache = build_cache(layers)
+        self._active.extend(incoming)
+        self.admitted += len(incoming)
+        for sequence, token in zip(incoming, self._choose(outputs.logits[:, -1, :], incoming)):
+            sequence.emit(token)
+        self.tokens_generated += len(incoming)
+        self._retire()
+
+    def _step(self, retire: bool = True) -> None:
+        import torch
+        from transformers.modeling_outputs import BaseModelOutput
+
+        device = self.model.device
+        last_tokens = torch.tensor([[sequence.tokens[-1]] for sequence in self._active], dtype=torch.long, device=device)
+        decoder_mask = torch.cat([self._decoder_mask, self._decoder_mask.new_ones((len(self._active), 1))], dim=1)
+        outputs = self.model(
+            encoder_outputs=BaseModelOutput(last_hidden_state=self._encoder_states),
+            attention_mask=self._encoder_mask,
+            decoder_input_ids=last_tokens,
+            decoder_attention_mask=decoder_mask,
+            past_key_values=self._cache,
+            use_cache=True,
+        )
+        self._cache = outputs.past_key_values
+        self._decoder_mask = decoder_mask
+
+        for sequence, token in zip(self._active, self._choose(outputs.logits[:, -1, :], self._active)):
+            sequence.emit(token)
+        self.steps += 1
+        self.batched_rows += len(self._active)
+        self.tokens_generated += len(self._active)
+        if retire:
+            self._retire()
+
+    def _choose(self, logits: "torch.Tensor", sequences: List[_Sequence]) -> List[int]:
+        logits = logits.float()
+        for row, sequence in enumerate(sequences):
+            # Decoder length counts the start token, as in generate's min_length
+            if len(sequence.tokens) + 1 < self.min_length and self.eos_token_id is not None:
+                logits[row, self.eos_token_id] = float("-inf")
+        return logits.argmax(dim=-1).tolist()
+
+    def _is_finished(self, sequence: _Sequence) -> bool:
+        return sequence.tokens[-1] == self.eos_token_id or len(sequence.tokens) + 1 >= self.max_length
+
+    def _retire(self) -> None:
+        import torch
+
+        keep = [
+            row for row, sequence in enumerate(self._active)
+            if not sequence.cancelled and not self._is_finished(sequence)
+        ]
+        for row, sequence in enumerate(self._active):
+            if row in keep:
+                continue
+            if sequence.cancelled:
+                self._drop(sequence)
+            else:
+                self._finish(sequence)
+        if not keep:
+            self._reset()
+            return
+        if len(keep) == len(self._active):
+            return
+
+        index = torch.tensor(keep, dtype=torch.long, device=self._decoder_mask.device)
+        self._active = [self._active[row] for row in keep]
+        decoder_mask = self._decoder_mask.index_select(0, index)
+        encoder_mask = self._encoder_mask.index_select(0, index)
+        # Drop padding columns no remaining row uses
+        self_start = int((decoder_mask.sum(dim=0) > 0).nonzero()[0])
+        cross_end = int((encoder_mask.sum(dim=0) > 0).nonzero()[-1]) + 1
+        layers = [
+            (
+                layer[0].index_select(0, index)[:, :, self_start:],
+                layer[1].index_select(0, index)[:, :, self_start:],
+                layer[2].index_select(0, index)[:, :, :cross_end],
+                layer[3].index_select(0, index)[:, :, :cross_end],
+            )
+            for layer in cache_layers(self._cache)
+        ]
+        self._cache = build_cache(layers)
+        self._decoder_mask = decoder_mask[:, self_start:]
+        self._encoder_mask = encoder_mask[:, :cross_end]
+        self._encoder_states = self._encoder_states.index_select(0, index)[:, :cross_end]
+
+    def _finish(self, sequence: _Sequence) -> None:
+        self.completed += 1
+        if sequence.streamer is not None:
+            sequence.streamer.end()
+        if not sequence.future.done():
+            sequence.future.set_result([self.decoder_start_token_id] + sequence.tokens)
+
+    def _drop(self, sequence: _Sequence) -> None:
+        self.cancelled += 1
+        if sequence.streamer is not None:
+            sequence.streamer.end()
+
+    def _fail(self, sequences: List[_Sequence], error: Exception) -> None:
+        for sequence in sequences:
+            if sequence.streamer is not None and hasattr(sequence.streamer, "fail"):
+                sequence.streamer.fail(error)
+            if not sequence.future.done():
+                sequence.future.set_exception(error)
+
+    def _reset(self) -> None:
+        self._active = []
+        self._cache = None
+        self._encoder_states = None
+        self._encoder_mask = None
+        self._decoder_mask = None
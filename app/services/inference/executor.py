@@ -0,0 +1,153 @@
+import asyncio
+import functools
+import logging
+import math
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceQueueFullError(RuntimeError):
+    """Raised when the inference queue is over its limit and new work is refused"""
+
+    def __init__(self, message: str = "", retry_after: float = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        """Whole seconds for a Retry-After header"""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+def is_out_of_memory(error: BaseException) -> bool:
+    """Whether `error` is a CUDA out-of-memory error, without importing torch for requests that never used it"""
+    torch = sys.modules.get("torch")
+    return torch is not None and isinstance(error, torch.cuda.OutOfMemoryError)
+
+
+class InferenceExecutor:
+    """
+    Bounded worker pool that every blocking model call goes through,
+    keeping inference off the asyncio event loop.
+    Work is rejected with `InferenceQueueFullError` once more than
+    `max_queue_size` calls are waiting for a free worker.
+
+    The one exception is the streaming `ContinuousBatchingEngine`, which
+    decodes on its own long-lived thread: a step serves every open stream,
+    so it cannot take one pool slot per call. Its load is bounded instead by
+    `STREAM_MAX_BATCH_SIZE` and by the summary admission controller, and it
+    is not counted in `running`/`queued` here.
+    """
+
+    def __init__(self, max_workers: int, max_queue_size: int):
+        self.max_workers = max(1, max_workers)
+        self.max_queue_size = max_queue_size
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        self.queued = 0
+        self.running = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run `fn` on a pool worker and await its result"""
+        return await self.submit(fn, *args, **kwargs)
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> asyncio.Future:
+        """Schedule `fn` on a pool worker and return an awaitable future"""
+        with self._lock:
+            if self.queued >= self.max_queue_size:
+                self.rejected += 1
+                raise InferenceQueueFullError(
+                    f"Inference queue is full ({self.queued} waiting)"
+                )
+            self.queued += 1
+            self.submitted += 1
+
+        call = functools.partial(self._call, time.perf_counter(), fn, args, kwargs)
+        future = self._get_pool().submit(call)
+        future.add_done_callback(self._on_done)
+        return asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            started = self.completed + self.failed + self.running
+            finished = self.completed + self.failed
+            return {
+                "workers": self.max_workers,
+                "max_queue_size": self.max_queue_size,
+                "queue_depth": self.queued,
+                "running": self.running,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "avg_wait_ms": round(self.total_wait / started * 1000, 2) if started else 0,
+                "max_wait_ms": round(self.max_wait * 1000, 2),
+                "avg_run_ms": round(self.total_run / finished * 1000, 2) if finished else 0,
+            }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        # Created on first use so forked worker processes get their own threads
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="inference",
+                    )
+        return self._pool
+
+    def _on_done(self, future) -> None:
+        # Calls cancelled before a worker picked them up never reach `_call`
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    def _call(self, enqueued_at: float, fn: Callable[..., Any], args, kwargs) -> Any:
+        started_at = time.perf_counter()
+        wait = started_at - enqueued_at
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        else:
+            with self._lock:
+                self.completed += 1
+            return result
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.total_run += time.perf_counter() - started_at
+
+
+inference_executor = InferenceExecutor(
+    max_workers=settings.INFERENCE_WORKERS,
+    max_queue_size=settings.INFERENCE_MAX_QUEUE,
+)
@@ -0,0 +1,94 @@
+import asyncio
+from typing import AsyncIterator, List, Optional
+
+_END = object()
+
+
+class AsyncTextStreamer:
+    """
+    Streamer for `model.generate` that hands decoded text to the event loop.
+    Generation runs on an inference worker thread and calls `put`/`end`;
+    decoding into printable words is delegated to transformers'
+    `TextStreamer`, and each finished piece is pushed onto an asyncio queue
+    with `call_soon_threadsafe`. Consumers `async for` over the text, or over
+    `batches()` to send several pieces per event, without ever blocking the loop.
+    """
+
+    def __init__(
+        self,
+        tokenizer=None,
+        skip_prompt: bool = True,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        **decode_kwargs,
+    ):
+        self.loop = loop or asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._decoder = None
+        if tokenizer is not None:
+            from transformers import TextStreamer
+
+            self._decoder = TextStreamer(tokenizer, skip_prompt=skip_prompt, **decode_kwargs)
+            self._decoder.on_finalized_text = self.push_text
+
+    def put(self, value) -> None:
+        """Called by `generate` with each new batch of token ids"""
+        self._decoder.put(value)
+
+    def end(self) -> None:
+        """Called by `generate` once it is done; flushes whatever text is left"""
+        if self._decoder is not None:
+            self._decoder.end()
+        else:
+            self.push_text("", stream_end=True)
+
+    def push_text(self, text: str, stream_end: bool = False) -> None:
+        """Thread-safe: queue a decoded piece, and the end marker after the last one"""
+        if text:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, text)
+        if stream_end:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, _END)
+
+    def fail(self, error: BaseException) -> None:
+        """Thread-safe: end the stream with `error`, raised to the consumer"""
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, error)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> str:
+        item = await self.queue.get()
+        return self._unwrap(item)
+
+    async def batches(self, max_items: int = 8, pacing: float = 0) -> AsyncIterator[List[str]]:
+        """
+        Lists of pieces: waits for the first, then takes whatever else has
+        already arrived, up to `max_items`. `pacing` spaces batches out for
+        clients that want a steady rate; 0 sends as fast as the model goes.
+        """
+        while True:
+            try:
+                batch = [self._unwrap(await self.queue.get())]
+            except StopAsyncIteration:
+                return
+
+            ended = False
+            while len(batch) < max_items and not self.queue.empty():
+                try:
+                    batch.append(self._unwrap(self.queue.get_nowait()))
+                except StopAsyncIteration:
+                    ended = True
+                    break
+
+            yield batch
+            if ended:
+                return
+            if pacing > 0:
+                await asyncio.sleep(pacing)
+
+    @staticmethod
+    def _unwrap(item) -> str:
+        if item is _END:
+            raise StopAsyncIteration
+        if isinstance(item, BaseException):
+            raise item
+        return item
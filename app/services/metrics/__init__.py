@@ -0,0 +1,2 @@
+from .middleware import MetricsMiddleware
+from .prometheus import observe_stage, record_generation, record_live_lag, record_stage, render_metrics, timed_firestore
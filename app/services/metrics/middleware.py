@@ -0,0 +1,51 @@
+import time
+
+from app.services.metrics.prometheus import HTTP_REQUEST_SECONDS, HTTP_RESPONSE_START_SECONDS, SSE_STREAMS_IN_FLIGHT
+
+
+def _route_label(scope) -> str:
+    # The matched route template keeps label cardinality bounded; raw paths carry ids
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route latency and open SSE streams.
+    It wraps `send` instead of subclassing BaseHTTPMiddleware, so streamed
+    responses pass through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        start = time.perf_counter()
+        status_code = 500
+        stream_route = None
+
+        async def send_with_metrics(message):
+            nonlocal status_code, stream_route
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                route = _route_label(scope)
+                HTTP_RESPONSE_START_SECONDS.labels(method, route).observe(time.perf_counter() - start)
+                content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+                if content_type.startswith(b"text/event-stream"):
+                    stream_route = route
+                    SSE_STREAMS_IN_FLIGHT.labels(route).inc()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            if stream_route is not None:
+                SSE_STREAMS_IN_FLIGHT.labels(stream_route).dec()
+            HTTP_REQUEST_SECONDS.labels(method, _route_label(scope), str(status_code)).observe(
+                time.perf_counter() - start
+            )
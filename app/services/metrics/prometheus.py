@@ -0,0 +1,189 @@
+import functools
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterator, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+TOKEN_RATE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "sumsup_http_request_duration_seconds",
+    "Time from request to the end of the response body, by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_RESPONSE_START_SECONDS = Histogram(
+    "sumsup_http_response_start_seconds",
+    "Time from request to the response headers; for SSE routes, time until the stream opens",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+SSE_STREAMS_IN_FLIGHT = Gauge(
+    "sumsup_sse_streams_in_flight",
+    "Open server-sent event streams",
+    ["route"],
+    multiprocess_mode="livesum",
+)
+STAGE_SECONDS = Histogram(
+    "sumsup_stage_duration_seconds",
+    "Time spent in each stage of the summary hot path",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+FIRESTORE_SECONDS = Histogram(
+    "sumsup_firestore_operation_seconds",
+    "Firestore round trips made through the collection wrapper",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+GENERATED_TOKENS = Counter(
+    "sumsup_generated_tokens_total",
+    "Tokens produced by generation",
+    ["model"],
+)
+LIVE_LAG_SECONDS = Histogram(
+    "sumsup_live_lag_seconds",
+    "How far behind the live edge each live audio chunk was emitted",
+    buckets=(1, 2, 5, 10, 20, 30, 45, 60, 90, 120, 180, 300),
+)
+GENERATION_TOKENS_PER_SECOND = Histogram(
+    "sumsup_generation_tokens_per_second",
+    "Decode throughput of each generate call",
+    ["model"],
+    buckets=TOKEN_RATE_BUCKETS,
+)
+
+
+@contextmanager
+def observe_stage(stage: str) -> Iterator[None]:
+    """Record the wall time of the enclosed block under `stage`"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(stage).observe(time.perf_counter() - start)
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    STAGE_SECONDS.labels(stage).observe(seconds)
+
+
+def record_live_lag(seconds: float) -> None:
+    LIVE_LAG_SECONDS.observe(max(0.0, seconds))
+
+
+def record_generation(model: str, tokens: int, seconds: float) -> None:
+    GENERATED_TOKENS.labels(model).inc(tokens)
+    if seconds > 0 and tokens:
+        GENERATION_TOKENS_PER_SECOND.labels(model).observe(tokens / seconds)
+
+
+def timed_firestore(operation: str):
+    """Decorate an async Firestore call to record its latency under `operation`"""
+    def decorator(fn: Callable[..., Awaitable[Any]]):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                FIRESTORE_SECONDS.labels(operation).observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+class AppStatsCollector:
+    """
+    Exposes the counters the services already keep (queues, caches, models)
+    at scrape time, rather than duplicating them as live metrics.
+    """
+
+    def describe(self):
+        # Without this, registering would call `collect` at import time
+        return []
+
+    def collect(self):
+        from app.core.readiness import readiness
+        from app.services.cache import api_key_index, session_store, summary_cache, token_cache
+        from app.services.inference.admission import admission_controllers
+        from app.services.inference.executor import inference_executor
+        from app.services.model_dependencies import model_registry
+        from app.services.model_dependencies.mt5 import summary_batchers
+
+        executor = inference_executor.stats()
+        queue = GaugeMetricFamily("sumsup_inference_queue_depth", "Calls waiting for an inference worker")
+        queue.add_metric([], executor["queue_depth"])
+        yield queue
+        running = GaugeMetricFamily("sumsup_inference_running", "Calls running on inference workers")
+        running.add_metric([], executor["running"])
+        yield running
+        rejected = CounterMetricFamily("sumsup_inference_rejected", "Calls refused because the inference queue was full")
+        rejected.add_metric([], executor["rejected"])
+        yield rejected
+
+        batcher_queue = GaugeMetricFamily("sumsup_batcher_queue_depth", "Prompts waiting in a generation batcher", labels=["batcher"])
+        for name, batcher in summary_batchers.items():
+            batcher_queue.add_metric([name], batcher.stats()["queued"])
+        yield batcher_queue
+
+        active = GaugeMetricFamily("sumsup_admission_active", "Requests holding an execution slot", labels=["model"])
+        waiting = GaugeMetricFamily("sumsup_admission_queued", "Requests waiting for a slot", labels=["model", "priority"])
+        shed = CounterMetricFamily("sumsup_admission_shed", "Requests refused by admission control", labels=["model", "reason"])
+        for name, controller in admission_controllers.items():
+            stats = controller.stats()
+            active.add_metric([name], stats["active"])
+            for priority, count in stats["queued"].items():
+                waiting.add_metric([name, priority], count)
+            shed.add_metric([name, "estimate"], stats["rejected"])
+            shed.add_metric([name, "deadline"], stats["timed_out"])
+        yield active
+        yield waiting
+        yield shed
+
+        hit_ratio = GaugeMetricFamily("sumsup_cache_hit_ratio", "Hits over lookups since start", labels=["cache"])
+        lookups = CounterMetricFamily("sumsup_cache_lookups", "Cache lookups by outcome", labels=["cache", "outcome"])
+        for name, cache in (("summary", summary_cache), ("api_keys", api_key_index), ("id_tokens", token_cache)):
+            stats = cache.stats()
+            hit_ratio.add_metric([name], stats.get("hit_ratio", 0))
+            lookups.add_metric([name, "hit"], stats.get("hits", 0) + stats.get("negative_hits", 0))
+            lookups.add_metric([name, "miss"], stats.get("misses", 0))
+        yield hit_ratio
+        yield lookups
+
+        sessions = GaugeMetricFamily("sumsup_session_store_entries", "Sessions held by this process's session store")
+        sessions.add_metric([], session_store.stats().get("entries", 0))
+        yield sessions
+
+        loaded = GaugeMetricFamily("sumsup_model_loaded", "1 when the model is resident", labels=["model"])
+        memory = GaugeMetricFamily("sumsup_model_memory_bytes", "Parameter and buffer bytes of a resident model", labels=["model"])
+        for entry in model_registry.stats():
+            loaded.add_metric([entry["name"]], 1 if entry["loaded"] else 0)
+            memory.add_metric([entry["name"]], entry["memory_bytes"])
+        yield loaded
+        yield memory
+
+        ready = GaugeMetricFamily("sumsup_ready", "1 once warm-up has finished")
+        ready.add_metric([], 1 if readiness.is_ready else 0)
+        yield ready
+
+
+app_stats_collector = AppStatsCollector()
+REGISTRY.register(app_stats_collector)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Exposition payload and its content type"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        # Under gunicorn the live metrics are aggregated across workers from the shared directory;
+        # the collector's figures still describe only the worker serving the scrape
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(app_stats_collector)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -1 +1,5 @@
-from .mt5 import get_model_and_tokenizer, get_request_semaphore
\ No newline at end of file
+from .mt5 import get_model_and_tokenizer, get_summary_admission, get_summary_batcher, get_with_category_admission, get_with_category_summary_batcher, get_streaming_engine, close_streaming_engines, close_summary_batchers
+# Importing each model module registers its models; gunicorn's on_starting imports only this package before load_all
+from .bert import SIN_BERT_MODEL, get_bert_admission, get_sin_bert_model_and_tokenizer
+from .registry import model_registry
+from .whisper import get_whisper_model_and_processor
@@ -1,17 +1,34 @@
-import asyncio
 from app.core.config import settings
-from transformers import AutoTokenizer, AutoModelForSequenceClassification, AutoConfig
+from app.services.inference.admission import AdmissionController, get_admission_controller
+from app.services.model_dependencies.onnx_backend import _load_sin_bert_onnx, onnx_enabled, onnx_model_dir, serving_model_name
+from app.services.model_dependencies.registry import model_registry
 
+SIN_BERT_MODEL = "sin_bert"
 
-request_semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_REQUESTS)
+def _load_sin_bert(model_path: str):
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification, AutoConfig
 
-def get_bert_request_semaphore() -> asyncio.Semaphore:
-    return request_semaphore
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    config = AutoConfig.from_pretrained(model_path)
+    model = AutoModelForSequenceClassification.from_pretrained(model_path)
+    return model, tokenizer, config
 
+model_registry.register(
+    SIN_BERT_MODEL,
+    lambda: _load_sin_bert(settings.MODEL_PATH_SIN_BERT),
+    preload=not onnx_enabled(),
+    precision=settings.SIN_BERT_PRECISION,
+)
+model_registry.register(
+    f"{SIN_BERT_MODEL}_onnx",
+    lambda: _load_sin_bert_onnx(onnx_model_dir(SIN_BERT_MODEL)),
+    preload=onnx_enabled(),
+    fork_safe=False,
+)
 
-def get_sin_bert_model_and_tokenizer():    
-    tokenizer = AutoTokenizer.from_pretrained(settings.MODEL_PATH_SIN_BERT)
-    config = AutoConfig.from_pretrained(settings.MODEL_PATH_SIN_BERT)
-    model = AutoModelForSequenceClassification.from_pretrained(settings.MODEL_PATH_SIN_BERT)
+def get_bert_admission() -> AdmissionController:
+    return get_admission_controller(SIN_BERT_MODEL)
 
-    return model, tokenizer, config
\ No newline at end of file
+
+def get_sin_bert_model_and_tokenizer():
+    return model_registry.get(serving_model_name(SIN_BERT_MODEL))
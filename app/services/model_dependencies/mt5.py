@@ -1,19 +1,116 @@
-import asyncio
+from typing import Dict
 from app.core.config import settings
-from transformers import MT5ForConditionalGeneration, MT5Tokenizer
+from app.services.inference.admission import AdmissionController, get_admission_controller
+from app.services.inference.batcher import GenerationBatcher
+from app.services.inference.continuous import ContinuousBatchingEngine
+from app.services.model_dependencies.onnx_backend import _load_mt5_onnx, onnx_enabled, onnx_model_dir, onnx_model_id, serving_model_name
+from app.services.model_dependencies.registry import model_registry
 
+MT5_MODEL = "mt5"
+MT5_WITH_CATEGORY_MODEL = "mt5_with_category"
 
-request_semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_REQUESTS)
+SUMMARY_GENERATION_KWARGS = {
+    "max_length": 256,
+    "min_length": 30,
+    "length_penalty": 2.0,
+    "num_beams": 4,
+}
 
-def get_request_semaphore() -> asyncio.Semaphore:
-    return request_semaphore
+# Greedy settings of the streamed video summary
+STREAM_GENERATION_KWARGS = {
+    "max_length": 500,
+    "min_length": 50,
+}
 
-def get_model_and_tokenizer():
-    tokenizer = MT5Tokenizer.from_pretrained(settings.MODEL_PATH) # type: ignore
-    model = MT5ForConditionalGeneration.from_pretrained(settings.MODEL_PATH) # type: ignore
+summary_batchers: Dict[str, GenerationBatcher] = {}
+streaming_engines: Dict[str, ContinuousBatchingEngine] = {}
+
+def _load_mt5(model_path: str):
+    from transformers import MT5ForConditionalGeneration, MT5Tokenizer
+
+    tokenizer = MT5Tokenizer.from_pretrained(model_path) # type: ignore
+    model = MT5ForConditionalGeneration.from_pretrained(model_path) # type: ignore
     return model, tokenizer
 
+def get_model_path(name: str) -> str:
+    if name == MT5_WITH_CATEGORY_MODEL:
+        return settings.MODEL_PATH_WITH_CATEGORY
+    return settings.MODEL_PATH
+
+def get_serving_model_id(name: str) -> str:
+    """Model path plus the precision it runs at; int8 and bf16 outputs differ from fp32, so they are never cached together"""
+    return f"{get_model_path(name)}@{model_registry.precision(name)}"
+
+# The PyTorch MT5 always serves the SSE stream; the text endpoints use the ONNX graphs when that backend is on
+model_registry.register(MT5_MODEL, lambda: _load_mt5(get_model_path(MT5_MODEL)), precision=settings.MODEL_PRECISION)
+model_registry.register(
+    MT5_WITH_CATEGORY_MODEL,
+    lambda: _load_mt5(get_model_path(MT5_WITH_CATEGORY_MODEL)),
+    preload=not onnx_enabled(),
+    precision=settings.MODEL_PRECISION,
+)
+for _name in (MT5_MODEL, MT5_WITH_CATEGORY_MODEL):
+    model_registry.register(
+        f"{_name}_onnx",
+        lambda name=_name: _load_mt5_onnx(onnx_model_dir(name)),
+        preload=onnx_enabled(),
+        fork_safe=False,
+    )
+
+def _get_summary_batcher(name: str) -> GenerationBatcher:
+    if name not in summary_batchers:
+        model, tokenizer = model_registry.get(serving_model_name(name))
+        summary_batchers[name] = GenerationBatcher(
+            model,
+            tokenizer,
+            # Keeps cached summaries of the two backends apart
+            model_id=onnx_model_id(name) if onnx_enabled() else get_serving_model_id(name),
+            max_batch_size=settings.BATCH_MAX_SIZE,
+            max_wait_ms=settings.BATCH_MAX_WAIT_MS,
+            max_queue_size=settings.INFERENCE_MAX_QUEUE,
+            generation_kwargs=SUMMARY_GENERATION_KWARGS,
+        )
+    return summary_batchers[name]
+
+async def close_summary_batchers():
+    for batcher in summary_batchers.values():
+        await batcher.close()
+    summary_batchers.clear()
+
+def _get_streaming_engine(name: str) -> ContinuousBatchingEngine:
+    if name not in streaming_engines:
+        model, tokenizer = model_registry.get(name)
+        streaming_engines[name] = ContinuousBatchingEngine(
+            model,
+            tokenizer,
+            model_id=get_serving_model_id(name),
+            max_batch_size=settings.STREAM_MAX_BATCH_SIZE,
+            **STREAM_GENERATION_KWARGS,
+        )
+    return streaming_engines[name]
+
+def close_streaming_engines():
+    for engine in streaming_engines.values():
+        engine.close()
+    streaming_engines.clear()
+
+def get_streaming_engine() -> ContinuousBatchingEngine:
+    return _get_streaming_engine(MT5_MODEL)
+
+def get_summary_admission() -> AdmissionController:
+    return get_admission_controller(MT5_MODEL)
+
+def get_with_category_admission() -> AdmissionController:
+    return get_admission_controller(MT5_WITH_CATEGORY_MODEL)
+
+def get_model_and_tokenizer():
+    return model_registry.get(MT5_MODEL)
+
 def get_with_category_model_and_tokenizer():
-    tokenizer = MT5Tokenizer.from_pretrained(settings.MODEL_PATH_WITH_CATEGORY) # type: ignore
-    model = MT5ForConditionalGeneration.from_pretrained(settings.MODEL_PATH_WITH_CATEGORY) # type: ignore
-    return model, tokenizer
\ No newline at end of file
+    return model_registry.get(MT5_WITH_CATEGORY_MODEL)
+
+def get_summary_batcher() -> GenerationBatcher:
+    return _get_summary_batcher(MT5_MODEL)
+
+def get_with_category_summary_batcher() -> GenerationBatcher:
+    return _get_summary_batcher(MT5_WITH_CATEGORY_MODEL)
@@ -0,0 +1,158 @@
+"""
+ONNX Runtime backend for the summarizers and the category classifier.
+
+Export the models once:
+
+    python -m app.services.model_dependencies.onnx_backend --output exports/onnx [--quantize]
+
+then serve them with INFERENCE_BACKEND=onnx and ONNX_MODEL_DIR=exports/onnx.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+from typing import List
+
+from app.core.config import settings
+from app.services.model_dependencies.precision import FP32, INT8_DYNAMIC
+
+logger = logging.getLogger(__name__)
+
+PYTORCH = "pytorch"
+ONNX = "onnx"
+
+SEQ2SEQ_TASK = "text2text-generation-with-past"
+CLASSIFICATION_TASK = "text-classification"
+
+# Written next to the graphs by `export_model`
+EXPORT_INFO_FILE = "export_info.json"
+
+
+def onnx_enabled() -> bool:
+    return settings.INFERENCE_BACKEND.lower() == ONNX
+
+
+def serving_model_name(name: str) -> str:
+    """Registry entry that serves `name` on the configured backend"""
+    return f"{name}_onnx" if onnx_enabled() else name
+
+
+def onnx_model_dir(name: str) -> str:
+    return os.path.join(settings.ONNX_MODEL_DIR, name)
+
+
+def onnx_model_id(name: str) -> str:
+    """
+    Export directory plus how its graphs were quantized, so fp32 and int8
+    exports written to the same place never share cached summaries.
+    Exports without an info file are told apart by a hash of their graphs.
+    """
+    model_dir = onnx_model_dir(name)
+    info_path = os.path.join(model_dir, EXPORT_INFO_FILE)
+    if os.path.exists(info_path):
+        with open(info_path) as file:
+            return f"{model_dir}@{json.load(file)['precision']}"
+
+    digest = hashlib.sha256()
+    for graph in sorted(file for file in os.listdir(model_dir) if file.endswith(".onnx")):
+        with open(os.path.join(model_dir, graph), "rb") as file:
+            for block in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(block)
+    return f"{model_dir}@{digest.hexdigest()[:16]}"
+
+
+def session_options():
+    import onnxruntime
+
+    options = onnxruntime.SessionOptions()
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    # Parallelism comes from the intra-op pool; one graph runs at a time per session call
+    options.inter_op_num_threads = 1
+    if settings.ONNX_INTRA_OP_THREADS > 0:
+        options.intra_op_num_threads = settings.ONNX_INTRA_OP_THREADS
+    return options
+
+
+def load_seq2seq(model_dir: str):
+    """Encoder/decoder sessions with past key values, behind the `generate` API of the PyTorch model"""
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+    return ORTModelForSeq2SeqLM.from_pretrained(
+        model_dir,
+        use_cache=True,
+        provider="CPUExecutionProvider",
+        session_options=session_options(),
+    )
+
+
+def load_classifier(model_dir: str):
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+
+    return ORTModelForSequenceClassification.from_pretrained(
+        model_dir,
+        provider="CPUExecutionProvider",
+        session_options=session_options(),
+    )
+
+
+def _load_mt5_onnx(model_dir: str):
+    from transformers import MT5Tokenizer
+
+    return load_seq2seq(model_dir), MT5Tokenizer.from_pretrained(model_dir)
+
+
+def _load_sin_bert_onnx(model_dir: str):
+    from transformers import AutoConfig, AutoTokenizer
+
+    return load_classifier(model_dir), AutoTokenizer.from_pretrained(model_dir), AutoConfig.from_pretrained(model_dir)
+
+
+def export_model(model_path: str, output_dir: str, task: str, quantize: bool = False) -> List[str]:
+    """
+    Export a Hugging Face checkpoint to ONNX, tokenizer and config included.
+    With `quantize`, each graph is replaced by its dynamically int8-quantized
+    version, the ONNX counterpart of MODEL_PRECISION=int8-dynamic.
+    """
+    from optimum.exporters.onnx import main_export
+
+    main_export(model_path, output=output_dir, task=task, device="cpu")
+    graphs = sorted(file for file in os.listdir(output_dir) if file.endswith(".onnx"))
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        for graph in graphs:
+            path = os.path.join(output_dir, graph)
+            quantized = path + ".int8"
+            quantize_dynamic(path, quantized, weight_type=QuantType.QInt8)
+            os.replace(quantized, path)
+
+    with open(os.path.join(output_dir, EXPORT_INFO_FILE), "w") as file:
+        json.dump({"source": model_path, "task": task, "precision": INT8_DYNAMIC if quantize else FP32}, file)
+    return graphs
+
+
+def main(args) -> None:
+    from app.services.model_dependencies.bert import SIN_BERT_MODEL
+    from app.services.model_dependencies.mt5 import MT5_MODEL, MT5_WITH_CATEGORY_MODEL, get_model_path
+
+    sources = {
+        MT5_MODEL: (get_model_path(MT5_MODEL), SEQ2SEQ_TASK),
+        MT5_WITH_CATEGORY_MODEL: (get_model_path(MT5_WITH_CATEGORY_MODEL), SEQ2SEQ_TASK),
+        SIN_BERT_MODEL: (settings.MODEL_PATH_SIN_BERT, CLASSIFICATION_TASK),
+    }
+    for name in args.models:
+        model_path, task = sources[name]
+        output_dir = os.path.join(args.output, name)
+        graphs = export_model(model_path, output_dir, task, quantize=args.quantize)
+        logger.info(f"Exported '{name}' from {model_path} to {output_dir}: {', '.join(graphs)}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Export the serving models to ONNX")
+    parser.add_argument("--output", default=settings.ONNX_MODEL_DIR)
+    parser.add_argument("--models", nargs="+", default=["mt5", "mt5_with_category", "sin_bert"])
+    parser.add_argument("--quantize", action="store_true", help="Dynamically quantize the graphs to int8")
+    main(parser.parse_args())
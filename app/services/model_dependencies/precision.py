@@ -0,0 +1,46 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+FP32 = "fp32"
+INT8_DYNAMIC = "int8-dynamic"
+BF16 = "bf16"
+
+PRECISIONS = (FP32, INT8_DYNAMIC, BF16)
+
+
+def resolve_precision(precision: str, device: str) -> str:
+    """The precision a model actually runs at on `device`, falling back to fp32 where the mode is unsupported"""
+    precision = (precision or FP32).lower()
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown model precision '{precision}', expected one of {', '.join(PRECISIONS)}")
+
+    import torch
+
+    if precision == INT8_DYNAMIC and device != "cpu":
+        # Dynamic quantization only has CPU kernels
+        logger.warning(f"{INT8_DYNAMIC} runs on CPU only; using {FP32} on {device}")
+        return FP32
+    if precision == BF16 and device.startswith("cuda") and not torch.cuda.is_bf16_supported():
+        logger.warning(f"This GPU has no bf16 support; using {FP32}")
+        return FP32
+    return precision
+
+
+def apply_precision(model, precision: str):
+    """
+    Convert a loaded, eval-mode model in place of its fp32 weights.
+    `int8-dynamic` swaps every `nn.Linear` for a dynamically quantized one:
+    int8 weights, activations quantized per batch, no calibration needed.
+    `bf16` casts all weights; it is fast on CPUs with AMX/AVX512-BF16 and on
+    recent GPUs, and keeps fp32's range, which MT5 needs.
+    """
+    import torch
+
+    if precision == INT8_DYNAMIC:
+        from torch.ao.quantization import quantize_dynamic
+
+        return quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    if precision == BF16:
+        return model.to(torch.bfloat16)
+    return model
@@ -0,0 +1,169 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.model_dependencies.precision import FP32, apply_precision, resolve_precision
+
+logger = logging.getLogger(__name__)
+
+
+def model_memory_bytes(model) -> int:
+    """Bytes held by a model's parameters and buffers, including dynamically quantized weights; 0 for ONNX sessions"""
+    if not hasattr(model, "parameters"):
+        return 0
+    total = 0
+    for tensor in list(model.parameters()) + list(model.buffers()):
+        total += tensor.numel() * tensor.element_size()
+    for module in model.modules():
+        # Quantized linear layers keep packed weights outside parameters(); they expose them as methods
+        if hasattr(module, "_packed_params") and callable(getattr(module, "weight", None)):
+            for tensor in (module.weight(), module.bias()):
+                if tensor is not None:
+                    total += tensor.numel() * tensor.element_size()
+    return total
+
+
+class ModelEntry:
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[], Tuple[Any, ...]],
+        preload: bool = True,
+        precision: str = FP32,
+        fork_safe: bool = True,
+    ):
+        self.name = name
+        self.loader = loader
+        self.preload = preload
+        self.fork_safe = fork_safe
+        self.precision = precision
+        self.resources: Optional[Tuple[Any, ...]] = None
+        self.load_seconds: Optional[float] = None
+        self.loaded_at: Optional[str] = None
+        self.memory_bytes: int = 0
+        self.lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.resources is not None
+
+    def describe(self) -> Dict[str, Any]:
+        model = self.resources[0] if self.resources else None
+        return {
+            "name": self.name,
+            "loaded": self.is_loaded,
+            "device": str(model.device) if model is not None and hasattr(model, "device") else None,
+            "precision": self.precision,
+            "memory_bytes": self.memory_bytes,
+            "memory_mb": round(self.memory_bytes / (1024 * 1024), 2),
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            "loaded_at": self.loaded_at,
+        }
+
+
+class ModelRegistry:
+    """
+    Process-wide store of inference models.
+    Each model is loaded once, moved to `settings.DEVICE`, put in eval mode,
+    converted to its configured precision and handed out as a shared
+    reference to every request.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, ModelEntry] = {}
+
+    def register(
+        self,
+        name: str,
+        loader: Callable[[], Tuple[Any, ...]],
+        preload: bool = True,
+        precision: str = FP32,
+        fork_safe: bool = True,
+    ) -> None:
+        """
+        Register a loader returning a tuple whose first item is the model.
+        Models with `preload=False` are skipped by `load_all` and load on first use.
+        `precision` is one of `fp32`, `int8-dynamic` or `bf16`; unsupported modes fall back to fp32.
+        Models with `fork_safe=False` hold native thread pools that a forked
+        child cannot use, so a pre-fork `load_all` leaves them to each worker.
+        """
+        if name not in self._entries:
+            self._entries[name] = ModelEntry(name, loader, preload, precision, fork_safe)
+
+    def names(self) -> List[str]:
+        return list(self._entries.keys())
+
+    def is_loaded(self, name: str) -> bool:
+        return self._entry(name).is_loaded
+
+    def load(self, name: str) -> Tuple[Any, ...]:
+        """Load a registered model if it is not resident yet"""
+        entry = self._entry(name)
+        if entry.resources is not None:
+            return entry.resources
+
+        with entry.lock:
+            if entry.resources is not None:
+                return entry.resources
+
+            logger.info(f"Loading model '{name}' on {settings.DEVICE}")
+            start = time.perf_counter()
+            resources = entry.loader()
+            model = resources[0]
+            # ONNX Runtime models pick their device and precision at export and session creation
+            if hasattr(model, "eval"):
+                model.to(settings.DEVICE)
+                model.eval()
+                entry.precision = resolve_precision(entry.precision, settings.DEVICE)
+                if entry.precision != FP32:
+                    model = apply_precision(model, entry.precision)
+                    resources = (model,) + tuple(resources[1:])
+
+            entry.load_seconds = time.perf_counter() - start
+            entry.loaded_at = datetime.utcnow().isoformat()
+            entry.memory_bytes = model_memory_bytes(model)
+            entry.resources = resources
+            logger.info(
+                f"Model '{name}' loaded in {entry.load_seconds:.2f}s "
+                f"({entry.memory_bytes / (1024 * 1024):.1f} MB, {entry.precision})"
+            )
+            return resources
+
+    def load_all(self, before_fork: bool = False) -> None:
+        for name, entry in self._entries.items():
+            if entry.preload and (entry.fork_safe or not before_fork):
+                self.load(name)
+
+    def pending_preloads(self) -> List[str]:
+        """Preloadable models that are not resident yet"""
+        return [name for name, entry in self._entries.items() if entry.preload and not entry.is_loaded]
+
+    def get(self, name: str) -> Tuple[Any, ...]:
+        return self.load(name)
+
+    def precision(self, name: str) -> str:
+        """Precision the model runs at on this device, resolved without loading it"""
+        entry = self._entry(name)
+        with entry.lock:
+            entry.precision = resolve_precision(entry.precision, settings.DEVICE)
+            return entry.precision
+
+    def unload_all(self) -> None:
+        for entry in self._entries.values():
+            with entry.lock:
+                entry.resources = None
+                entry.memory_bytes = 0
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [entry.describe() for entry in self._entries.values()]
+
+    def _entry(self, name: str) -> ModelEntry:
+        if name not in self._entries:
+            raise KeyError(f"Model '{name}' is not registered")
+        return self._entries[name]
+
+
+model_registry = ModelRegistry()
@@ -0,0 +1,21 @@
+from app.core.config import settings
+from app.services.model_dependencies.registry import model_registry
+
+
+WHISPER_MODEL = "whisper"
+
+def _load_whisper(model_name: str):
+    from transformers import WhisperProcessor, WhisperForConditionalGeneration
+
+    processor = WhisperProcessor.from_pretrained(model_name)
+    model = WhisperForConditionalGeneration.from_pretrained(model_name)
+    return model, processor
+
+model_registry.register(
+    WHISPER_MODEL,
+    lambda: _load_whisper(settings.WHISPER_MODEL_NAME),
+    preload=settings.PRELOAD_WHISPER,
+)
+
+def get_whisper_model_and_processor():
+    return model_registry.get(WHISPER_MODEL)
@@ -0,0 +1,2 @@
+from .segmenter import ParagraphJob, TokenBudgetSegmenter
+from .video_pipeline import VideoSummaryPipeline
@@ -0,0 +1,56 @@
+import asyncio
+from collections import deque
+from typing import Any, AsyncGenerator, AsyncIterable, Awaitable, Callable, Iterable, Optional, Union
+
+
+async def _iterate(items: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncGenerator[Any, None]:
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def ordered_map(
+    fn: Callable[[Any], Awaitable[Any]],
+    items: Union[Iterable[Any], AsyncIterable[Any]],
+    max_concurrency: int,
+) -> AsyncGenerator[Any, None]:
+    """
+    Apply `fn` to each item with up to `max_concurrency` calls in flight,
+    yielding results in input order. Items are pulled lazily, so a slow
+    consumer also slows down how far ahead the calls run. A finished result
+    is yielded as soon as it is next in order, without waiting for the
+    source to produce another item.
+    """
+    max_concurrency = max(1, max_concurrency)
+    pending: deque = deque()
+    source = _iterate(items)
+    next_item: Optional[asyncio.Future] = None
+    exhausted = False
+
+    try:
+        while not exhausted or pending:
+            if not exhausted and next_item is None and len(pending) < max_concurrency:
+                next_item = asyncio.ensure_future(source.__anext__())
+            waiting = [task for task in (next_item, pending[0] if pending else None) if task is not None]
+            await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+            while pending and pending[0].done():
+                yield pending.popleft().result()
+            if next_item is not None and next_item.done():
+                try:
+                    item = next_item.result()
+                except StopAsyncIteration:
+                    exhausted = True
+                else:
+                    pending.append(asyncio.ensure_future(fn(item)))
+                next_item = None
+    finally:
+        if next_item is not None:
+            pending.append(next_item)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        await source.aclose()
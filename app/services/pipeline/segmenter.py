@@ -0,0 +1,106 @@
+import logging
+import time
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ParagraphJob:
+    """Transcripts of consecutive audio chunks that are summarized into one paragraph"""
+
+    def __init__(
+        self,
+        from_chunk: int,
+        to_chunk: int,
+        transcripts: List[str],
+        final: bool = False,
+        token_count: Optional[int] = None,
+    ):
+        self.from_chunk = from_chunk
+        self.to_chunk = to_chunk
+        self.transcripts = transcripts
+        self.final = final
+        self.token_count = token_count
+
+    @property
+    def text(self) -> str:
+        return " ".join(self.transcripts).strip()
+
+
+class TokenBudgetSegmenter:
+    """
+    Groups transcript chunks into paragraphs that fit the summarizer's input.
+    Each chunk is tokenized once when it arrives and its count kept, so the
+    paragraph size is a running sum rather than a re-tokenization of the
+    growing text. A paragraph is closed once it fills `fill_ratio` of the
+    budget, before a chunk that would overflow it, or `max_wait` seconds
+    after its first chunk arrived, whichever comes first.
+    The budget is `max_tokens` less the prompt prefix and special tokens.
+    """
+
+    def __init__(
+        self,
+        tokenizer,
+        max_tokens: int = 1024,
+        prompt_prefix: str = "summarize: ",
+        fill_ratio: float = 0.9,
+        max_wait: Optional[float] = None,
+        start_chunk: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.tokenizer = tokenizer
+        self.budget = max(1, max_tokens - len(tokenizer.encode(prompt_prefix)))
+        self.threshold = max(1, int(self.budget * fill_ratio))
+        self.max_wait = max_wait
+        self._clock = clock
+
+        self._transcripts: List[str] = []
+        self._tokens = 0
+        self._from_chunk = start_chunk
+        self._last_chunk = start_chunk - 1
+        self._started_at: Optional[float] = None
+
+    def count_tokens(self, text: str) -> int:
+        return len(self.tokenizer.encode(text, add_special_tokens=False))
+
+    def add(self, chunk_index: int, transcript: str, tokens: Optional[int] = None) -> List[ParagraphJob]:
+        """
+        Take the next chunk's transcript; returns the paragraphs it closed, oldest first.
+        `tokens` skips tokenizing when the caller already counted them.
+        """
+        jobs = []
+        if tokens is None:
+            tokens = self.count_tokens(transcript)
+
+        if self._transcripts and self._tokens + tokens > self.budget:
+            jobs.append(self.flush())
+        if tokens > self.budget:
+            logger.warning(f"Transcript of chunk {chunk_index} has {tokens} tokens, over the {self.budget} token budget")
+
+        if not self._transcripts:
+            self._from_chunk = chunk_index
+            self._started_at = self._clock()
+        self._transcripts.append(transcript)
+        self._tokens += tokens
+        self._last_chunk = chunk_index
+
+        if self._tokens >= self.threshold:
+            jobs.append(self.flush())
+        return jobs
+
+    def time_left(self) -> Optional[float]:
+        """Seconds until the open paragraph is due, or None when there is no deadline"""
+        if self.max_wait is None or self._started_at is None:
+            return None
+        return max(0.0, self._started_at + self.max_wait - self._clock())
+
+    def flush(self, final: bool = False) -> Optional[ParagraphJob]:
+        """Close the open paragraph, if any"""
+        if not self._transcripts:
+            return None
+        job = ParagraphJob(self._from_chunk, self._last_chunk, self._transcripts, final=final, token_count=self._tokens)
+        self._from_chunk = self._last_chunk + 1
+        self._transcripts = []
+        self._tokens = 0
+        self._started_at = None
+        return job
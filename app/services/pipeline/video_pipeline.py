@@ -0,0 +1,134 @@
+import asyncio
+import logging
+from typing import AsyncGenerator, Optional, Tuple
+
+from app.services.pipeline.ordered import ordered_map
+from app.services.pipeline.segmenter import ParagraphJob, TokenBudgetSegmenter
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+
+class VideoSummaryPipeline:
+    """
+    Staged download → transcode → transcribe → segment pipeline for video summaries.
+    Stages run as separate tasks connected by bounded queues, so ffmpeg output,
+    transcription and the caller's summarization of earlier paragraphs overlap.
+    Transcriptions run up to `transcribe_concurrency` at a time but are
+    delivered in chunk order; `segmenter` decides where paragraphs end.
+    """
+
+    def __init__(
+        self,
+        audio_processor,
+        transcriber,
+        video_result,
+        segmenter: TokenBudgetSegmenter,
+        start_chunk: int = 0,
+        transcribe_concurrency: int = 4,
+        audio_queue_size: int = 4,
+        paragraph_queue_size: int = 2,
+    ):
+        self.audio_processor = audio_processor
+        self.transcriber = transcriber
+        self.video_result = video_result
+        self.start_chunk = start_chunk
+        self.segmenter = segmenter
+        self.transcribe_concurrency = max(1, transcribe_concurrency)
+        self.audio_queue_size = audio_queue_size
+        self.paragraph_queue_size = paragraph_queue_size
+
+    async def paragraphs(self, video_id: str, start_time: Optional[float] = None) -> AsyncGenerator[ParagraphJob, None]:
+        audio_queue = asyncio.Queue(maxsize=self.audio_queue_size)
+        transcript_queue = asyncio.Queue(maxsize=self.transcribe_concurrency)
+        paragraph_queue = asyncio.Queue(maxsize=self.paragraph_queue_size)
+
+        stages = [
+            self._audio_stage(video_id, start_time, audio_queue),
+            self._transcribe_stage(audio_queue, transcript_queue),
+            self._segment_stage(transcript_queue, paragraph_queue),
+        ]
+        tasks = [asyncio.create_task(self._run_stage(stage, paragraph_queue)) for stage in stages]
+
+        try:
+            while True:
+                item = await paragraph_queue.get()
+                if item is _END:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_stage(self, stage, paragraph_queue: asyncio.Queue) -> None:
+        try:
+            await stage
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Video pipeline stage failed: {str(e)}")
+            await paragraph_queue.put(e)
+
+    async def _audio_stage(self, video_id: str, start_time: Optional[float], audio_queue: asyncio.Queue) -> None:
+        chunk_index = self.start_chunk
+        audio_chunks = self.audio_processor.process_content(video_id, start_time)
+        try:
+            async for audio_chunk in audio_chunks:
+                await audio_queue.put((chunk_index, audio_chunk))
+                chunk_index += 1
+        finally:
+            await audio_chunks.aclose()
+        await audio_queue.put(_END)
+
+    async def _transcribe_stage(self, audio_queue: asyncio.Queue, transcript_queue: asyncio.Queue) -> None:
+        async def audio_chunks():
+            while True:
+                item = await audio_queue.get()
+                if item is _END:
+                    return
+                yield item
+
+        transcripts = ordered_map(self._transcribe, audio_chunks(), self.transcribe_concurrency)
+        try:
+            async for item in transcripts:
+                await transcript_queue.put(item)
+        finally:
+            await transcripts.aclose()
+        await transcript_queue.put(_END)
+
+    async def _transcribe(self, item) -> Tuple[int, str]:
+        chunk_index, audio_chunk = item
+        if chunk_index in self.video_result.transcripts:
+            return chunk_index, self.video_result.transcripts[chunk_index]
+
+        transcript = await self.transcriber.transcribe_audio(audio_chunk)
+        self.video_result.add_transcript(chunk_index, transcript["text"])
+        return chunk_index, transcript["text"]
+
+    async def _segment_stage(self, transcript_queue: asyncio.Queue, paragraph_queue: asyncio.Queue) -> None:
+        segmenter = self.segmenter
+
+        while True:
+            try:
+                # Wake up when the open paragraph's wait runs out, even if no chunk arrives
+                item = await asyncio.wait_for(transcript_queue.get(), segmenter.time_left())
+            except asyncio.TimeoutError:
+                job = segmenter.flush()
+                if job is not None:
+                    await paragraph_queue.put(job)
+                continue
+            if item is _END:
+                break
+
+            chunk_index, transcript = item
+            for job in segmenter.add(chunk_index, transcript):
+                await paragraph_queue.put(job)
+
+        job = segmenter.flush(final=True)
+        if job is not None:
+            await paragraph_queue.put(job)
+        await paragraph_queue.put(_END)
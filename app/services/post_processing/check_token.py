@@ -1,3 +1,5 @@
+from typing import AsyncIterable, AsyncIterator, Callable, List, Optional
+
 SINHALA_ZWJ = '\u200D'
 SINHALA_HALKIRIMA = '\u0DCA'
 
@@ -11,3 +13,58 @@ def needs_zwj(prev_token, curr_token):
     if prev_token[-1] == SINHALA_HALKIRIMA and curr_token[0] in (SINHALA_RA, SINHALA_YA):
         return True
     return False
+
+
+class ZwjJoiner:
+    """
+    Streams tokens with a ZWJ between a halkirima and a following ra/ya.
+    Each token is held back until the next one shows whether they pair up.
+    """
+
+    def __init__(self):
+        self.prev_token = None
+
+    def push(self, token):
+        """The token now ready to send, or None while it may still pair with the next one"""
+        if self.prev_token is None:
+            self.prev_token = token
+            return None
+        if needs_zwj(self.prev_token, token):
+            combined = self.prev_token + SINHALA_ZWJ + token
+            self.prev_token = None
+            return combined
+        ready, self.prev_token = self.prev_token, token
+        return ready
+
+    def flush(self):
+        ready, self.prev_token = self.prev_token, None
+        return ready
+
+
+async def zwj_events(
+    batches: AsyncIterable[List[str]],
+    on_token: Optional[Callable[[], None]] = None,
+) -> AsyncIterator[List[str]]:
+    """
+    Tokens for each SSE event, from batches of streamer pieces.
+    Pieces are paired one by one as the streamer produced them; only the
+    event groups them. `on_token` is called for every non-blank piece.
+    """
+    joiner = ZwjJoiner()
+    async for pieces in batches:
+        event_tokens = []
+        for piece in pieces:
+            token = piece.strip()
+            if not token:
+                continue
+            if on_token is not None:
+                on_token()
+            ready = joiner.push(token)
+            if ready is not None:
+                event_tokens.append(ready)
+        if event_tokens:
+            yield event_tokens
+
+    last_token = joiner.flush()
+    if last_token:
+        yield [last_token]
@@ -1 +1,2 @@
-from .sinhala_summarizer import SinhalaSummarizer
\ No newline at end of file
+from .hierarchical import HierarchicalSummarizer
+from .sinhala_summarizer import SinhalaSummarizer
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import re
+from typing import Iterable, List, Optional, Tuple
+
+from app.services.cache.summary_cache import SummaryCache, summary_cache
+from app.services.inference.batcher import GenerationBatcher
+from app.services.metrics import observe_stage
+from app.services.pipeline.segmenter import TokenBudgetSegmenter
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?।\n])\s+")
+
+
+class HierarchicalSummarizer:
+    """
+    Map-reduce summarization for texts longer than the model's input.
+    The text is cut at sentence boundaries into windows that fit the encoder.
+    Windows are submitted in waves of up to the batcher's batch size, so each
+    wave is generated as one batch without filling the batcher's queue, and
+    the joined partial summaries are summarized again, for as many rounds as
+    they still do not fit. Every summary, partial or final, goes
+    through the summary cache under the same key a direct request for that
+    text would use.
+    """
+
+    def __init__(
+        self,
+        batcher: GenerationBatcher,
+        cache: Optional[SummaryCache] = summary_cache,
+        max_rounds: int = 4,
+    ):
+        self.batcher = batcher
+        self.tokenizer = batcher.tokenizer
+        self.cache = cache
+        self.max_rounds = max(1, max_rounds)
+
+    async def summarize(self, text: str, prompt_prefix: str = "summarize: ", category: Optional[str] = None) -> str:
+        windows = self.split(text, prompt_prefix)
+        if len(windows) <= 1:
+            return await self.summarize_one(text, prompt_prefix, category)
+        return await self._reduce(windows, prompt_prefix, category)
+
+    async def reduce(self, summaries: List[str], prompt_prefix: str = "summarize: ", category: Optional[str] = None) -> str:
+        """Summary of summaries that were already produced, such as the paragraphs of a video"""
+        windows = self._pack(((summary, self._count(summary)) for summary in summaries if summary.strip()), prompt_prefix)
+        if not windows:
+            return ""
+        return await self._reduce(windows, prompt_prefix, category)
+
+    async def summarize_one(self, text: str, prompt_prefix: str = "summarize: ", category: Optional[str] = None) -> str:
+        """One generation, truncated to the model's input like a direct request"""
+        if self.cache is None:
+            return await self.batcher.submit(prompt_prefix + text)
+
+        key = self.cache.make_key(
+            text,
+            model=self.batcher.model_id,
+            category=category,
+            generation_kwargs=self.batcher.generation_kwargs,
+        )
+        summary = await self.cache.get(key)
+        if summary is None:
+            summary = await self.batcher.submit(prompt_prefix + text)
+            await self.cache.set(key, summary)
+        return summary
+
+    def split(self, text: str, prompt_prefix: str = "summarize: ") -> List[str]:
+        """Windows of whole sentences that each fit the model's input after `prompt_prefix`"""
+        sentences = [sentence for sentence in _SENTENCE_END.split(text) if sentence.strip()]
+        return self._pack(((sentence, self._count(sentence)) for sentence in sentences), prompt_prefix)
+
+    async def _reduce(self, windows: List[str], prompt_prefix: str, category: Optional[str]) -> str:
+        # A long text has far more windows than the batcher queues; one request must not overflow it on its own
+        wave = asyncio.Semaphore(self.batcher.max_batch_size)
+
+        async def summarize_window(window: str) -> str:
+            async with wave:
+                return await self.summarize_one(window, prompt_prefix, category)
+
+        for level in range(self.max_rounds):
+            if len(windows) == 1:
+                break
+            with observe_stage("hierarchical_map"):
+                partials = await asyncio.gather(*(summarize_window(window) for window in windows))
+            logger.info(f"Summarized {len(windows)} windows at level {level}")
+            windows = self._pack(((partial, self._count(partial)) for partial in partials), prompt_prefix)
+
+        if len(windows) > 1:
+            logger.warning(f"Partial summaries still span {len(windows)} windows after {self.max_rounds} rounds")
+
+        with observe_stage("hierarchical_reduce"):
+            return await self.summarize_one(" ".join(windows), prompt_prefix, category)
+
+    def _pack(self, pieces: Iterable[Tuple[str, int]], prompt_prefix: str) -> List[str]:
+        segmenter = TokenBudgetSegmenter(
+            self.tokenizer,
+            max_tokens=self.batcher.max_input_length,
+            prompt_prefix=prompt_prefix,
+            fill_ratio=1.0,
+        )
+        windows = []
+        index = 0
+        for text, tokens in pieces:
+            for piece, piece_tokens in self._fit(text, tokens, segmenter.budget):
+                windows.extend(job.text for job in segmenter.add(index, piece, tokens=piece_tokens))
+                index += 1
+        last = segmenter.flush()
+        if last is not None:
+            windows.append(last.text)
+        return windows
+
+    def _fit(self, text: str, tokens: int, budget: int) -> List[Tuple[str, int]]:
+        """Split a piece that is longer than the budget on its own at word boundaries"""
+        words = text.split()
+        if tokens <= budget or len(words) < 2:
+            return [(text, tokens)]
+        middle = len(words) // 2
+        halves = [" ".join(words[:middle]), " ".join(words[middle:])]
+        return [fitted for half in halves for fitted in self._fit(half, self._count(half), budget)]
+
+    def _count(self, text: str) -> int:
+        return len(self.tokenizer.encode(text, add_special_tokens=False))
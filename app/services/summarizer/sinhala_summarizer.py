@@ -1,12 +1,30 @@
-import torch
-from transformers import MT5ForConditionalGeneration, MT5Tokenizer
 from typing import List, Dict
 
+from app.services.inference.batcher import GenerationBatcher
+from app.services.summarizer.hierarchical import HierarchicalSummarizer
+
 class SinhalaSummarizer:
     def __init__(self, model_path):
+        import torch
+        from transformers import MT5ForConditionalGeneration, MT5Tokenizer
+
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.tokenizer = MT5Tokenizer.from_pretrained(model_path)
         self.model = MT5ForConditionalGeneration.from_pretrained(model_path).to(self.device)
+        self.batcher = GenerationBatcher(
+            self.model,
+            self.tokenizer,
+            model_id=model_path,
+            generation_kwargs={
+                "max_length": 150,
+                "min_length": 40,
+                "length_penalty": 2.0,
+                "num_beams": 4,
+                "early_stopping": True,
+            },
+        )
+        # Long conversations are summarized window by window instead of being cut at 1024 tokens
+        self.summarizer = HierarchicalSummarizer(self.batcher)
         
     async def summarize_transcript(self, 
         transcript_segments: List[Dict], 
@@ -36,23 +54,7 @@ class SinhalaSummarizer:
             speaker_text = " ".join(texts)
             input_text += f"{role}: {speaker_text}\n\n"
             
-        input_text = "summerize: " + input_text
-        
-        # Tokenize and generate summary
-        inputs = self.tokenizer(input_text, return_tensors="pt", max_length=1024, truncation=True)
-        inputs = {k: v.to(self.device) for k, v in inputs.items()}
-        
-        # Generate summary
-        summary_ids = self.model.generate(
-            **inputs,
-            max_length=150,
-            min_length=40,
-            length_penalty=2.0,
-            num_beams=4,
-            early_stopping=True
-        )
-        
-        summary = self.tokenizer.decode(summary_ids[0], skip_special_tokens=True)
+        summary = await self.summarizer.summarize(input_text, prompt_prefix="summerize: ")
         
         return {
             "summary": summary,
@@ -1,35 +1,53 @@
+from google.api_core import exceptions as google_exceptions
 from google.cloud import speech
-import io
+import asyncio
+import logging
 import os
-from typing import List, Dict
+from typing import AsyncGenerator, AsyncIterable, Iterable, List, Dict, Union
 from pydub import AudioSegment
 
+from app.services.metrics import observe_stage
+from app.services.pipeline.ordered import ordered_map
+from app.services.youtube_handler.pcm_stream import AudioFormat, PcmChunk
+
+logger = logging.getLogger(__name__)
+
 class SinhalaTranscriber:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, client=None, max_retries: int = 3, base_backoff: float = 1.5):
         if api_key:
             os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = api_key
         
-        self.client = speech.SpeechClient()
+        self.client = client or speech.SpeechClient()
         self.language_code = "si-LK"
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        # Speech-to-text is tuned for 16 kHz mono; anything richer is just more bytes to upload
+        self.preferred_format = AudioFormat(sample_rate=16000, channels=1)
+
+    async def transcribe_many(
+        self,
+        audio_chunks: Union[Iterable[Union[AudioSegment, PcmChunk]], AsyncIterable[Union[AudioSegment, PcmChunk]]],
+        max_concurrency: int = 4,
+    ) -> AsyncGenerator[Dict, None]:
+        """Transcribe many chunks concurrently, yielding results in chunk order"""
+        async for transcript in ordered_map(self.transcribe_audio, audio_chunks, max_concurrency):
+            yield transcript
       
-    async def transcribe_audio(self, audio_chunk: AudioSegment) -> Dict:
-        mono_audio = audio_chunk.set_channels(1)
-        
-        with io.BytesIO() as audio_file:
-            mono_audio.export(audio_file, format="wav")
-            content = audio_file.getvalue()
+    async def transcribe_audio(self, audio_chunk: Union[AudioSegment, PcmChunk]) -> Dict:
+        content = self._linear16_content(audio_chunk)
         
         audio = speech.RecognitionAudio(content=content)
         config = speech.RecognitionConfig(
             encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-            sample_rate_hertz=mono_audio.frame_rate,
+            sample_rate_hertz=self.preferred_format.sample_rate,
             language_code=self.language_code,
             enable_automatic_punctuation=True,
-            audio_channel_count=1,
+            audio_channel_count=self.preferred_format.channels,
             enable_word_time_offsets=True,
         )
         
-        response = self.client.recognize(config=config, audio=audio)
+        with observe_stage("transcription"):
+            response = await self._recognize(config, audio)
         
         transcribed_segments = []
         
@@ -58,6 +76,34 @@ class SinhalaTranscriber:
             return merged_segments[0]
     
     
+    def _linear16_content(self, audio_chunk: Union[AudioSegment, PcmChunk]) -> bytes:
+        """Raw PCM in `preferred_format`; chunks already in that format are sent as-is"""
+        if isinstance(audio_chunk, PcmChunk):
+            if audio_chunk.format == self.preferred_format:
+                return bytes(audio_chunk.data)
+            audio_chunk = audio_chunk.to_audio_segment()
+
+        converted = (
+            audio_chunk
+            .set_frame_rate(self.preferred_format.sample_rate)
+            .set_channels(self.preferred_format.channels)
+            .set_sample_width(self.preferred_format.sample_width)
+        )
+        return converted.raw_data
+
+    async def _recognize(self, config, audio):
+        """Blocking recognize call on a worker thread, retried with exponential backoff"""
+        for attempt in range(self.max_retries):
+            try:
+                return await asyncio.to_thread(self.client.recognize, config=config, audio=audio)
+            except google_exceptions.InvalidArgument:
+                raise
+            except Exception as e:
+                if attempt == self.max_retries - 1:
+                    raise
+                logger.warning(f"Recognize attempt {attempt+1} failed: {str(e)}")
+                await asyncio.sleep(self.base_backoff ** attempt)
+    
     def _merge_words_to_sentences(self, word_segments: List[Dict]) -> List[Dict]:
         if not word_segments:
             return []
@@ -0,0 +1,108 @@
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+_ATTRIBUTE = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)')
+
+
+class HlsSegment:
+    """One media segment of an HLS media playlist"""
+
+    def __init__(self, uri: str, duration: float, sequence: int, program_date_time: Optional[float] = None):
+        self.uri = uri
+        self.duration = duration
+        self.sequence = sequence
+        self.program_date_time = program_date_time
+
+
+class HlsVariant:
+    """One rendition listed in an HLS master playlist"""
+
+    def __init__(self, uri: str, bandwidth: int, codecs: str = ""):
+        self.uri = uri
+        self.bandwidth = bandwidth
+        self.codecs = codecs
+
+
+class HlsPlaylist:
+    """Parsed HLS playlist; either a master playlist with variants or a media playlist with segments"""
+
+    def __init__(
+        self,
+        segments: List[HlsSegment],
+        variants: List[HlsVariant],
+        target_duration: float = 0,
+        media_sequence: int = 0,
+        ended: bool = False,
+    ):
+        self.segments = segments
+        self.variants = variants
+        self.target_duration = target_duration
+        self.media_sequence = media_sequence
+        self.ended = ended
+
+    @property
+    def is_master(self) -> bool:
+        return bool(self.variants)
+
+    def audio_variant(self) -> HlsVariant:
+        """Lowest-bandwidth rendition, which is all speech recognition needs"""
+        return min(self.variants, key=lambda variant: variant.bandwidth)
+
+
+def _parse_attributes(value: str) -> Dict[str, str]:
+    return {key: val.strip('"') for key, val in _ATTRIBUTE.findall(value)}
+
+
+def _parse_date_time(value: str) -> float:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def parse_playlist(text: str, base_url: str) -> HlsPlaylist:
+    """Parse an m3u8 playlist, resolving segment and variant URIs against `base_url`"""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if not lines or lines[0] != "#EXTM3U":
+        raise ValueError("Not an HLS playlist")
+
+    segments = []
+    variants = []
+    target_duration = 0.0
+    media_sequence = 0
+    ended = False
+
+    duration = None
+    program_date_time = None
+    variant_attributes = None
+
+    for line in lines[1:]:
+        if line.startswith("#EXT-X-TARGETDURATION:"):
+            target_duration = float(line.split(":", 1)[1])
+        elif line.startswith("#EXT-X-MEDIA-SEQUENCE:"):
+            media_sequence = int(line.split(":", 1)[1])
+        elif line.startswith("#EXT-X-PROGRAM-DATE-TIME:"):
+            program_date_time = _parse_date_time(line.split(":", 1)[1])
+        elif line.startswith("#EXTINF:"):
+            duration = float(line.split(":", 1)[1].split(",", 1)[0])
+        elif line.startswith("#EXT-X-STREAM-INF:"):
+            variant_attributes = _parse_attributes(line.split(":", 1)[1])
+        elif line == "#EXT-X-ENDLIST":
+            ended = True
+        elif line.startswith("#"):
+            continue
+        elif variant_attributes is not None:
+            variants.append(HlsVariant(
+                urljoin(base_url, line),
+                int(variant_attributes.get("BANDWIDTH", 0)),
+                variant_attributes.get("CODECS", ""),
+            ))
+            variant_attributes = None
+        elif duration is not None:
+            sequence = media_sequence + len(segments)
+            segments.append(HlsSegment(urljoin(base_url, line), duration, sequence, program_date_time))
+            if program_date_time is not None:
+                # Later segments continue the timeline unless re-anchored by another tag
+                program_date_time += duration
+            duration = None
+
+    return HlsPlaylist(segments, variants, target_duration, media_sequence, ended)
@@ -0,0 +1,194 @@
+import asyncio
+import logging
+from typing import AsyncGenerator, AsyncIterable, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+READ_SIZE = 64 * 1024
+
+
+class AudioFormat:
+    """Raw PCM layout a consumer wants audio delivered in"""
+
+    def __init__(self, sample_rate: int, channels: int, encoding: str = "LINEAR16"):
+        if encoding != "LINEAR16":
+            raise ValueError(f"Unsupported audio encoding: {encoding}")
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.encoding = encoding
+        self.sample_width = 2
+
+    @property
+    def bytes_per_second(self) -> int:
+        return self.sample_rate * self.channels * self.sample_width
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, AudioFormat)
+            and (self.sample_rate, self.channels, self.encoding)
+            == (other.sample_rate, other.channels, other.encoding)
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.sample_rate, self.channels, self.encoding))
+
+    def __repr__(self) -> str:
+        return f"AudioFormat({self.sample_rate} Hz, {self.channels} ch, {self.encoding})"
+
+
+class PcmChunk:
+    """Fixed-duration window of raw signed 16-bit little-endian PCM audio"""
+
+    def __init__(self, data: memoryview, sample_rate: int, channels: int, sample_width: int = 2):
+        self.data = data
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+
+    @property
+    def frame_rate(self) -> int:
+        return self.sample_rate
+
+    @property
+    def format(self) -> AudioFormat:
+        return AudioFormat(self.sample_rate, self.channels)
+
+    @property
+    def duration_seconds(self) -> float:
+        return len(self.data) / (self.sample_rate * self.channels * self.sample_width)
+
+    def to_audio_segment(self):
+        from pydub import AudioSegment
+
+        return AudioSegment(
+            data=bytes(self.data),
+            sample_width=self.sample_width,
+            frame_rate=self.sample_rate,
+            channels=self.channels,
+        )
+
+
+class PcmChunker:
+    """
+    Slices a raw PCM byte stream into fixed-size windows.
+    Incoming bytes are copied once into a preallocated window buffer;
+    completed windows are handed out as memoryviews over that buffer.
+    """
+
+    def __init__(self, chunk_bytes: int):
+        self.chunk_bytes = chunk_bytes
+        self._window = bytearray(chunk_bytes)
+        self._view = memoryview(self._window)
+        self._filled = 0
+
+    def feed(self, data: bytes) -> List[memoryview]:
+        completed = []
+        source = memoryview(data)
+        while source:
+            take = min(len(source), self.chunk_bytes - self._filled)
+            self._view[self._filled:self._filled + take] = source[:take]
+            self._filled += take
+            source = source[take:]
+
+            if self._filled == self.chunk_bytes:
+                completed.append(self._view)
+                # Consumers may still hold the finished window, so start a fresh one
+                self._window = bytearray(self.chunk_bytes)
+                self._view = memoryview(self._window)
+                self._filled = 0
+        return completed
+
+    def flush(self) -> Optional[memoryview]:
+        """Return the partially filled tail window, if any"""
+        if not self._filled:
+            return None
+        tail = self._view[:self._filled]
+        self._window = bytearray(self.chunk_bytes)
+        self._view = memoryview(self._window)
+        self._filled = 0
+        return tail
+
+
+async def ffmpeg_pcm_chunks(
+    input_args: Sequence[str],
+    audio_format: AudioFormat,
+    chunk_duration: float,
+    input_data: Optional[Union[bytes, AsyncIterable[bytes]]] = None,
+) -> AsyncGenerator[PcmChunk, None]:
+    """
+    Decode any ffmpeg input to raw s16le PCM on stdout and yield it in
+    `chunk_duration` windows as soon as each one fills. ffmpeg resamples and
+    downmixes to `audio_format`, so consumers never re-encode.
+    `input_args` are the ffmpeg arguments that select the input
+    (e.g. `["-i", url]`); pass `input_data` together with `["-i", "pipe:0"]`
+    to decode in-memory bytes or an async stream of byte blocks.
+    """
+    sample_rate = audio_format.sample_rate
+    channels = audio_format.channels
+    sample_width = audio_format.sample_width
+    chunker = PcmChunker(int(chunk_duration * sample_rate) * channels * sample_width)
+
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-loglevel", "error",
+        *input_args,
+        "-vn",
+        "-f", "s16le",
+        "-acodec", "pcm_s16le",
+        "-ar", str(sample_rate),
+        "-ac", str(channels),
+        "pipe:1",
+    ]
+
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE if input_data is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+    async def write_input():
+        try:
+            if isinstance(input_data, (bytes, bytearray, memoryview)):
+                process.stdin.write(input_data)
+                await process.stdin.drain()
+            else:
+                async for data in input_data:
+                    process.stdin.write(data)
+                    await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            process.stdin.close()
+            if hasattr(input_data, "aclose"):
+                await input_data.aclose()
+
+    writer = asyncio.create_task(write_input()) if input_data is not None else None
+
+    try:
+        while True:
+            data = await process.stdout.read(READ_SIZE)
+            if not data:
+                break
+            for window in chunker.feed(data):
+                yield PcmChunk(window, sample_rate, channels, sample_width)
+
+        tail = chunker.flush()
+        if tail is not None:
+            yield PcmChunk(tail, sample_rate, channels, sample_width)
+
+        if writer is not None:
+            # Surface failures of the input stream rather than treating them as end of audio
+            await writer
+
+        return_code = await process.wait()
+        if return_code != 0:
+            error = (await process.stderr.read()).decode(errors="replace").strip()
+            raise RuntimeError(f"ffmpeg exited with code {return_code}: {error}")
+    finally:
+        if writer is not None:
+            writer.cancel()
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
@@ -1,33 +1,51 @@
-import subprocess
 import tempfile
 import os
 import time
 import aiohttp
 import asyncio
 import logging
-from typing import Optional, AsyncGenerator
+from collections import deque
+from typing import Dict, Optional, AsyncGenerator, Tuple
 
-from pydub import AudioSegment
 import yt_dlp
 
+from app.services.metrics import record_live_lag
+from app.services.youtube_handler.hls import HlsPlaylist, HlsSegment, parse_playlist
+from app.services.youtube_handler.pcm_stream import AudioFormat, PcmChunk, ffmpeg_pcm_chunks
+
 logger = logging.getLogger(__name__)
 
 class YouTubeAudioProcessor:
-    def __init__(self):
+    def __init__(self, audio_format: Optional[AudioFormat] = None):
         self.chunk_duration = 30  # Seconds
+        # Produce audio in the consumer's format so chunks are never re-encoded downstream
+        self.audio_format = audio_format or AudioFormat(sample_rate=44100, channels=2)
         self.max_retries = 5
         self.base_backoff = 1.5
         self.live_refresh_interval = 20  # Manifest refresh interval for live streams
-
-    async def process_content(self, video_id: str, start_time = None) -> AsyncGenerator[AudioSegment, None]:
-        """Main entry point for both live and VOD content processing"""
-        
-        is_live = await self._check_live_status(video_id)
+        self.live_edge_segments = 3  # Segments behind the live edge to start from
+        self.live_stall_timeout = 120  # Seconds without new segments before giving up
+        self.live_lag_seconds = 0.0
+        self.max_live_lag_seconds = 0.0
+        self._live_status: Dict[str, bool] = {}
+
+    async def is_live(self, video_id: str) -> bool:
+        """Whether the video is a live broadcast; looked up once per processor"""
+        if video_id not in self._live_status:
+            self._live_status[video_id] = await self._check_live_status(video_id)
+        return self._live_status[video_id]
+
+    async def process_content(self, video_id: str, start_time = None) -> AsyncGenerator[PcmChunk, None]:
+        """
+        Main entry point for both live and VOD content processing.
+        `start_time` only applies to VOD; live audio always starts near the live edge.
+        """
         
-        if is_live:
-            pass
+        if await self.is_live(video_id):
+            async for chunk in self._handle_live(video_id):
+                yield chunk
         else:
-            async for chunk in self._handle_vod(video_id):
+            async for chunk in self._handle_vod(video_id, start_time):
                 yield chunk
 
     async def _get_video_metadata(self, video_id: str) -> dict:
@@ -61,99 +79,164 @@ class YouTubeAudioProcessor:
         metadata = await self._get_video_metadata(video_id)
         return metadata.get("is_live", False)
 
-    def _filter_segments(self, playlist, join_time, last_segment) -> list:
-        """Time-aware segment filtering with expiration check"""
-        valid_segments = []
-        now = time.time()
-        
-        for segment in playlist.segments:
-            if (segment.program_date_time.timestamp() > join_time and 
-                segment.program_date_time.timestamp() < now - playlist.target_duration):
-                valid_segments.append(segment)
-        
-        return valid_segments
+    def _get_live_manifest(self, video_id: str) -> Tuple[str, Dict[str, str]]:
+        """Resolve the HLS manifest URL and request headers for a live stream"""
+        ydl_opts = {
+            "quiet": True,
+            "format": "bestaudio/best",
+            "skip_download": True,
+        }
+
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(f"https://youtu.be/{video_id}", download=False)
+            manifest_url = info.get("url") or info.get("manifest_url")
+            if not manifest_url:
+                raise RuntimeError(f"No HLS manifest available for live video {video_id}")
+            return manifest_url, info.get("http_headers", {})
+
+    async def _handle_live(self, video_id: str) -> AsyncGenerator[PcmChunk, None]:
+        """
+        Live handling: new HLS segments are fetched as they appear and fed through
+        a single long-running ffmpeg pipe, so chunks come out at the same fixed
+        duration as VOD. Lag behind the live edge is recorded per chunk.
+        """
+        manifest_url, headers = await asyncio.to_thread(self._get_live_manifest, video_id)
+
+        # Media time at which each fetched segment ends, and when it was available at the source
+        timeline = deque()
+        fed_seconds = 0.0
+        emitted_seconds = 0.0
+
+        connector = aiohttp.TCPConnector(limit=4)
+        async with aiohttp.ClientSession(headers=headers, connector=connector) as session:
+            async def segment_data():
+                nonlocal fed_seconds
+                async for segment, available_at, data in self._live_segments(session, manifest_url):
+                    fed_seconds += segment.duration
+                    timeline.append((fed_seconds, available_at))
+                    yield data
+
+            async for chunk in ffmpeg_pcm_chunks(
+                ["-i", "pipe:0"],
+                audio_format=self.audio_format,
+                chunk_duration=self.chunk_duration,
+                input_data=segment_data(),
+            ):
+                emitted_seconds += chunk.duration_seconds
+                while len(timeline) > 1 and timeline[0][0] < emitted_seconds:
+                    timeline.popleft()
+                available_at = timeline[0][1] if timeline else time.time()
+                self._record_live_lag(time.time() - available_at)
+                yield chunk
 
-    async def _process_segments(self, segments, downloaded_segments) -> AsyncGenerator[AudioSegment, None]:
-        """Segment processing with expiration awareness"""
-        async with aiohttp.ClientSession() as session:
-            for segment in segments:
-                if segment.uri in downloaded_segments:
+    async def _live_segments(
+        self,
+        session: aiohttp.ClientSession,
+        manifest_url: str,
+    ) -> AsyncGenerator[Tuple[HlsSegment, float, bytes], None]:
+        """
+        Poll the manifest and yield each segment not seen before, with the wall
+        time it became available. Joins `live_edge_segments` behind the live edge.
+        """
+        playlist_url = manifest_url
+        last_sequence = None
+        last_progress = time.monotonic()
+
+        while True:
+            playlist = await self._fetch_playlist(session, playlist_url)
+            if playlist.is_master:
+                playlist_url = playlist.audio_variant().uri
+                continue
+
+            seen_at = time.time()
+            if last_sequence is None:
+                new_segments = playlist.segments[-self.live_edge_segments:]
+            else:
+                new_segments = [segment for segment in playlist.segments if segment.sequence > last_sequence]
+
+            for segment in new_segments:
+                last_sequence = segment.sequence
+                data = await self._fetch_segment(session, segment)
+                if data is None:
                     continue
-                
-                for attempt in range(self.max_retries):
-                    try:
-                        async with session.get(segment.uri) as response:
-                            audio_data = await response.read()
-                            chunk = await self._convert_to_pcm(audio_data)
-                            downloaded_segments.add(segment.uri)
-                            yield chunk
-                            break
-                    except Exception as e:
-                        logger.warning(f"Segment {segment.uri} failed (attempt {attempt+1}): {str(e)}")
-                        await asyncio.sleep(self.base_backoff ** attempt)
-
-    async def _handle_vod(self, video_id: str) -> AsyncGenerator[AudioSegment, None]:
-        """Improved VOD handling with frame-accurate splitting"""
+                if segment.program_date_time is not None:
+                    available_at = segment.program_date_time + segment.duration
+                else:
+                    available_at = seen_at
+                yield segment, available_at, data
+
+            if playlist.ended:
+                return
+
+            if new_segments:
+                last_progress = time.monotonic()
+            elif time.monotonic() - last_progress > self.live_stall_timeout:
+                raise RuntimeError(f"Live stream produced no new segments for {self.live_stall_timeout}s")
+
+            # HLS clients should not reload faster than the target duration allows new segments
+            await asyncio.sleep(min(self.live_refresh_interval, playlist.target_duration or self.live_refresh_interval))
+
+    async def _fetch_playlist(self, session: aiohttp.ClientSession, url: str) -> HlsPlaylist:
+        for attempt in range(self.max_retries):
+            try:
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    return parse_playlist(await response.text(), str(response.url))
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                logger.warning(f"Manifest fetch attempt {attempt+1} failed: {str(e)}")
+                await asyncio.sleep(self.base_backoff ** attempt)
+
+        raise RuntimeError(f"Failed to fetch live manifest after {self.max_retries} attempts")
+
+    async def _fetch_segment(self, session: aiohttp.ClientSession, segment: HlsSegment) -> Optional[bytes]:
+        for attempt in range(self.max_retries):
+            try:
+                async with session.get(segment.uri) as response:
+                    response.raise_for_status()
+                    return await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Segment {segment.uri} failed (attempt {attempt+1}): {str(e)}")
+                await asyncio.sleep(self.base_backoff ** attempt)
+
+        logger.error(f"Skipping live segment {segment.sequence} after {self.max_retries} attempts")
+        return None
+
+    def _record_live_lag(self, lag_seconds: float) -> None:
+        self.live_lag_seconds = lag_seconds
+        self.max_live_lag_seconds = max(self.max_live_lag_seconds, lag_seconds)
+        record_live_lag(lag_seconds)
+        logger.debug(f"Live chunk emitted {lag_seconds:.1f}s behind the live edge")
+
+    def _download_audio(self, video_id: str, target_dir: str) -> str:
+        """Download the best audio stream into `target_dir` and return its path"""
+        ydl_opts = {
+            "quiet": True,
+            "format": "bestaudio/best",
+            "outtmpl": os.path.join(target_dir, "audio.%(ext)s"),
+        }
+
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(f"https://youtu.be/{video_id}", download=True)
+            return ydl.prepare_filename(info)
+
+    async def _handle_vod(self, video_id: str, start_time: Optional[float] = None) -> AsyncGenerator[PcmChunk, None]:
+        """
+        VOD handling, optionally starting `start_time` seconds in.
+        ffmpeg decodes straight to PCM on stdout and each chunk is yielded
+        as soon as its window fills; only the downloaded source touches disk.
+        """
         
         with tempfile.TemporaryDirectory() as tmpdir:
-            ydl_opts = {
-                "quiet": True,
-                "format": "bestaudio/best",
-                "outtmpl": os.path.join(tmpdir, "audio.%(ext)s"),
-            }
-
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(f"https://youtu.be/{video_id}", download=True)
-                audio_file = ydl.prepare_filename(info)
-
-            ffmpeg_cmd = [
-                "ffmpeg",
-                "-hide_banner",
-                "-loglevel", "error",
-                "-i", audio_file,
-                "-f", "segment",
-                "-segment_time", str(self.chunk_duration),
-                "-c:a", "pcm_s16le",
-                "-ar", "44100",
-                "-ac", "2",
-                "-map", "0:a",
-                "-segment_format", "wav",
-                "chunk-%03d.wav"
-            ]
-
-            subprocess.run(ffmpeg_cmd, check=True, cwd=tmpdir)
-
-            chunk_num = 0
-            while True:
-                chunk_path = os.path.join(tmpdir, f"chunk-{chunk_num:03d}.wav")
-                if not os.path.exists(chunk_path):
-                    break
-                
-                with open(chunk_path, "rb") as f:
-                    audio = AudioSegment.from_wav(f)
-                    yield audio
-                
-                chunk_num += 1
-
-    async def _convert_to_pcm(self, audio_data: bytes) -> AudioSegment:
-        """Convert arbitrary audio formats to standardized PCM"""
-        with tempfile.NamedTemporaryFile() as temp_in:
-            temp_in.write(audio_data)
-            temp_in.flush()
-            
-            with tempfile.NamedTemporaryFile(suffix=".wav") as temp_out:
-                subprocess.run([
-                    "ffmpeg",
-                    "-hide_banner",
-                    "-loglevel", "error",
-                    "-i", temp_in.name,
-                    "-ar", "44100",
-                    "-ac", "2",
-                    "-c:a", "pcm_s16le",
-                    "-y", temp_out.name
-                ], check=True)
-                
-                return AudioSegment.from_wav(temp_out.name)
+            audio_file = await asyncio.to_thread(self._download_audio, video_id, tmpdir)
+
+            seek_args = ["-ss", str(start_time)] if start_time else []
+
+            async for chunk in ffmpeg_pcm_chunks(
+                [*seek_args, "-i", audio_file, "-map", "0:a"],
+                audio_format=self.audio_format,
+                chunk_duration=self.chunk_duration,
+            ):
+                yield chunk
 
     async def _handle_retry(self, context: str):
         """Unified retry handler with exponential backoff"""
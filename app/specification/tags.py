@@ -13,6 +13,9 @@ END_METADATA = "[END-METADATA]"
 BEGIN_TIMESTAMP = "[BEGIN-TIMESTAMP]"
 END_TIMESTAMP = "[END-TIMESTAMP]"
 
+BEGIN_DIGEST = "[BEGIN-DIGEST]"
+END_DIGEST = "[END-DIGEST]"
+
 
 def YIELD_DATA(key, value): 
     text = f"[BEGIN-DATA] [BEGIN-KEY] {key} [END-KEY] [BEGIN-VALUE] {value} [END-VALUE] [END-DATA]"
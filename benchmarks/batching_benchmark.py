@@ -0,0 +1,94 @@
+"""
+Throughput of the MT5 summarization batcher at different batch sizes.
+
+    python -m benchmarks.batching_benchmark --requests 64 --batch-sizes 1 4 8 16
+
+Every batch size gets the same set of concurrent requests; the table reports
+requests/sec and mean per-request latency.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from app.core.config import settings
+from app.services.inference.batcher import GenerationBatcher
+from app.services.model_dependencies.mt5 import SUMMARY_GENERATION_KWARGS, _load_mt5
+
+SAMPLE_SENTENCES = [
+    "ශ්‍රී ලංකා මහ බැංකුව අද දින පොලී අනුපාත වෙනස් නොකර පවත්වා ගැනීමට තීරණය කළේය.",
+    "දිවයින පුරා ඉදිරි දින කිහිපය තුළ වැසි තත්ත්වය වර්ධනය වීමේ හැකියාවක් ඇති බව කාලගුණ විද්‍යා දෙපාර්තමේන්තුව පවසයි.",
+    "ජාතික ක්‍රිකට් කණ්ඩායම ඉදිරි තරග මාලාව සඳහා පුහුණු කටයුතු ආරම්භ කර තිබේ.",
+    "නව අධ්‍යාපන ප්‍රතිසංස්කරණ යටතේ පාසල් විෂය මාලාව යාවත්කාලීන කිරීමට සැලසුම් කර ඇත.",
+    "ප්‍රවාහන අමාත්‍යාංශය දුම්රිය සේවා වැඩිදියුණු කිරීම සඳහා නව යෝජනා ක්‍රමයක් ඉදිරිපත් කළේය.",
+]
+
+
+def make_texts(count: int, min_chars: int, max_chars: int, seed: int):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        target = rng.randint(min_chars, max_chars)
+        parts = []
+        while sum(len(p) + 1 for p in parts) < target:
+            parts.append(rng.choice(SAMPLE_SENTENCES))
+        texts.append(" ".join(parts)[:target])
+    return texts
+
+
+async def run_once(model, tokenizer, texts, batch_size: int, max_wait_ms: float):
+    batcher = GenerationBatcher(
+        model,
+        tokenizer,
+        max_batch_size=batch_size,
+        max_wait_ms=max_wait_ms,
+        generation_kwargs=SUMMARY_GENERATION_KWARGS,
+    )
+    latencies = []
+
+    async def one(text):
+        start = time.perf_counter()
+        await batcher.submit("summarize: " + text)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(text) for text in texts))
+    elapsed = time.perf_counter() - start
+    stats = batcher.stats()
+    await batcher.close()
+    return elapsed, latencies, stats
+
+
+async def main(args):
+    model, tokenizer = _load_mt5(args.model_path)
+    model.to(settings.DEVICE)
+    model.eval()
+
+    texts = make_texts(args.requests, args.min_chars, args.max_chars, args.seed)
+
+    # Warm-up so the first measured run does not pay one-off allocation costs
+    await run_once(model, tokenizer, texts[:2], 2, args.max_wait_ms)
+
+    print(f"{'batch':>6} {'req/s':>10} {'mean lat (s)':>14} {'avg batch':>10} {'speedup':>8}")
+    baseline = None
+    for batch_size in args.batch_sizes:
+        elapsed, latencies, stats = await run_once(model, tokenizer, texts, batch_size, args.max_wait_ms)
+        throughput = len(texts) / elapsed
+        baseline = baseline or throughput
+        print(
+            f"{batch_size:>6} {throughput:>10.2f} {statistics.mean(latencies):>14.2f} "
+            f"{stats['avg_batch_size']:>10} {throughput / baseline:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MT5 micro-batching throughput benchmark")
+    parser.add_argument("--model-path", default=settings.MODEL_PATH)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--max-wait-ms", type=float, default=settings.BATCH_MAX_WAIT_MS)
+    parser.add_argument("--min-chars", type=int, default=100)
+    parser.add_argument("--max-chars", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,122 @@
+"""
+Streaming throughput of the continuous-batching engine against one
+`generate` call per stream.
+
+    python -m benchmarks.continuous_batching_benchmark --streams 1 4 16
+    python -m benchmarks.continuous_batching_benchmark --tiny --streams 1 4 16
+
+Every stream summarizes its own paragraph and they all start together.
+The table reports aggregate tokens/sec and the mean gap between tokens of
+one stream, which is what a listener of the SSE stream sees. `--tiny` uses a
+small randomly initialised MT5 that only needs the tokenizer files.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import torch
+
+from app.core.config import settings
+from app.services.inference.continuous import ContinuousBatchingEngine
+from app.services.model_dependencies.mt5 import STREAM_GENERATION_KWARGS, _load_mt5
+from benchmarks.batching_benchmark import make_texts
+
+
+class TokenClock:
+    """Streamer that only records when each token arrives"""
+
+    def __init__(self):
+        self.times = []
+
+    def put(self, value):
+        self.times.append(time.perf_counter())
+
+    def end(self):
+        pass
+
+    def gaps(self):
+        # The first put is the decoder start token, sent before any decoding
+        times = self.times[1:]
+        return [later - earlier for earlier, later in zip(times, times[1:])]
+
+
+def load_tiny(tokenizer_path: str):
+    from transformers import AutoTokenizer, MT5Config, MT5ForConditionalGeneration
+
+    tokenizer = AutoTokenizer.from_pretrained(tokenizer_path)
+    config = MT5Config(
+        vocab_size=len(tokenizer), d_model=256, d_kv=32, d_ff=512, num_layers=4, num_heads=8,
+        decoder_start_token_id=tokenizer.pad_token_id, eos_token_id=tokenizer.eos_token_id,
+        pad_token_id=tokenizer.pad_token_id,
+    )
+    return MT5ForConditionalGeneration(config), tokenizer
+
+
+async def run_engine(model, tokenizer, prompts, generation_kwargs):
+    engine = ContinuousBatchingEngine(model, tokenizer, max_batch_size=len(prompts), **generation_kwargs)
+    clocks = [TokenClock() for _ in prompts]
+    start = time.perf_counter()
+    results = await asyncio.gather(*(engine.submit(prompt, clock) for prompt, clock in zip(prompts, clocks)))
+    elapsed = time.perf_counter() - start
+    engine.close()
+    return elapsed, results, clocks
+
+
+async def run_per_stream(model, tokenizer, prompts, generation_kwargs):
+    """The previous path: one `generate` per stream, each on its own thread"""
+    clocks = [TokenClock() for _ in prompts]
+
+    def generate(prompt, clock):
+        inputs = tokenizer(prompt, return_tensors="pt", max_length=1024, truncation=True).to(model.device)
+        with torch.inference_mode():
+            return model.generate(**inputs, num_beams=1, do_sample=False, streamer=clock, **generation_kwargs)[0]
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        asyncio.to_thread(generate, prompt, clock) for prompt, clock in zip(prompts, clocks)
+    ))
+    elapsed = time.perf_counter() - start
+    return elapsed, results, clocks
+
+
+def summarize(elapsed, results, clocks):
+    tokens = sum(len(result) - 1 for result in results)
+    gaps = [gap for clock in clocks for gap in clock.gaps()]
+    return tokens / elapsed, statistics.mean(gaps) * 1000 if gaps else 0.0
+
+
+async def main(args):
+    model, tokenizer = load_tiny(args.model_path) if args.tiny else _load_mt5(args.model_path)
+    model.to(settings.DEVICE)
+    model.eval()
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    generation_kwargs = dict(STREAM_GENERATION_KWARGS, max_length=args.max_length)
+    if args.tiny:
+        # Random weights rarely pick EOS; without a floor every stream runs to max_length
+        generation_kwargs["min_length"] = 0
+    texts = ["summarize: " + text for text in make_texts(max(args.streams), args.min_chars, args.max_chars, args.seed)]
+
+    await run_engine(model, tokenizer, texts[:2], generation_kwargs)
+
+    print(f"{'streams':>8} {'mode':>10} {'tok/s':>10} {'inter-token (ms)':>18}")
+    for streams in args.streams:
+        prompts = texts[:streams]
+        for mode, runner in (("per-stream", run_per_stream), ("engine", run_engine)):
+            throughput, gap_ms = summarize(*await runner(model, tokenizer, prompts, generation_kwargs))
+            print(f"{streams:>8} {mode:>10} {throughput:>10.1f} {gap_ms:>18.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Continuous batching streaming benchmark")
+    parser.add_argument("--model-path", default=settings.MODEL_PATH)
+    parser.add_argument("--tiny", action="store_true", help="Random small MT5, with the tokenizer from --model-path")
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--max-length", type=int, default=STREAM_GENERATION_KWARGS["max_length"])
+    parser.add_argument("--min-chars", type=int, default=500)
+    parser.add_argument("--max-chars", type=int, default=3000)
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,86 @@
+"""
+Cost of session-document writes through the Firestore wrapper.
+
+    python -m benchmarks.firestore_benchmark --sessions 50 --updates 20 --latency-ms 20
+    python -m benchmarks.firestore_benchmark --emulator localhost:8080
+
+Each session appends paragraphs to its own document, the way the summary
+stream does. Three write strategies are compared: the former read-then-write,
+a precondition update, and coalesced updates. By default it runs against the
+in-memory client with a simulated round trip; `--emulator` uses the Firestore
+emulator instead.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from google.cloud.firestore_v1 import ArrayUnion
+
+from app.services.firebase.firestore import Firestore
+from app.services.firebase.memory import InMemoryFirestoreClient
+
+
+def make_client(args):
+    if args.emulator:
+        os.environ["FIRESTORE_EMULATOR_HOST"] = args.emulator
+        from google.cloud.firestore import AsyncClient
+
+        return AsyncClient(project="benchmark")
+    return InMemoryFirestoreClient(latency_ms=args.latency_ms)
+
+
+async def read_then_write(store: Firestore, doc_id: str, data):
+    doc_ref = store.collection.document(doc_id)
+    snapshot = await doc_ref.get()
+    if snapshot.exists:
+        await doc_ref.update(data)
+
+
+async def run_once(args, strategy: str):
+    client = make_client(args)
+    store = Firestore(f"benchmark_{strategy}", client=client, coalesce_ms=args.coalesce_ms)
+    doc_ids = [await store.create({"summary": []}) for _ in range(args.sessions)]
+    rpcs_before = getattr(client, "rpc_count", 0)
+    latencies = []
+
+    async def session(doc_id):
+        for paragraph in range(args.updates):
+            data = {"summary": ArrayUnion([f"{doc_id}-{paragraph}"]), "updatedAt": time.time()}
+            start = time.perf_counter()
+            if strategy == "read-then-write":
+                await read_then_write(store, doc_id, data)
+            else:
+                await store.update(doc_id, data, coalesce=strategy == "coalesced")
+            latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(args.interval_ms / 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session(doc_id) for doc_id in doc_ids))
+    elapsed = time.perf_counter() - start
+    rpcs = getattr(client, "rpc_count", 0) - rpcs_before
+    return elapsed, latencies, rpcs
+
+
+async def main(args):
+    total = args.sessions * args.updates
+    print(f"{'strategy':>16} {'writes/s':>10} {'mean lat (ms)':>14} {'p95 lat (ms)':>13} {'RPCs':>7}")
+    for strategy in ["read-then-write", "precondition", "coalesced"]:
+        elapsed, latencies, rpcs = await run_once(args, strategy)
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        print(
+            f"{strategy:>16} {total / elapsed:>10.1f} {statistics.mean(latencies) * 1000:>14.1f} "
+            f"{p95 * 1000:>13.1f} {rpcs if not args.emulator else '-':>7}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Firestore session write benchmark")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--updates", type=int, default=20)
+    parser.add_argument("--interval-ms", type=float, default=5)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--coalesce-ms", type=float, default=50)
+    parser.add_argument("--emulator", help="host:port of a running Firestore emulator")
+    asyncio.run(main(parser.parse_args()))
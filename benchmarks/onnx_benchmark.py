@@ -0,0 +1,94 @@
+"""
+PyTorch against ONNX Runtime for the summarizer and the category classifier.
+
+    python -m app.services.model_dependencies.onnx_backend --output exports/onnx
+    python -m benchmarks.onnx_benchmark --onnx-dir exports/onnx --requests 32 --batch-sizes 1 8
+
+Summaries go through the same GenerationBatcher the API uses, so the table
+shows requests/sec and mean latency per backend and batch size. The
+classifier is timed one text at a time, as `/predict` runs it.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import torch
+
+from app.api.category.hander import _predict_probabilities
+from app.core.config import settings
+from app.services.model_dependencies.bert import SIN_BERT_MODEL, _load_sin_bert
+from app.services.model_dependencies.mt5 import MT5_MODEL, _load_mt5
+from app.services.model_dependencies.onnx_backend import _load_mt5_onnx, _load_sin_bert_onnx
+from benchmarks.batching_benchmark import make_texts, run_once
+
+
+async def bench_summarizer(args, texts):
+    backends = {
+        "pytorch": lambda: _load_mt5(args.model_path),
+        "onnx": lambda: _load_mt5_onnx(os.path.join(args.onnx_dir, MT5_MODEL)),
+    }
+    print(f"{'backend':>8} {'batch':>6} {'req/s':>10} {'mean lat (s)':>14}")
+    baseline = {}
+    for backend, load in backends.items():
+        model, tokenizer = load()
+        if hasattr(model, "eval"):
+            model.eval()
+        await run_once(model, tokenizer, texts[:2], 2, args.max_wait_ms)
+        for batch_size in args.batch_sizes:
+            elapsed, latencies, _ = await run_once(model, tokenizer, texts, batch_size, args.max_wait_ms)
+            throughput = len(texts) / elapsed
+            baseline.setdefault(batch_size, throughput)
+            print(
+                f"{backend:>8} {batch_size:>6} {throughput:>10.2f} {statistics.mean(latencies):>14.2f}"
+                f"  ({throughput / baseline[batch_size]:.2f}x)"
+            )
+        del model
+
+
+def bench_classifier(args, texts):
+    backends = {
+        "pytorch": lambda: _load_sin_bert(args.bert_path),
+        "onnx": lambda: _load_sin_bert_onnx(os.path.join(args.onnx_dir, SIN_BERT_MODEL)),
+    }
+    print(f"\n{'backend':>8} {'cls (ms)':>10} {'p95 (ms)':>10}")
+    for backend, load in backends.items():
+        model, tokenizer, _ = load()
+        if hasattr(model, "eval"):
+            model.eval()
+        _predict_probabilities(texts[0], model, tokenizer)
+        timings = []
+        for text in texts:
+            start = time.perf_counter()
+            _predict_probabilities(text, model, tokenizer)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        print(f"{backend:>8} {statistics.mean(timings):>10.1f} {timings[int(len(timings) * 0.95) - 1]:>10.1f}")
+
+
+async def main(args):
+    if args.threads:
+        torch.set_num_threads(args.threads)
+        settings.ONNX_INTRA_OP_THREADS = args.threads
+    texts = make_texts(args.requests, args.min_chars, args.max_chars, args.seed)
+
+    await bench_summarizer(args, texts)
+    if not args.skip_bert:
+        bench_classifier(args, texts)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PyTorch vs ONNX Runtime inference benchmark")
+    parser.add_argument("--model-path", default=settings.MODEL_PATH)
+    parser.add_argument("--bert-path", default=settings.MODEL_PATH_SIN_BERT)
+    parser.add_argument("--onnx-dir", default=settings.ONNX_MODEL_DIR)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--max-wait-ms", type=float, default=settings.BATCH_MAX_WAIT_MS)
+    parser.add_argument("--min-chars", type=int, default=100)
+    parser.add_argument("--max-chars", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=0, help="Threads for both backends; 0 keeps their defaults")
+    parser.add_argument("--skip-bert", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
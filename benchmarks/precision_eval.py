@@ -0,0 +1,162 @@
+"""
+Latency, memory and quality of the MT5 summarizer and the SinBERT classifier
+at each MODEL_PRECISION, measured against fp32.
+
+    python -m benchmarks.precision_eval --samples heldout.jsonl --precisions fp32 int8-dynamic bf16
+
+`--samples` is a JSONL file with one {"text": ...} object per line, a
+held-out set of Sinhala texts. Without it, synthetic texts are built from
+the batching benchmark's sentences. Each precision runs in its own process
+so peak RSS is per mode. Summaries are compared with the fp32 ones by
+whitespace-token ROUGE-1/ROUGE-L F1, which works for Sinhala where
+English-centric ROUGE tokenizers drop the script. Classifications are
+compared by label agreement and mean absolute probability difference.
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+from app.core.config import settings
+from benchmarks.batching_benchmark import make_texts
+
+
+def load_samples(path: str, limit: int, seed: int) -> List[str]:
+    if not path:
+        return make_texts(limit, 300, 3000, seed)
+    with open(path, encoding="utf-8") as file:
+        texts = [json.loads(line)["text"] for line in file if line.strip()]
+    return texts[:limit]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_precision(precision: str, args, texts: List[str]) -> Dict:
+    """Runs in a child process: load both models at `precision` and time them over the samples"""
+    import torch
+
+    from app.api.category.hander import _predict_probabilities
+    from app.services.model_dependencies.bert import _load_sin_bert
+    from app.services.model_dependencies.mt5 import SUMMARY_GENERATION_KWARGS, _load_mt5
+    from app.services.model_dependencies.precision import apply_precision, resolve_precision
+    from app.services.model_dependencies.registry import model_memory_bytes
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    precision = resolve_precision(precision, "cpu")
+    result = {"precision": precision, "summaries": [], "probabilities": [], "summary_seconds": [], "classify_seconds": []}
+
+    model, tokenizer = _load_mt5(args.model_path)
+    model = apply_precision(model.eval(), precision)
+    result["mt5_mb"] = model_memory_bytes(model) / (1024 * 1024)
+    for text in texts:
+        inputs = tokenizer("summarize: " + text, return_tensors="pt", max_length=1024, truncation=True)
+        start = time.perf_counter()
+        with torch.inference_mode():
+            output_ids = model.generate(**inputs, **SUMMARY_GENERATION_KWARGS)
+        result["summary_seconds"].append(time.perf_counter() - start)
+        result["summaries"].append(tokenizer.decode(output_ids[0], skip_special_tokens=True))
+    del model
+
+    if not args.skip_bert:
+        bert, bert_tokenizer, _ = _load_sin_bert(args.bert_path)
+        bert = apply_precision(bert.eval(), precision)
+        result["bert_mb"] = model_memory_bytes(bert) / (1024 * 1024)
+        for text in texts:
+            start = time.perf_counter()
+            probabilities = _predict_probabilities(text, bert, bert_tokenizer)
+            result["classify_seconds"].append(time.perf_counter() - start)
+            result["probabilities"].append(probabilities.tolist())
+
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def _lcs(a: List[str], b: List[str]) -> int:
+    previous = [0] * (len(b) + 1)
+    for token in a:
+        current = [0]
+        for j, other in enumerate(b):
+            current.append(previous[j] + 1 if token == other else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+
+def _f1(overlap: int, candidate: int, reference: int) -> float:
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / candidate, overlap / reference
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge(candidate: str, reference: str) -> Dict[str, float]:
+    cand, ref = candidate.split(), reference.split()
+    if not cand or not ref:
+        return {"rouge1": float(cand == ref), "rougeL": float(cand == ref)}
+    unigrams = sum(min(cand.count(token), ref.count(token)) for token in set(cand))
+    return {"rouge1": _f1(unigrams, len(cand), len(ref)), "rougeL": _f1(_lcs(cand, ref), len(cand), len(ref))}
+
+
+def compare(result: Dict, baseline: Dict) -> Dict[str, float]:
+    scores = [rouge(candidate, reference) for candidate, reference in zip(result["summaries"], baseline["summaries"])]
+    row = {
+        "rouge1": statistics.mean(score["rouge1"] for score in scores),
+        "rougeL": statistics.mean(score["rougeL"] for score in scores),
+        "identical": statistics.mean(c == r for c, r in zip(result["summaries"], baseline["summaries"])),
+    }
+    if result["probabilities"]:
+        pairs = list(zip(result["probabilities"], baseline["probabilities"]))
+        row["label_agreement"] = statistics.mean(
+            max(range(len(p)), key=p.__getitem__) == max(range(len(q)), key=q.__getitem__) for p, q in pairs
+        )
+        row["prob_mae"] = statistics.mean(abs(a - b) for p, q in pairs for a, b in zip(p, q))
+    return row
+
+
+def main(args):
+    texts = load_samples(args.samples, args.limit, args.seed)
+    precisions = ["fp32"] + [precision for precision in args.precisions if precision != "fp32"]
+
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for precision in precisions:
+        with context.Pool(1) as pool:
+            results[precision] = pool.apply(run_precision, (precision, args, texts))
+        print(f"finished {precision}", file=sys.stderr)
+
+    baseline = results["fp32"]
+    print(
+        f"{'precision':>13} {'gen (s)':>8} {'speedup':>8} {'cls (ms)':>9} {'mt5 MB':>8} {'bert MB':>8} "
+        f"{'peak RSS':>9} {'R-1':>6} {'R-L':>6} {'same':>6} {'labels':>7} {'p MAE':>7}"
+    )
+    for precision, result in results.items():
+        row = compare(result, baseline)
+        generation = statistics.mean(result["summary_seconds"])
+        classify = statistics.mean(result["classify_seconds"]) * 1000 if result["classify_seconds"] else 0.0
+        print(
+            f"{result['precision']:>13} {generation:>8.2f} {statistics.mean(baseline['summary_seconds']) / generation:>7.2f}x "
+            f"{classify:>9.1f} {result['mt5_mb']:>8.0f} {result.get('bert_mb', 0):>8.0f} {result['peak_rss_mb']:>9.0f} "
+            f"{row['rouge1']:>6.3f} {row['rougeL']:>6.3f} {row['identical']:>6.2f} "
+            f"{row.get('label_agreement', 0):>7.3f} {row.get('prob_mae', 0):>7.4f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Model precision evaluation against fp32")
+    parser.add_argument("--model-path", default=settings.MODEL_PATH)
+    parser.add_argument("--bert-path", default=settings.MODEL_PATH_SIN_BERT)
+    parser.add_argument("--samples", default="", help="JSONL file of held-out texts")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--precisions", nargs="+", default=["fp32", "int8-dynamic", "bf16"])
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--skip-bert", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    main(parser.parse_args())
@@ -0,0 +1,85 @@
+"""
+Startup cost of the application, broken down by imported module.
+
+    python -m benchmarks.startup_benchmark --runs 5 --top 15
+    python -m benchmarks.startup_benchmark --target app.api.summarize.routes
+
+Each run imports `--target` in a fresh interpreter with `-X importtime`, so
+nothing is cached in `sys.modules`. Reported are the wall time of the import,
+self time summed per top-level package (where the cost actually lands), and
+the cumulative time of each `app.*` module (which of our modules pulls it in).
+Figures are medians across runs.
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """(module, self µs, cumulative µs) for every line of `-X importtime` output"""
+    rows = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            rows.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return rows
+
+
+def run_once(target: str) -> Tuple[float, List[Tuple[str, int, int]]]:
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        tail = "\n".join(line for line in result.stderr.splitlines() if not line.startswith("import time:"))
+        raise SystemExit(f"Importing {target} failed:\n{tail}")
+    return elapsed, parse_importtime(result.stderr)
+
+
+def main(args):
+    walls: List[float] = []
+    per_package: Dict[str, List[int]] = defaultdict(list)
+    per_app_module: Dict[str, List[int]] = defaultdict(list)
+
+    for _ in range(args.runs):
+        elapsed, rows = run_once(args.target)
+        walls.append(elapsed)
+
+        package_self: Dict[str, int] = defaultdict(int)
+        for module, self_us, cumulative_us in rows:
+            package_self[module.split(".")[0]] += self_us
+            if module == "app" or module.startswith("app."):
+                per_app_module[module].append(cumulative_us)
+        for package, total in package_self.items():
+            per_package[package].append(total)
+
+    print(f"import {args.target}: median {statistics.median(walls):.2f}s over {args.runs} runs "
+          f"(min {min(walls):.2f}s, max {max(walls):.2f}s)\n")
+
+    print(f"{'package':>32} {'self (ms)':>10}")
+    packages = sorted(per_package.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for package, values in packages[:args.top]:
+        print(f"{package:>32} {statistics.median(values) / 1000:>10.1f}")
+
+    print(f"\n{'app module':>48} {'cumulative (ms)':>16}")
+    modules = sorted(per_app_module.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for module, values in modules[:args.top]:
+        print(f"{module:>48} {statistics.median(values) / 1000:>16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Application import-time benchmark")
+    parser.add_argument("--target", default="app.main", help="module to import")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="rows per table")
+    main(parser.parse_args())
@@ -0,0 +1,79 @@
+"""
+Production serving: gunicorn managing uvicorn workers that share model weights.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+The master loads every preloadable model once, before forking. Workers inherit
+the weights copy-on-write and never write to them, so N workers cost one copy
+of the weights plus a few hundred MB each of interpreter and activation memory.
+The app itself (Firebase clients, event-loop objects) is still imported per
+worker, since gRPC channels and event loops do not survive a fork. ONNX Runtime
+sessions do not either: their thread pools exist only in the process that
+created them, so with INFERENCE_BACKEND=onnx each worker builds its sessions
+in its own warm-up.
+
+Sizing: each worker runs `INFERENCE_THREADS_PER_WORKER` intra-op torch and
+ONNX Runtime threads, so the default worker count is usable cores // threads
+per worker. Override with WEB_CONCURRENCY. See the Readme for how to size for RAM.
+"""
+import gc
+import logging
+import os
+
+logger = logging.getLogger("gunicorn.error")
+
+
+def usable_cores() -> int:
+    """Cores this process may run on, honouring container CPU sets"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+threads_per_worker = max(1, int(os.getenv("INFERENCE_THREADS_PER_WORKER", "2")))
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", "0")) or max(1, usable_cores() // threads_per_worker)
+
+# Summary streams stay open for the length of a video
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "600"))
+graceful_timeout = 30
+keepalive = 5
+
+
+def on_starting(server):
+    from app.core.config import settings
+    from app.services.model_dependencies import model_registry
+
+    if not settings.PRELOAD_MODELS:
+        return
+    if settings.DEVICE != "cpu":
+        # A CUDA context cannot be inherited across fork; each worker loads its own copy
+        logger.info(f"Device is {settings.DEVICE}; models load per worker instead of in the master")
+        return
+
+    model_registry.load_all(before_fork=True)
+    # Keep the collector from touching inherited objects, which would un-share their pages
+    gc.freeze()
+    loaded = [entry["name"] for entry in model_registry.stats() if entry["loaded"]]
+    logger.info(f"Preloaded models for {workers} workers: {', '.join(loaded)}")
+
+
+def post_fork(server, worker):
+    import torch
+    from app.core.config import settings
+
+    torch.set_num_threads(threads_per_worker)
+    # Sessions are created after this, in the worker's warm-up
+    if settings.ONNX_INTRA_OP_THREADS <= 0:
+        settings.ONNX_INTRA_OP_THREADS = threads_per_worker
+
+
+def child_exit(server, worker):
+    # Drop the exited worker's live gauges (open SSE streams) from the shared metrics directory
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
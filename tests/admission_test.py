@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from app.services.inference.admission import BATCH, INTERACTIVE, AdmissionController, AdmissionRejectedError, priority_for
+
+
+def test_limits_concurrent_executions():
+    controller = AdmissionController("m", max_concurrency=2, max_queue_wait=5)
+    running = []
+    peak = []
+
+    async def work():
+        async with controller.admit():
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+
+    async def run():
+        await asyncio.gather(*(work() for _ in range(6)))
+
+    asyncio.run(run())
+
+    assert max(peak) == 2
+    assert controller.stats()["admitted"] == 6 and controller.active == 0
+
+
+def test_freed_slots_are_shared_by_weight_between_classes():
+    controller = AdmissionController("m", max_concurrency=1, max_queue_wait=60, weights={INTERACTIVE: 3, BATCH: 1})
+    order = []
+
+    async def work(priority, tag):
+        async with controller.admit(priority):
+            order.append(tag)
+            await asyncio.sleep(0)
+
+    async def run():
+        await controller.acquire()
+        tasks = [asyncio.create_task(work(BATCH, f"b{i}")) for i in range(4)]
+        tasks += [asyncio.create_task(work(INTERACTIVE, f"i{i}")) for i in range(4)]
+        await asyncio.sleep(0)
+        controller.release()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+
+    assert order[:4] == ["i0", "i1", "i2", "b0"]
+    assert sorted(order) == sorted([f"b{i}" for i in range(4)] + [f"i{i}" for i in range(4)])
+
+
+def test_sheds_with_retry_after_when_estimated_wait_exceeds_slo():
+    controller = AdmissionController("m", max_concurrency=1, max_queue_wait=1, initial_service_time=2)
+
+    async def run():
+        await controller.acquire()
+        with pytest.raises(AdmissionRejectedError) as error:
+            await controller.acquire(BATCH)
+        controller.release()
+        return error.value
+
+    error = asyncio.run(run())
+
+    assert error.retry_after == 2 and error.retry_after_header == "2"
+    assert controller.stats()["rejected"] == 1
+
+
+def test_waiter_past_its_deadline_is_rejected_and_leaves_the_queue():
+    controller = AdmissionController("m", max_concurrency=1, max_queue_wait=0.05, initial_service_time=0.01)
+
+    async def run():
+        await controller.acquire()
+        with pytest.raises(AdmissionRejectedError):
+            await controller.acquire()
+        controller.release()
+
+    asyncio.run(run())
+
+    assert controller.queued == 0 and controller.active == 0
+    assert controller.stats()["timed_out"] == 1
+
+
+def test_cancelled_waiter_does_not_leak_its_slot():
+    controller = AdmissionController("m", max_concurrency=1, max_queue_wait=5)
+
+    async def run():
+        await controller.acquire()
+        waiter = asyncio.create_task(controller.acquire(shed=False))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        controller.release()
+
+    asyncio.run(run())
+
+    assert controller.queued == 0 and controller.active == 0
+
+
+def test_limit_shrinks_as_requests_slow_down_and_recovers():
+    now = [0.0]
+    controller = AdmissionController("m", max_concurrency=8, max_queue_wait=60, initial_service_time=0.1, clock=lambda: now[0])
+
+    async def execute(seconds):
+        async with controller.admit():
+            now[0] += seconds
+
+    async def run(seconds, count):
+        for _ in range(count):
+            await execute(seconds)
+        return controller.limit
+
+    fast = asyncio.run(run(0.1, 10))
+    slow = asyncio.run(run(0.4, 5))
+    recovered = asyncio.run(run(0.1, 20))
+
+    assert fast == 8
+    assert 1 <= slow < 4
+    assert recovered == 8
+
+
+def test_lower_limit_holds_back_waiters_until_enough_slots_free():
+    controller = AdmissionController("m", max_concurrency=4, max_queue_wait=60, min_concurrency=2)
+
+    async def run():
+        for _ in range(4):
+            await controller.acquire()
+        waiter = asyncio.create_task(controller.acquire(shed=False))
+        await asyncio.sleep(0)
+        controller.baseline_service_time, controller.service_time = 1.0, 2.0
+        controller.release()
+        controller.release()
+        await asyncio.sleep(0)
+        held = not waiter.done()
+        controller.release()
+        await waiter
+        return held
+
+    assert asyncio.run(run())
+    assert controller.limit == 2 and controller.active == 2
+
+
+def test_api_key_callers_are_batch_traffic():
+    assert priority_for({"api_key": "sk_x", "uid": "u"}) == BATCH
+    assert priority_for(object()) == INTERACTIVE
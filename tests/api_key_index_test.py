@@ -0,0 +1,54 @@
+import asyncio
+
+from app.services.cache.api_key_index import ApiKeyIndex
+
+
+class FakeKeyStore:
+    def __init__(self, keys):
+        self.keys = keys
+        self.queries = 0
+
+    async def lookup(self, key):
+        self.queries += 1
+        await asyncio.sleep(0.01)
+        return self.keys.get(key)
+
+
+def test_known_and_unknown_keys_are_cached():
+    store = FakeKeyStore({"sk_valid": "user-1"})
+    index = ApiKeyIndex(max_entries=10, ttl_seconds=60, negative_ttl_seconds=60)
+
+    async def run():
+        return [await index.resolve(key, store.lookup) for key in ["sk_valid", "sk_bogus"] * 3]
+
+    assert asyncio.run(run()) == ["user-1", None] * 3
+    assert store.queries == 2
+    assert index.stats()["hits"] == 2 and index.stats()["negative_hits"] == 2
+
+
+def test_concurrent_lookups_share_one_query():
+    store = FakeKeyStore({"sk_valid": "user-1"})
+    index = ApiKeyIndex(max_entries=10, ttl_seconds=60, negative_ttl_seconds=60)
+
+    async def run():
+        return await asyncio.gather(*(index.resolve("sk_valid", store.lookup) for _ in range(20)))
+
+    assert asyncio.run(run()) == ["user-1"] * 20
+    assert store.queries == 1
+
+
+def test_invalidation_takes_effect_immediately():
+    store = FakeKeyStore({})
+    index = ApiKeyIndex(max_entries=10, ttl_seconds=60, negative_ttl_seconds=60)
+
+    async def run():
+        before = await index.resolve("sk_new", store.lookup)
+        store.keys["sk_new"] = "user-1"
+        index.invalidate_key("sk_new")
+        created = await index.resolve("sk_new", store.lookup)
+        del store.keys["sk_new"]
+        index.invalidate_key("sk_new")
+        revoked = await index.resolve("sk_new", store.lookup)
+        return before, created, revoked
+
+    assert asyncio.run(run()) == (None, "user-1", None)
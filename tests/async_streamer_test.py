@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services.inference.streamer import AsyncTextStreamer
+
+
+def test_text_from_the_generation_thread_reaches_the_loop_in_order():
+    async def run():
+        streamer = AsyncTextStreamer()
+
+        def generate():
+            for word in ["one ", "two ", "three "]:
+                streamer.push_text(word)
+            streamer.end()
+
+        threading.Thread(target=generate).start()
+        return [text async for text in streamer]
+
+    assert asyncio.run(run()) == ["one ", "two ", "three "]
+
+
+def test_batches_group_pieces_that_already_arrived():
+    async def run():
+        streamer = AsyncTextStreamer()
+        for i in range(5):
+            streamer.push_text(f"t{i} ")
+        streamer.push_text("", stream_end=True)
+        await asyncio.sleep(0)
+        return [batch async for batch in streamer.batches(max_items=3)]
+
+    assert asyncio.run(run()) == [["t0 ", "t1 ", "t2 "], ["t3 ", "t4 "]]
+
+
+def test_loop_stays_responsive_while_waiting_for_tokens():
+    ticks = []
+
+    async def collect(streamer):
+        return [text async for text in streamer]
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(1)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        streamer = AsyncTextStreamer()
+
+        def generate():
+            time.sleep(0.1)
+            streamer.push_text("done ", stream_end=True)
+
+        threading.Thread(target=generate).start()
+        texts, _ = await asyncio.gather(collect(streamer), ticker())
+        return texts
+
+    assert asyncio.run(run()) == ["done "]
+    # The ticker finished while the stream was still waiting on the generation thread
+    assert len(ticks) == 5
+
+
+def test_generation_error_is_raised_to_the_consumer():
+    async def run():
+        streamer = AsyncTextStreamer()
+
+        def generate():
+            streamer.push_text("partial ")
+            streamer.fail(RuntimeError("out of memory"))
+
+        threading.Thread(target=generate).start()
+        async for _ in streamer.batches():
+            pass
+
+    with pytest.raises(RuntimeError, match="out of memory"):
+        asyncio.run(run())
@@ -0,0 +1,57 @@
+from app.services.cache.disk import DiskCache
+from app.services.cache.lru import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_lru_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = LRUCache(max_entries=10, ttl_seconds=60, clock=clock)
+    cache.set("a", "value")
+
+    clock.now += 59
+    assert cache.get("a") == "value"
+
+    clock.now += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_disk_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    DiskCache(path).set("key", "සාරාංශය")
+
+    assert DiskCache(path).get("key") == "සාරාංශය"
+
+
+def test_disk_cache_honours_ttl_and_size_limit(tmp_path):
+    clock = FakeClock()
+    cache = DiskCache(str(tmp_path / "cache.sqlite"), ttl_seconds=60, max_bytes=10, clock=clock)
+
+    cache.set("old", "12345")
+    clock.now += 1
+    cache.set("new", "123456")
+    assert cache.get("old") is None
+    assert cache.get("new") == "123456"
+
+    clock.now += 61
+    assert cache.get("new") is None
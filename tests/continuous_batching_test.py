@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+
+transformers = pytest.importorskip("transformers")
+torch = pytest.importorskip("torch")
+
+from app.services.inference.continuous import ContinuousBatchingEngine
+
+
+class FakeEncoding(dict):
+    def to(self, device):
+        return self
+
+
+class FakeTokenizer:
+    """Characters to ids, right-padded like the real tokenizer"""
+
+    def __call__(self, prompts, max_length=1024, **kwargs):
+        ids = [[3 + ord(char) % 60 for char in prompt][:max_length - 1] + [1] for prompt in prompts]
+        length = max(map(len, ids))
+        return FakeEncoding(
+            input_ids=torch.tensor([row + [0] * (length - len(row)) for row in ids]),
+            attention_mask=torch.tensor([[1] * len(row) + [0] * (length - len(row)) for row in ids]),
+        )
+
+    def decode(self, ids, skip_special_tokens=True):
+        return " ".join(map(str, ids))
+
+
+PROMPTS = ["hello world", "a much longer prompt with many more characters in it", "xyz", "mid length one", "q"]
+
+
+@pytest.fixture(scope="module")
+def model():
+    torch.manual_seed(0)
+    config = transformers.MT5Config(
+        vocab_size=64, d_model=32, d_kv=8, d_ff=64, num_layers=2, num_decoder_layers=2, num_heads=4,
+        decoder_start_token_id=0, eos_token_id=1, pad_token_id=0,
+    )
+    return transformers.MT5ForConditionalGeneration(config).eval()
+
+
+def reference(model, prompt):
+    encoded = FakeTokenizer()([prompt])
+    with torch.inference_mode():
+        output = model.generate(
+            **encoded, max_length=30, min_length=5, num_beams=1, do_sample=False,
+        )
+    return output[0].tolist()
+
+
+def test_staggered_streams_match_generate(model):
+    engine = ContinuousBatchingEngine(model, FakeTokenizer(), max_batch_size=4, max_length=30, min_length=5)
+
+    async def run():
+        futures = []
+        for i, prompt in enumerate(PROMPTS):
+            futures.append(engine.submit(prompt))
+            # Later prompts join a batch that is already decoding
+            await asyncio.sleep(0.005 * i)
+        return await asyncio.gather(*futures)
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        engine.close()
+
+    assert results == [reference(model, prompt) for prompt in PROMPTS]
+    stats = engine.stats()
+    assert stats["completed"] == len(PROMPTS) and stats["active"] == 0
+
+
+def test_streamer_receives_tokens_then_end(model):
+    engine = ContinuousBatchingEngine(model, FakeTokenizer(), max_batch_size=2, max_length=12)
+
+    class Recorder:
+        def __init__(self):
+            self.tokens = []
+            self.ended = False
+
+        def put(self, value):
+            self.tokens.extend(value.tolist())
+
+        def end(self):
+            self.ended = True
+
+    recorder = Recorder()
+
+    async def run():
+        return await engine.submit("hello", streamer=recorder)
+
+    try:
+        result = asyncio.run(run())
+    finally:
+        engine.close()
+
+    assert recorder.ended and recorder.tokens == result
+
+
+def test_cancelled_stream_leaves_the_batch(model):
+    engine = ContinuousBatchingEngine(model, FakeTokenizer(), max_batch_size=2, max_length=200, min_length=200)
+
+    class Recorder:
+        def __init__(self):
+            self.tokens = []
+            self.ended = False
+
+        def put(self, value):
+            self.tokens.extend(value.tolist())
+
+        def end(self):
+            self.ended = True
+
+    abandoned = Recorder()
+
+    async def run():
+        kept = engine.submit("hello world")
+        dropped = engine.submit("xyz", streamer=abandoned)
+        while len(abandoned.tokens) < 3:
+            await asyncio.sleep(0.001)
+        dropped.cancel()
+        return await kept
+
+    try:
+        result = asyncio.run(run())
+        stats = engine.stats()
+    finally:
+        engine.close()
+
+    assert len(result) == 200
+    assert abandoned.ended and len(abandoned.tokens) < 200
+    assert stats["cancelled"] == 1 and stats["completed"] == 1
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from google.cloud.firestore_v1 import ArrayUnion
+
+from app.services.firebase.firestore import Firestore
+from app.services.firebase.memory import InMemoryFirestoreClient
+
+
+def make_store():
+    client = InMemoryFirestoreClient()
+    return client, Firestore("sessions", client=client, coalesce_ms=10)
+
+
+def test_update_of_missing_document_is_404_without_a_read():
+    client, store = make_store()
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(store.update("missing", {"status": "done"}))
+
+    assert error.value.status_code == 404
+    assert client.rpc_count == 1
+
+
+def test_delete_of_missing_document_is_404():
+    _, store = make_store()
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(store.delete("missing"))
+
+    assert error.value.status_code == 404
+
+
+def test_coalesced_updates_share_one_batched_write():
+    client, store = make_store()
+
+    async def run():
+        first = await store.create({"uid": "a", "summary": []})
+        second = await store.create({"uid": "b", "summary": []})
+        rpcs_before = client.rpc_count
+        await asyncio.gather(
+            store.update(first, {"summary": ArrayUnion(["p1"])}, coalesce=True),
+            store.update(first, {"summary": ArrayUnion(["p2"]), "status": "done"}, coalesce=True),
+            store.update(second, {"summary": ArrayUnion(["q1"])}, coalesce=True),
+        )
+        return client.rpc_count - rpcs_before, await store.get_by_id(first), await store.get_by_id(second)
+
+    rpcs, first, second = asyncio.run(run())
+
+    assert rpcs == 1
+    assert first["summary"] == ["p1", "p2"] and first["status"] == "done"
+    assert second["summary"] == ["q1"]
+
+
+def test_failed_batch_only_fails_the_missing_document():
+    _, store = make_store()
+
+    async def run():
+        doc_id = await store.create({"summary": []})
+        results = await asyncio.gather(
+            store.update(doc_id, {"summary": ArrayUnion(["p1"])}, coalesce=True),
+            store.update("missing", {"summary": ArrayUnion(["x"])}, coalesce=True),
+            return_exceptions=True,
+        )
+        return results, await store.get_by_id(doc_id)
+
+    (ok, missing), document = asyncio.run(run())
+
+    assert not isinstance(ok, Exception)
+    assert isinstance(missing, HTTPException) and missing.status_code == 404
+    assert document["summary"] == ["p1"]
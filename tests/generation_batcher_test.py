@@ -0,0 +1,55 @@
+import asyncio
+
+from app.services.inference.batcher import GenerationBatcher
+
+
+class FakeEncoding(dict):
+    def to(self, device):
+        return self
+
+
+class FakeTokenizer:
+    def __call__(self, prompts, **kwargs):
+        return FakeEncoding(input_ids=list(prompts), attention_mask=[1] * len(prompts))
+
+    def batch_decode(self, output_ids, skip_special_tokens=True):
+        return [f"summary of {prompt}" for prompt in output_ids]
+
+
+class FakeModel:
+    device = "cpu"
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def generate(self, input_ids, attention_mask, **kwargs):
+        self.batch_sizes.append(len(input_ids))
+        return input_ids
+
+
+def test_concurrent_requests_share_one_generate_call():
+    model = FakeModel()
+    batcher = GenerationBatcher(model, FakeTokenizer(), max_batch_size=8, max_wait_ms=50)
+
+    async def run():
+        results = await asyncio.gather(*(batcher.submit(f"text {i}") for i in range(5)))
+        await batcher.close()
+        return results
+
+    results = asyncio.run(run())
+
+    assert results == [f"summary of text {i}" for i in range(5)]
+    assert model.batch_sizes == [5]
+
+
+def test_batches_are_capped_at_max_batch_size():
+    model = FakeModel()
+    batcher = GenerationBatcher(model, FakeTokenizer(), max_batch_size=4, max_wait_ms=50)
+
+    async def run():
+        await asyncio.gather(*(batcher.submit(f"text {i}") for i in range(10)))
+        await batcher.close()
+
+    asyncio.run(run())
+
+    assert model.batch_sizes == [4, 4, 2]
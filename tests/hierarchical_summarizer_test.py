@@ -0,0 +1,113 @@
+import asyncio
+
+from app.services.cache.summary_cache import SummaryCache
+from app.services.summarizer.hierarchical import HierarchicalSummarizer
+
+
+class WordTokenizer:
+    def encode(self, text, add_special_tokens=True):
+        return text.split() + (["</s>"] if add_special_tokens else [])
+
+
+class FakeBatcher:
+    """Summarizes a prompt to its first two words and records which prompts were in flight together"""
+
+    model_id = "fake-mt5"
+    generation_kwargs = {"num_beams": 4}
+
+    def __init__(self, max_input_length=12, max_batch_size=8):
+        self.tokenizer = WordTokenizer()
+        self.max_input_length = max_input_length
+        self.max_batch_size = max_batch_size
+        self.prompts = []
+        self.rounds = []
+        self._in_flight = []
+
+    async def submit(self, prompt):
+        self.prompts.append(prompt)
+        self._in_flight.append(prompt)
+        await asyncio.sleep(0)
+        if self._in_flight:
+            self.rounds.append(len(self._in_flight))
+            self._in_flight = []
+        words = prompt.split()[1:]
+        return " ".join(words[:2])
+
+
+def sentences(count):
+    return " ".join(f"s{i}a s{i}b s{i}c." for i in range(count))
+
+
+def test_windows_keep_whole_sentences_within_the_budget():
+    summarizer = HierarchicalSummarizer(FakeBatcher(max_input_length=12), cache=None)
+
+    windows = summarizer.split(sentences(7))
+
+    # Budget is 12 less "summarize:" and EOS; each sentence is three words
+    assert windows == [sentences(7).split(" s3a")[0], "s3a s3b s3c. s4a s4b s4c. s5a s5b s5c.", "s6a s6b s6c."]
+    assert all(len(window.split()) <= 10 for window in windows)
+
+
+def test_windows_are_summarized_together_then_reduced():
+    batcher = FakeBatcher(max_input_length=12)
+    summarizer = HierarchicalSummarizer(batcher, cache=None)
+
+    summary = asyncio.run(summarizer.summarize(sentences(7)))
+
+    assert batcher.rounds == [3, 1]
+    assert batcher.prompts[-1] == "summarize: s0a s0b s3a s3b s6a s6b"
+    assert summary == "s0a s0b"
+
+
+def test_windows_are_submitted_in_waves_of_the_batch_size():
+    batcher = FakeBatcher(max_input_length=12, max_batch_size=2)
+    summarizer = HierarchicalSummarizer(batcher, cache=None)
+
+    asyncio.run(summarizer.summarize(sentences(7)))
+
+    assert max(batcher.rounds) == 2
+    assert batcher.rounds[0] == 2
+
+
+def test_no_warning_when_the_last_round_reduces_to_one_window(caplog):
+    summarizer = HierarchicalSummarizer(FakeBatcher(max_input_length=12), cache=None, max_rounds=1)
+
+    summary = asyncio.run(summarizer.summarize(sentences(7)))
+
+    assert summary == "s0a s0b"
+    assert "still span" not in caplog.text
+
+
+def test_text_that_fits_is_one_generation():
+    batcher = FakeBatcher(max_input_length=1024)
+    summarizer = HierarchicalSummarizer(batcher, cache=None)
+
+    asyncio.run(summarizer.summarize(sentences(5)))
+
+    assert batcher.prompts == ["summarize: " + sentences(5)]
+
+
+def test_partial_summaries_are_cached():
+    batcher = FakeBatcher(max_input_length=12)
+    summarizer = HierarchicalSummarizer(batcher, cache=SummaryCache(max_entries=100))
+
+    async def run():
+        await summarizer.summarize(sentences(7))
+        first = len(batcher.prompts)
+        # Only the changed last window is generated; its partial is unchanged, so the reduce is cached too
+        await summarizer.summarize(sentences(7) + " x1 x2 x3.")
+        return first, len(batcher.prompts) - first
+
+    first, second = asyncio.run(run())
+
+    assert first == 4
+    assert second == 1
+
+
+def test_sentence_longer_than_the_budget_is_split_at_words():
+    summarizer = HierarchicalSummarizer(FakeBatcher(max_input_length=12), cache=None)
+
+    windows = summarizer.split(" ".join(f"w{i}" for i in range(25)))
+
+    assert all(len(window.split()) <= 10 for window in windows)
+    assert " ".join(windows).split() == [f"w{i}" for i in range(25)]
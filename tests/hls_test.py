@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from app.services.youtube_handler.hls import parse_playlist
+
+
+MEDIA_PLAYLIST = """#EXTM3U
+#EXT-X-VERSION:3
+#EXT-X-TARGETDURATION:5
+#EXT-X-MEDIA-SEQUENCE:40
+#EXT-X-PROGRAM-DATE-TIME:2025-01-01T00:00:00.000Z
+#EXTINF:5.0,
+seg40.ts
+#EXTINF:4.5,
+https://cdn.example.com/seg41.ts
+"""
+
+MASTER_PLAYLIST = """#EXTM3U
+#EXT-X-STREAM-INF:BANDWIDTH=1280000,CODECS="avc1.4d401f,mp4a.40.2"
+high/index.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=64000,CODECS="mp4a.40.2"
+audio/index.m3u8
+"""
+
+
+def test_media_playlist_segments_are_numbered_and_resolved():
+    playlist = parse_playlist(MEDIA_PLAYLIST, "https://example.com/live/index.m3u8")
+
+    assert not playlist.is_master and not playlist.ended
+    assert playlist.target_duration == 5
+    assert [segment.sequence for segment in playlist.segments] == [40, 41]
+    assert [segment.uri for segment in playlist.segments] == [
+        "https://example.com/live/seg40.ts",
+        "https://cdn.example.com/seg41.ts",
+    ]
+    assert playlist.segments[1].program_date_time - playlist.segments[0].program_date_time == 5.0
+
+
+def test_master_playlist_picks_lowest_bandwidth_variant():
+    playlist = parse_playlist(MASTER_PLAYLIST, "https://example.com/master.m3u8")
+
+    assert playlist.is_master
+    assert playlist.audio_variant().uri == "https://example.com/audio/index.m3u8"
+
+
+def test_live_segments_fetches_each_new_segment_once():
+    pytest.importorskip("yt_dlp")
+    web = pytest.importorskip("aiohttp.web")
+    from app.services.youtube_handler.youtube_handler import YouTubeAudioProcessor
+
+    total_segments = 6
+    state = {"published": 2, "segment_requests": []}
+
+    async def playlist(request):
+        # Each reload publishes one more segment, until the stream ends
+        lines = ["#EXTM3U", "#EXT-X-TARGETDURATION:1", "#EXT-X-MEDIA-SEQUENCE:0"]
+        for sequence in range(state["published"]):
+            lines += ["#EXTINF:1.0,", f"seg{sequence}.ts"]
+        if state["published"] >= total_segments:
+            lines.append("#EXT-X-ENDLIST")
+        state["published"] = min(state["published"] + 1, total_segments)
+        return web.Response(text="\n".join(lines))
+
+    async def segment(request):
+        name = request.match_info["name"]
+        state["segment_requests"].append(name)
+        return web.Response(body=name.encode())
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/live/index.m3u8", playlist)
+        app.router.add_get("/live/{name}", segment)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+
+        processor = YouTubeAudioProcessor()
+        processor.live_refresh_interval = 0.01
+        processor.live_edge_segments = 2
+
+        import aiohttp
+        try:
+            async with aiohttp.ClientSession() as session:
+                return [
+                    data async for _, _, data in
+                    processor._live_segments(session, f"http://127.0.0.1:{port}/live/index.m3u8")
+                ]
+        finally:
+            await runner.cleanup()
+
+    received = asyncio.run(run())
+
+    assert received == [f"seg{sequence}.ts".encode() for sequence in range(total_segments)]
+    assert state["segment_requests"] == [f"seg{sequence}.ts" for sequence in range(total_segments)]
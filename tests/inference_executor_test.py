@@ -0,0 +1,90 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services.inference.executor import InferenceExecutor, InferenceQueueFullError
+
+
+def test_work_over_the_queue_limit_is_rejected():
+    executor = InferenceExecutor(max_workers=1, max_queue_size=1)
+    release = threading.Event()
+
+    async def run():
+        running = executor.submit(release.wait)
+        while executor.running == 0:
+            await asyncio.sleep(0.001)
+        queued = executor.submit(lambda: "queued")
+
+        with pytest.raises(InferenceQueueFullError) as rejected:
+            executor.submit(lambda: "rejected")
+
+        release.set()
+        return rejected.value, await running, await queued
+
+    try:
+        error, running_result, queued_result = asyncio.run(run())
+    finally:
+        executor.shutdown()
+
+    assert running_result is True and queued_result == "queued"
+    assert error.retry_after_header == "1"
+    assert executor.rejected == 1
+
+
+def test_cancelled_calls_leave_the_queue():
+    executor = InferenceExecutor(max_workers=1, max_queue_size=2)
+    release = threading.Event()
+    calls = []
+
+    async def run():
+        running = executor.submit(release.wait)
+        while executor.running == 0:
+            await asyncio.sleep(0.001)
+        waiting = executor.submit(calls.append, "cancelled")
+        assert executor.queued == 1
+
+        waiting.cancel()
+        await asyncio.sleep(0)
+        queued_after_cancel = executor.queued
+
+        # The freed slot takes new work again
+        accepted = executor.submit(lambda: "accepted")
+        release.set()
+        return queued_after_cancel, await running, await accepted
+
+    try:
+        queued_after_cancel, _, accepted = asyncio.run(run())
+    finally:
+        executor.shutdown()
+
+    assert queued_after_cancel == 0
+    assert accepted == "accepted"
+    assert calls == []
+    assert executor.queued == 0
+
+
+def test_stats_count_completed_and_failed_calls():
+    executor = InferenceExecutor(max_workers=2, max_queue_size=4)
+
+    def fail():
+        raise ValueError("bad input")
+
+    async def run():
+        assert await executor.run(lambda x: x * 2, 21) == 42
+        with pytest.raises(ValueError):
+            await executor.run(fail)
+
+    try:
+        asyncio.run(run())
+        stats = executor.stats()
+    finally:
+        executor.shutdown()
+
+    assert stats["workers"] == 2
+    assert stats["submitted"] == 2
+    assert stats["completed"] == 1
+    assert stats["failed"] == 1
+    assert stats["rejected"] == 0
+    assert stats["queue_depth"] == 0 and stats["running"] == 0
+    assert stats["avg_run_ms"] >= 0
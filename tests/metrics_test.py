@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from prometheus_client import REGISTRY
+
+from app.services.metrics import MetricsMiddleware, observe_stage, render_metrics
+from app.services.metrics.prometheus import SSE_STREAMS_IN_FLIGHT
+
+
+def get(app, path):
+    """Drive one GET through the ASGI app and return the response body"""
+    messages = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        # The client stays connected until the response is complete
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "client": ("test", 1), "server": ("test", 80),
+    }
+    asyncio.run(app(scope, receive, send))
+    return b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body").decode()
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def make_app(observed):
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str):
+        return {"id": item_id}
+
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            observed.append(SSE_STREAMS_IN_FLIGHT.labels("/stream")._value.get())
+            yield "data: one\n\n"
+            await asyncio.sleep(0)
+            yield "data: two\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def test_latency_is_labelled_by_route_template_and_streams_are_counted():
+    observed = []
+    app = make_app(observed)
+    before = sample("sumsup_http_request_duration_seconds_count", method="GET", route="/items/{item_id}", status="200")
+
+    get(app, "/items/a")
+    get(app, "/items/b")
+    body = get(app, "/stream")
+
+    after = sample("sumsup_http_request_duration_seconds_count", method="GET", route="/items/{item_id}", status="200")
+    assert after - before == 2
+    assert "data: two" in body
+    # The gauge counted the stream while it was open and released it afterwards
+    assert observed and observed[0] >= 1
+    assert SSE_STREAMS_IN_FLIGHT.labels("/stream")._value.get() == observed[0] - 1
+
+
+def test_exposition_includes_stage_timings_and_service_stats():
+    with observe_stage("unit_test"):
+        pass
+
+    payload, content_type = render_metrics()
+    text = payload.decode()
+
+    assert content_type.startswith("text/plain")
+    assert 'sumsup_stage_duration_seconds_count{stage="unit_test"}' in text
+    assert "sumsup_inference_queue_depth" in text
+    assert 'sumsup_cache_hit_ratio{cache="summary"}' in text
@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+
+from app.services.model_dependencies.bert import SIN_BERT_MODEL
+from app.services.model_dependencies.mt5 import MT5_MODEL, MT5_WITH_CATEGORY_MODEL
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_package_import_registers_every_preloadable_model():
+    # gunicorn's master imports only the package before load_all(); anything missing loads once per worker.
+    # A fresh interpreter, since this module already imported bert and mt5 directly
+    script = (
+        "from app.services.model_dependencies import model_registry\n"
+        "print(' '.join(model_registry.names()))\n"
+        "print(' '.join(model_registry.pending_preloads()))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+    names, pending = output[-2].split(), output[-1].split()
+
+    assert {MT5_MODEL, MT5_WITH_CATEGORY_MODEL, SIN_BERT_MODEL} <= set(names)
+    assert SIN_BERT_MODEL in pending
+
+
+def test_models_that_cannot_cross_a_fork_load_in_the_worker():
+    from app.services.model_dependencies.registry import ModelRegistry
+
+    registry = ModelRegistry()
+    registry.register("weights", lambda: ("weights",))
+    registry.register("session", lambda: ("session",), fork_safe=False)
+
+    registry.load_all(before_fork=True)
+    assert registry.pending_preloads() == ["session"]
+
+    registry.load_all()
+    assert registry.pending_preloads() == []
+
+
+def test_onnx_cache_identity_follows_the_export(tmp_path, monkeypatch):
+    from app.core.config import settings
+    from app.services.model_dependencies.onnx_backend import EXPORT_INFO_FILE, onnx_model_id
+
+    monkeypatch.setattr(settings, "ONNX_MODEL_DIR", str(tmp_path))
+    export = tmp_path / MT5_MODEL
+    export.mkdir()
+    (export / "encoder_model.onnx").write_bytes(b"fp32 graph")
+    unlabelled = onnx_model_id(MT5_MODEL)
+
+    # A re-export into the same directory with different graphs is a different model
+    (export / "encoder_model.onnx").write_bytes(b"int8 graph")
+    assert onnx_model_id(MT5_MODEL) != unlabelled
+
+    (export / EXPORT_INFO_FILE).write_text('{"precision": "int8-dynamic"}')
+    assert onnx_model_id(MT5_MODEL) == f"{export}@int8-dynamic"
@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+pytest.importorskip("optimum.onnxruntime")
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+from app.services.model_dependencies.mt5 import SUMMARY_GENERATION_KWARGS
+from app.services.model_dependencies.onnx_backend import (
+    CLASSIFICATION_TASK,
+    SEQ2SEQ_TASK,
+    export_model,
+    load_classifier,
+    load_seq2seq,
+)
+
+
+@pytest.fixture(scope="module")
+def mt5_dir(tmp_path_factory):
+    torch.manual_seed(0)
+    config = transformers.MT5Config(
+        vocab_size=64, d_model=32, d_kv=8, d_ff=64, num_layers=2, num_decoder_layers=2, num_heads=4,
+        decoder_start_token_id=0, eos_token_id=1, pad_token_id=0,
+    )
+    path = tmp_path_factory.mktemp("mt5")
+    transformers.MT5ForConditionalGeneration(config).eval().save_pretrained(path)
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def bert_dir(tmp_path_factory):
+    torch.manual_seed(0)
+    config = transformers.BertConfig(
+        vocab_size=64, hidden_size=32, num_hidden_layers=2, num_attention_heads=4, intermediate_size=64, num_labels=3,
+    )
+    path = tmp_path_factory.mktemp("bert")
+    transformers.BertForSequenceClassification(config).eval().save_pretrained(path)
+    return str(path)
+
+
+def padded_batch():
+    input_ids = torch.tensor([[5, 6, 7, 8, 9, 1], [10, 11, 1, 0, 0, 0]])
+    return {"input_ids": input_ids, "attention_mask": (input_ids != 0).long()}
+
+
+def test_exported_summarizer_generates_what_pytorch_generates(mt5_dir, tmp_path):
+    export_model(mt5_dir, str(tmp_path), SEQ2SEQ_TASK)
+    reference = transformers.MT5ForConditionalGeneration.from_pretrained(mt5_dir).eval()
+    onnx_model = load_seq2seq(str(tmp_path))
+
+    with torch.inference_mode():
+        expected = reference.generate(**padded_batch(), **SUMMARY_GENERATION_KWARGS)
+        actual = onnx_model.generate(**padded_batch(), **SUMMARY_GENERATION_KWARGS)
+
+    assert actual.tolist() == expected.tolist()
+
+
+def test_exported_classifier_matches_pytorch_logits(bert_dir, tmp_path):
+    export_model(bert_dir, str(tmp_path), CLASSIFICATION_TASK)
+    reference = transformers.BertForSequenceClassification.from_pretrained(bert_dir).eval()
+    onnx_model = load_classifier(str(tmp_path))
+
+    with torch.inference_mode():
+        expected = reference(**padded_batch()).logits
+        actual = onnx_model(**padded_batch()).logits
+
+    assert torch.allclose(actual, expected, atol=1e-5)
+
+
+def test_quantized_export_is_smaller_and_still_runs(bert_dir, tmp_path):
+    full, quantized = tmp_path / "full", tmp_path / "int8"
+    graphs = export_model(bert_dir, str(full), CLASSIFICATION_TASK)
+    export_model(bert_dir, str(quantized), CLASSIFICATION_TASK, quantize=True)
+
+    for graph in graphs:
+        assert os.path.getsize(quantized / graph) < os.path.getsize(full / graph)
+    logits = load_classifier(str(quantized))(**padded_batch()).logits
+    assert logits.shape == (2, 3)
@@ -0,0 +1,37 @@
+from app.services.youtube_handler.pcm_stream import AudioFormat, PcmChunk, PcmChunker
+
+
+def test_chunker_slices_stream_into_fixed_windows():
+    chunker = PcmChunker(chunk_bytes=8)
+    stream = bytes(range(20))
+
+    windows = []
+    for start in range(0, len(stream), 3):
+        windows.extend(chunker.feed(stream[start:start + 3]))
+    tail = chunker.flush()
+
+    assert [bytes(window) for window in windows] == [stream[0:8], stream[8:16]]
+    assert bytes(tail) == stream[16:20]
+    assert chunker.flush() is None
+
+
+def test_finished_windows_are_not_overwritten_by_later_input():
+    chunker = PcmChunker(chunk_bytes=4)
+
+    first = chunker.feed(b"abcdef")
+    chunker.feed(b"ghij")
+
+    assert bytes(first[0]) == b"abcd"
+
+
+def test_chunk_duration_from_byte_length():
+    chunk = PcmChunk(memoryview(bytearray(16000 * 2 * 2)), sample_rate=16000, channels=2)
+
+    assert chunk.duration_seconds == 1.0
+
+
+def test_chunk_reports_its_audio_format():
+    chunk = PcmChunk(memoryview(bytearray(32)), sample_rate=16000, channels=1)
+
+    assert chunk.format == AudioFormat(sample_rate=16000, channels=1)
+    assert chunk.format != AudioFormat(sample_rate=44100, channels=2)
@@ -0,0 +1,67 @@
+import pytest
+
+from app.services.model_dependencies.precision import BF16, FP32, INT8_DYNAMIC, resolve_precision
+
+
+def test_unknown_precision_is_rejected():
+    with pytest.raises(ValueError):
+        resolve_precision("fp8", "cpu")
+
+
+def test_int8_falls_back_to_fp32_off_cpu():
+    assert resolve_precision(INT8_DYNAMIC, "cpu") == INT8_DYNAMIC
+    assert resolve_precision(INT8_DYNAMIC, "cuda") == FP32
+    assert resolve_precision(None, "cpu") == FP32
+
+
+def test_registry_loads_models_at_their_precision():
+    torch = pytest.importorskip("torch")
+    pytest.importorskip("torch.ao.quantization")
+    from app.services.model_dependencies.registry import ModelRegistry
+
+    class Model(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.proj = torch.nn.Linear(64, 64)
+
+        @property
+        def device(self):
+            return next(self.parameters(), torch.empty(0)).device
+
+        def forward(self, x):
+            return self.proj(x)
+
+    registry = ModelRegistry()
+    for precision in (FP32, INT8_DYNAMIC, BF16):
+        registry.register(precision, lambda: (Model(), "tokenizer"), precision=precision)
+        registry.load(precision)
+    stats = {entry["name"]: entry for entry in registry.stats()}
+
+    quantized, tokenizer = registry.get(INT8_DYNAMIC)
+    assert tokenizer == "tokenizer"
+    assert type(quantized.proj) is not torch.nn.Linear
+    assert quantized(torch.randn(2, 64)).shape == (2, 64)
+    assert registry.get(BF16)[0].proj.weight.dtype == torch.bfloat16
+
+    # int8 weights take a quarter of fp32's bytes; the fp32 bias stays as it is
+    assert stats[INT8_DYNAMIC]["memory_bytes"] == 64 * 64 + 64 * 4
+    assert stats[BF16]["memory_bytes"] * 2 == stats[FP32]["memory_bytes"]
+    assert stats[INT8_DYNAMIC]["precision"] == INT8_DYNAMIC
+
+
+def test_video_results_are_stored_per_precision(monkeypatch):
+    from app.core.config import settings
+    from app.services.cache.video_result_store import current_model_version
+    from app.services.model_dependencies.mt5 import MT5_MODEL
+    from app.services.model_dependencies.registry import model_registry
+
+    entry = model_registry._entry(MT5_MODEL)
+    monkeypatch.setattr(settings, "MODEL_VERSION", "mt5-v2")
+    monkeypatch.setattr(settings, "DEVICE_PREFERENCE", "cpu")
+    monkeypatch.setattr(entry, "precision", FP32)
+    assert current_model_version() == "mt5-v2@fp32"
+
+    monkeypatch.setattr(entry, "precision", INT8_DYNAMIC)
+    # Resolving against the device must not load the model
+    assert current_model_version() == "mt5-v2@int8-dynamic"
+    assert not model_registry.is_loaded(MT5_MODEL)
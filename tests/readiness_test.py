@@ -0,0 +1,46 @@
+import asyncio
+import threading
+
+from app.core.readiness import Readiness
+
+
+def test_background_warm_up_reports_ready_only_once_finished():
+    readiness = Readiness()
+    release = threading.Event()
+
+    async def run():
+        await readiness.warm_up(release.wait, background=True)
+        # Startup is not held up by the warm-up
+        before = readiness.is_ready
+        release.set()
+        while not readiness.is_ready:
+            await asyncio.sleep(0.01)
+        return before
+
+    assert asyncio.run(run()) is False
+    assert readiness.describe()["ready"] is True
+    assert readiness.warm_up_seconds is not None
+
+
+def test_failed_warm_up_stays_not_ready():
+    readiness = Readiness()
+
+    def fail():
+        raise RuntimeError("weights missing")
+
+    asyncio.run(readiness.warm_up(fail, background=False))
+
+    assert readiness.is_ready is False
+    assert readiness.error == "weights missing"
+
+
+def test_firestore_wrapper_does_not_touch_firebase_until_used():
+    from app.services.firebase.firestore import Firestore
+    from app.services.firebase.memory import InMemoryFirestoreClient
+
+    client = InMemoryFirestoreClient()
+    store = Firestore("sessions", client=client)
+    assert store._collection is None
+
+    doc_id = asyncio.run(store.create({"a": 1}))
+    assert asyncio.run(store.get_by_id(doc_id))["a"] == 1
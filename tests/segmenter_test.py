@@ -0,0 +1,78 @@
+from app.services.pipeline.segmenter import TokenBudgetSegmenter
+
+
+class WordTokenizer:
+    """One token per word, plus an EOS when special tokens are added"""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, text, add_special_tokens=True):
+        self.encoded.append(text)
+        return text.split() + (["</s>"] if add_special_tokens else [])
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def words(count, tag="w"):
+    return " ".join(f"{tag}{i}" for i in range(count))
+
+
+def test_budget_excludes_prompt_prefix_and_special_tokens():
+    segmenter = TokenBudgetSegmenter(WordTokenizer(), max_tokens=20, prompt_prefix="summarize: ")
+    assert segmenter.budget == 18
+
+
+def test_closes_paragraph_once_budget_is_nearly_full():
+    segmenter = TokenBudgetSegmenter(WordTokenizer(), max_tokens=20, fill_ratio=0.9)
+
+    assert segmenter.add(0, words(8)) == []
+    jobs = segmenter.add(1, words(8))
+
+    assert [(job.from_chunk, job.to_chunk, job.token_count) for job in jobs] == [(0, 1, 16)]
+    assert segmenter.flush() is None
+
+
+def test_chunk_that_would_overflow_starts_the_next_paragraph():
+    segmenter = TokenBudgetSegmenter(WordTokenizer(), max_tokens=22, fill_ratio=1.0)
+
+    segmenter.add(4, words(12, "a"))
+    jobs = segmenter.add(5, words(12, "b"))
+    final = segmenter.flush(final=True)
+
+    assert [(job.from_chunk, job.to_chunk, job.token_count) for job in jobs] == [(4, 4, 12)]
+    assert (final.from_chunk, final.to_chunk, final.final) == (5, 5, True)
+    assert final.text == words(12, "b")
+
+
+def test_each_chunk_is_tokenized_once():
+    tokenizer = WordTokenizer()
+    segmenter = TokenBudgetSegmenter(tokenizer, max_tokens=1024)
+    transcripts = [words(5, f"c{i}_") for i in range(6)]
+
+    for index, transcript in enumerate(transcripts):
+        segmenter.add(index, transcript)
+
+    assert tokenizer.encoded[1:] == transcripts
+    assert segmenter.flush().token_count == 30
+
+
+def test_deadline_runs_from_the_first_chunk_of_a_paragraph():
+    clock = FakeClock()
+    segmenter = TokenBudgetSegmenter(WordTokenizer(), max_tokens=1024, max_wait=30, clock=clock)
+
+    assert segmenter.time_left() is None
+    clock.now = 5
+    segmenter.add(0, "few words")
+    clock.now = 20
+    segmenter.add(1, "more words")
+
+    assert segmenter.time_left() == 15
+    segmenter.flush()
+    assert segmenter.time_left() is None
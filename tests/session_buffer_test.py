@@ -0,0 +1,59 @@
+import asyncio
+
+from app.services.firebase.firestore import Firestore
+from app.services.firebase.memory import InMemoryFirestoreClient
+from app.services.firebase.session_buffer import SessionProgressBuffer
+
+
+def make_store(latency_ms=0):
+    return Firestore("sessions", client=InMemoryFirestoreClient(latency_ms=latency_ms), coalesce_ms=1)
+
+
+def test_progress_is_written_behind_on_the_timer():
+    store = make_store(latency_ms=50)
+
+    async def run():
+        session_id = await store.create({"summary": []})
+        async with SessionProgressBuffer(store, session_id, flush_interval=0.05) as progress:
+            progress.set_status("streaming")
+            progress.add_paragraphs(["p1"])
+            progress.add_paragraphs(["p2"])
+            await asyncio.sleep(0.2)
+            mid_stream = await store.get_by_id(session_id)
+            progress.set_status("completed")
+        return mid_stream, await store.get_by_id(session_id)
+
+    mid_stream, final = asyncio.run(run())
+
+    assert mid_stream["summary"] == ["p1", "p2"] and mid_stream["status"] == "streaming"
+    assert final["status"] == "completed" and "updatedAt" in final
+
+
+def test_final_flush_survives_a_cancelled_stream():
+    store = make_store(latency_ms=20)
+
+    async def stream(session_id):
+        async with SessionProgressBuffer(store, session_id, flush_interval=60) as progress:
+            for paragraph in ["p1", "p2", "p3"]:
+                progress.add_paragraphs([paragraph])
+                yield paragraph
+            await asyncio.sleep(60)
+
+    async def run():
+        session_id = await store.create({"summary": []})
+
+        async def consume():
+            async for _ in stream(session_id):
+                pass
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        # What the server does when an SSE client disconnects
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await asyncio.sleep(0.1)
+        return await store.get_by_id(session_id)
+
+    document = asyncio.run(run())
+
+    assert document["summary"] == ["p1", "p2", "p3"]
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.services.cache.session_store import MERGE_SCRIPT, InMemorySessionStore, RedisSessionStore, SessionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class LocalRedis:
+    """Stand-in for redis.asyncio.Redis covering get/set/delete with expiry, and the session merge script"""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        value, expires_at = self.values.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.values[key]
+            return None
+        return value
+
+    async def set(self, key, value, ex=None):
+        expires_at = time.monotonic() + ex if ex else None
+        self.values[key] = (value, expires_at)
+        return True
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+    def register_script(self, script):
+        assert script == MERGE_SCRIPT
+
+        async def merge(keys, args):
+            # Runs without an await between read and write, as the script runs atomically in Redis
+            value, expires_at = self.values.get(keys[0], (None, None))
+            if value is None or (expires_at is not None and expires_at <= time.monotonic()):
+                return 0
+            self.values[keys[0]] = (json.dumps({**json.loads(value), **json.loads(args[0])}), expires_at)
+            return 1
+
+        return merge
+
+
+def test_memory_store_expires_sessions_without_reading_them():
+    clock = FakeClock()
+    store = InMemorySessionStore(max_entries=100, ttl_seconds=60, clock=clock)
+
+    async def run():
+        for i in range(10):
+            await store.set(f"s{i}", {"status": "created"})
+        clock.now += 61
+        await store.set("fresh", {"status": "created"})
+
+    asyncio.run(run())
+
+    assert store.stats()["entries"] == 1
+    assert store.stats()["expirations"] == 10
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = InMemorySessionStore(max_entries=2, ttl_seconds=60)
+
+    async def run():
+        await store.set("a", {"n": 1})
+        await store.set("b", {"n": 2})
+        await store.get("a")
+        await store.set("c", {"n": 3})
+        return [await store.get(key) for key in ["a", "b", "c"]]
+
+    assert asyncio.run(run()) == [{"n": 1}, None, {"n": 3}]
+
+
+def test_redis_store_round_trips_and_updates_in_place():
+    store = RedisSessionStore(LocalRedis(), ttl_seconds=60)
+
+    async def run():
+        await store.set("s1", {"videoId": "abc", "status": "created"})
+        await store.update("s1", {"status": "streaming"})
+        await store.update("missing", {"status": "streaming"})
+        return await store.get("s1"), await store.get("missing")
+
+    assert asyncio.run(run()) == ({"videoId": "abc", "status": "streaming"}, None)
+
+
+def test_backends_must_implement_the_whole_interface():
+    class PartialStore(SessionStore):
+        async def get(self, session_id):
+            return None
+
+    with pytest.raises(TypeError):
+        SessionStore()
+    with pytest.raises(TypeError):
+        PartialStore()
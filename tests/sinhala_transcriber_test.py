@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+from pydub import AudioSegment
+
+from app.services.transcribe.sinhala_transcriber import SinhalaTranscriber
+
+
+def make_response(text):
+    words = [
+        SimpleNamespace(word=word, start_time=timedelta(seconds=i), end_time=timedelta(seconds=i + 0.4))
+        for i, word in enumerate(text.split())
+    ]
+    return SimpleNamespace(results=[SimpleNamespace(alternatives=[SimpleNamespace(words=words)])])
+
+
+class FakeRecognizer:
+    """Stands in for speech.SpeechClient; the chunk length selects the reply"""
+
+    def __init__(self, delay=0.05, failures=0):
+        self.delay = delay
+        self.failures = failures
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def recognize(self, config, audio):
+        with self.lock:
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("transient")
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        return make_response(f"chunk {len(audio.content)}")
+
+
+def chunks(count):
+    return [AudioSegment.silent(duration=100 * (i + 1), frame_rate=16000) for i in range(count)]
+
+
+def test_transcribe_many_runs_concurrently_and_keeps_order():
+    recognizer = FakeRecognizer()
+    transcriber = SinhalaTranscriber(client=recognizer)
+    audio_chunks = chunks(8)
+
+    async def run():
+        return [t["text"] async for t in transcriber.transcribe_many(audio_chunks, max_concurrency=4)]
+
+    start = time.perf_counter()
+    texts = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+
+    # Longer chunks upload more bytes, so in-order replies have growing sizes
+    sizes = [int(text.split()[1]) for text in texts]
+    assert sizes == sorted(sizes) and len(set(sizes)) == 8
+    assert recognizer.max_in_flight == 4
+    assert elapsed < 8 * recognizer.delay
+
+
+def test_transient_failures_are_retried():
+    recognizer = FakeRecognizer(failures=2)
+    transcriber = SinhalaTranscriber(client=recognizer, max_retries=3, base_backoff=0.01)
+
+    result = asyncio.run(transcriber.transcribe_audio(chunks(1)[0]))
+
+    assert result["text"].startswith("chunk")
+
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from app.services.cache.token_cache import VerifiedTokenCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeVerifier:
+    def __init__(self, clock):
+        self.clock = clock
+        self.calls = 0
+
+    def __call__(self, token):
+        self.calls += 1
+        uid, lifetime = token.split(":")
+        return {"uid": uid, "iat": self.clock() - 10, "exp": self.clock() + float(lifetime)}
+
+
+def test_token_is_verified_once_until_it_expires():
+    clock = FakeClock()
+    verifier = FakeVerifier(clock)
+    cache = VerifiedTokenCache(max_entries=10, max_ttl_seconds=3600, clock=clock)
+
+    async def run():
+        results = await asyncio.gather(*(cache.verify("user-1:3600", verifier) for _ in range(10)))
+        await cache.verify("user-1:3600", verifier)
+        return results
+
+    assert all(claims["uid"] == "user-1" for claims in asyncio.run(run()))
+    assert verifier.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_expired_tokens_are_not_cached():
+    clock = FakeClock()
+    verifier = FakeVerifier(clock)
+    cache = VerifiedTokenCache(max_entries=10, max_ttl_seconds=3600, clock=clock)
+
+    async def run():
+        await cache.verify("user-1:0", verifier)
+        await cache.verify("user-1:0", verifier)
+
+    asyncio.run(run())
+
+    assert verifier.calls == 2
+
+
+def test_revoked_users_are_rejected_even_with_a_cached_token():
+    clock = FakeClock()
+    verifier = FakeVerifier(clock)
+    cache = VerifiedTokenCache(max_entries=10, max_ttl_seconds=3600, clock=clock)
+
+    asyncio.run(cache.verify("user-1:3600", verifier))
+    cache.invalidate_uid("user-1")
+
+    with pytest.raises(PermissionError):
+        asyncio.run(cache.verify("user-1:3600", verifier))
+
+
+def test_revocations_are_bounded_and_forgotten_once_tokens_expire():
+    clock = FakeClock()
+    verifier = FakeVerifier(clock)
+    cache = VerifiedTokenCache(max_entries=2, max_ttl_seconds=3600, clock=clock)
+
+    for uid in ("user-1", "user-2", "user-3"):
+        cache.invalidate_uid(uid)
+    assert cache.stats()["revoked_users"] == 2
+
+    with pytest.raises(PermissionError):
+        asyncio.run(cache.verify("user-3:3600", verifier))
+
+    # Every token issued before the revocation has expired by now, so a new sign-in is accepted
+    clock.now += 3601
+    assert asyncio.run(cache.verify("user-3:3600", verifier))["uid"] == "user-3"
@@ -0,0 +1,104 @@
+import asyncio
+
+from app.services.pipeline.segmenter import TokenBudgetSegmenter
+from app.services.pipeline.video_pipeline import VideoSummaryPipeline
+
+
+class FakeAudioProcessor:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def process_content(self, video_id, start_time=None):
+        for chunk in self.chunks:
+            yield chunk
+
+
+class FakeTranscriber:
+    def __init__(self):
+        self.calls = []
+
+    async def transcribe_audio(self, chunk):
+        self.calls.append(chunk)
+        # Later chunks finish first to exercise reordering
+        await asyncio.sleep(0.01 * (10 - chunk))
+        return {"text": f"t{chunk}"}
+
+
+class WordTokenizer:
+    def encode(self, text, add_special_tokens=True):
+        return text.split()
+
+
+class FakeVideoResult:
+    def __init__(self, transcripts=None):
+        self.transcripts = transcripts or {}
+
+    def add_transcript(self, chunk_index, text):
+        self.transcripts[chunk_index] = text
+
+
+def collect(pipeline):
+    async def run():
+        return [job async for job in pipeline.paragraphs("video")]
+    return asyncio.run(run())
+
+
+def test_paragraphs_keep_chunk_order_under_concurrent_transcription():
+    pipeline = VideoSummaryPipeline(
+        FakeAudioProcessor(list(range(7))),
+        FakeTranscriber(),
+        FakeVideoResult(),
+        # Each transcript is one token, so three fill a paragraph
+        TokenBudgetSegmenter(WordTokenizer(), max_tokens=3, prompt_prefix="", fill_ratio=1.0),
+        transcribe_concurrency=4,
+    )
+
+    jobs = collect(pipeline)
+
+    assert [job.text for job in jobs] == ["t0 t1 t2", "t3 t4 t5", "t6"]
+    assert [(job.from_chunk, job.to_chunk, job.final) for job in jobs] == [
+        (0, 2, False),
+        (3, 5, False),
+        (6, 6, True),
+    ]
+
+
+def test_stored_transcripts_are_not_transcribed_again():
+    transcriber = FakeTranscriber()
+    video_result = FakeVideoResult({4: "stored"})
+    pipeline = VideoSummaryPipeline(
+        FakeAudioProcessor([4, 5]),
+        transcriber,
+        video_result,
+        TokenBudgetSegmenter(WordTokenizer(), max_tokens=1024, start_chunk=4),
+        start_chunk=4,
+    )
+
+    jobs = collect(pipeline)
+
+    assert [job.text for job in jobs] == ["stored t5"]
+    assert transcriber.calls == [5]
+    assert video_result.transcripts == {4: "stored", 5: "t5"}
+
+
+def test_open_paragraph_is_sent_when_its_wait_runs_out():
+    class SlowAudioProcessor:
+        async def process_content(self, video_id, start_time=None):
+            yield 0
+            await asyncio.sleep(0.3)
+            yield 1
+
+    class InstantTranscriber:
+        async def transcribe_audio(self, chunk):
+            return {"text": f"t{chunk}"}
+
+    pipeline = VideoSummaryPipeline(
+        SlowAudioProcessor(),
+        InstantTranscriber(),
+        FakeVideoResult(),
+        TokenBudgetSegmenter(WordTokenizer(), max_tokens=1024, max_wait=0.05),
+    )
+
+    jobs = collect(pipeline)
+
+    assert [(job.text, job.final) for job in jobs] == [("t0", False), ("t1", True)]
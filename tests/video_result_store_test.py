@@ -0,0 +1,157 @@
+import asyncio
+
+from app.services.cache.video_result_store import VideoResult, VideoResultStore, current_model_version
+from app.services.pipeline.segmenter import TokenBudgetSegmenter
+from app.services.pipeline.video_pipeline import VideoSummaryPipeline
+
+
+class FakeAudioProcessor:
+    def __init__(self):
+        self.start_times = []
+
+    async def process_content(self, video_id, start_time=None):
+        self.start_times.append(start_time)
+        for chunk in range(int((start_time or 0) // 30), 4):
+            yield chunk
+
+
+class FakeTranscriber:
+    def __init__(self):
+        self.calls = []
+
+    async def transcribe_audio(self, chunk):
+        self.calls.append(chunk)
+        return {"text": f"t{chunk}"}
+
+
+class WordTokenizer:
+    def encode(self, text, add_special_tokens=True):
+        return text.split()
+
+
+def result_with(*spans, transcripts=None):
+    result = VideoResult("video", current_model_version(), transcripts=transcripts)
+    for from_chunk, to_chunk in spans:
+        result.add_paragraph(from_chunk, to_chunk, from_chunk * 30, f"p{from_chunk}-{to_chunk}")
+    return result
+
+
+def test_concurrent_saves_merge_instead_of_overwriting():
+    async def run():
+        store = VideoResultStore(max_entries=10)
+        await store.save(result_with((0, 1), transcripts={0: "a", 1: "b"}))
+        # A second writer that started from an empty result and got further
+        await store.save(result_with((0, 1), (2, 3), transcripts={2: "c"}))
+        # A stale writer that only knows the first paragraph marks the video complete
+        stale = result_with((0, 1))
+        stale.completed = True
+        await store.save(stale)
+        return await store.get("video")
+
+    stored = asyncio.run(run())
+
+    assert [(p["from_chunk"], p["to_chunk"]) for p in stored.paragraphs] == [(0, 1), (2, 3)]
+    assert stored.transcripts == {0: "a", 1: "b", 2: "c"}
+    assert stored.completed
+
+
+def test_merge_survives_the_disk_tier(tmp_path):
+    async def run():
+        path = str(tmp_path / "videos.sqlite")
+        await VideoResultStore(max_entries=10, disk_path=path).save(result_with((0, 1)))
+        # A fresh process has nothing in memory and must merge with what is on disk
+        store = VideoResultStore(max_entries=10, disk_path=path)
+        await store.save(result_with((2, 3)))
+        return await VideoResultStore(max_entries=10, disk_path=path).get("video")
+
+    stored = asyncio.run(run())
+
+    assert [p["from_chunk"] for p in stored.paragraphs] == [0, 2]
+
+
+def test_live_results_are_not_stored():
+    async def run():
+        store = VideoResultStore(max_entries=10)
+        live = result_with((0, 1))
+        live.live = True
+        await store.save(live)
+        return await store.get("video")
+
+    assert asyncio.run(run()) is None
+
+
+def test_second_session_follows_the_leader():
+    async def run():
+        store = VideoResultStore(max_entries=10)
+        flight, leading = await store.join("video")
+        other, other_leading = await store.join("video")
+        assert leading and not other_leading and other is flight
+
+        followed = []
+
+        async def follow():
+            async for paragraph in other.follow():
+                followed.append(paragraph["text"])
+
+        follower = asyncio.create_task(follow())
+        for span in [(0, 1), (2, 3)]:
+            flight.result.add_paragraph(span[0], span[1], span[0] * 30, f"p{span[0]}-{span[1]}")
+            await store.save(flight.result)
+            await asyncio.sleep(0)
+        flight.result.completed = True
+        await store.save(flight.result)
+        store.release(flight)
+
+        await asyncio.wait_for(follower, timeout=1)
+        return followed, store.stats()["flights"]
+
+    followed, flights = asyncio.run(run())
+
+    assert followed == ["p0-1", "p2-3"]
+    assert flights == 0
+
+
+def test_follower_takes_over_from_a_leader_that_stopped_early():
+    async def run():
+        store = VideoResultStore(max_entries=10)
+        flight, _ = await store.join("video")
+        flight.result.add_paragraph(0, 1, 0, "p0-1")
+        await store.save(flight.result)
+        store.release(flight)
+
+        successor, leading = await store.join("video")
+        return successor, leading
+
+    successor, leading = asyncio.run(run())
+
+    assert leading
+    assert successor.result.next_chunk == 2
+    assert not successor.result.completed
+
+
+def test_resumed_session_continues_after_stored_paragraphs():
+    async def run():
+        store = VideoResultStore(max_entries=10)
+        await store.save(result_with((0, 1), transcripts={0: "t0", 1: "t1", 2: "t2"}))
+
+        flight, leading = await store.join("video")
+        result = flight.result
+        audio, transcriber = FakeAudioProcessor(), FakeTranscriber()
+        pipeline = VideoSummaryPipeline(
+            audio,
+            transcriber,
+            result,
+            TokenBudgetSegmenter(WordTokenizer(), max_tokens=1024, start_chunk=result.next_chunk),
+            start_chunk=result.next_chunk,
+        )
+        jobs = [job async for job in pipeline.paragraphs("video", result.next_chunk * 30)]
+        store.release(flight)
+        return leading, audio.start_times, transcriber.calls, jobs
+
+    leading, start_times, calls, jobs = asyncio.run(run())
+
+    assert leading
+    assert start_times == [60]
+    # Chunk 2 was transcribed by the earlier session, so only chunk 3 goes to the transcriber
+    assert calls == [3]
+    assert [(job.from_chunk, job.to_chunk, job.text) for job in jobs] == [(2, 3, "t2 t3")]
@@ -0,0 +1,55 @@
+import asyncio
+
+from app.services.post_processing.check_token import SINHALA_ZWJ, needs_zwj, zwj_events
+
+# Streamer pieces as TextStreamer emits them: some hold several words, some end on a halkirima
+PIECES = ["ප්", "රශ්නය ", "ක් රි", "යාව ", "  ", "ශ්", "යාමය", "ම් ", "ම ", "වැඩ ක්", "රම"]
+
+
+def unbatched(pieces):
+    """The stream as it was sent one piece per event"""
+    sent = []
+    prev_token = None
+    for piece in pieces:
+        token = piece.strip()
+        if not token:
+            continue
+        if prev_token is not None:
+            if needs_zwj(prev_token, token):
+                sent.append(prev_token + SINHALA_ZWJ + token)
+                prev_token = None
+            else:
+                sent.append(prev_token)
+                prev_token = token
+        else:
+            prev_token = token
+    if prev_token:
+        sent.append(prev_token)
+    return sent
+
+
+def batched(pieces, size):
+    """Tokens per event when pieces arrive `size` at a time"""
+    async def batches():
+        for start in range(0, len(pieces), size):
+            yield pieces[start:start + size]
+
+    async def collect():
+        return [" ".join(event_tokens) async for event_tokens in zwj_events(batches())]
+
+    return asyncio.run(collect())
+
+
+def test_batched_events_carry_the_unbatched_stream():
+    expected = " ".join(unbatched(PIECES))
+    for size in range(1, len(PIECES) + 1):
+        assert " ".join(batched(PIECES, size)) == expected
+
+
+def test_zwj_is_not_added_across_a_space_inside_a_piece():
+    # "ක් රි" is two words; only the piece boundary "ප්" + "රශ්නය" pairs up
+    stream = " ".join(batched(PIECES, 8))
+
+    assert "ප්" + SINHALA_ZWJ + "රශ්නය" in stream
+    assert "ක් රි" in stream
+    assert "ශ්" + SINHALA_ZWJ + "යාමය" in stream